@@ -0,0 +1,39 @@
+import asyncio
+from sqlalchemy import select, text
+from database import AsyncSessionLocal, engine, init_db
+from embedding_index import build_indexes
+from skill_index import build_skill_indexes
+from models import StartupProfile
+from score_store import rescore_startup
+
+
+async def backfill():
+    """Compute the match_scores table from scratch.
+
+    Rescoring every startup covers every stored pair: talent x startup,
+    talent x job and startup x investor. One transaction per startup.
+    """
+    await init_db()
+    async with engine.begin() as conn:
+        # Pagination cursors compare scores exactly; early tables used FLOAT
+        result = await conn.execute(text("DESCRIBE match_scores"))
+        types = {r[0]: str(r[1]).lower() for r in result.fetchall()}
+        if types.get("score") != "double":
+            print("Changing match_scores.score to DOUBLE...")
+            await conn.execute(text("ALTER TABLE match_scores MODIFY COLUMN score DOUBLE NOT NULL"))
+
+    async with AsyncSessionLocal() as db:
+        await build_indexes(db)
+        await build_skill_indexes(db)
+        result = await db.execute(select(StartupProfile))
+        startups = result.scalars().all()
+        for i, startup in enumerate(startups, 1):
+            await rescore_startup(db, startup)
+            await db.commit()
+            print(f"  Scored {i}/{len(startups)} startups...")
+
+    await engine.dispose()
+    print("Backfill complete.")
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,60 @@
+"""Recall@k and latency of the IVF embedding index against exact cosine search.
+
+Uses synthetic clustered 768-d vectors (profiles fall into topical groups,
+so uniform noise would understate what IVF achieves on real data).
+
+Usage: python bench_ann.py [N]
+"""
+import sys
+import time
+import numpy as np
+from embedding_index import EmbeddingIndex, IVFEmbeddingIndex
+
+DIM = 768
+K = 10
+QUERIES = 200
+NLIST = 256
+NPROBES = [1, 4, 8, 16, 32, 64]
+CLUSTERS = 1000
+SPREAD = 1.0
+
+
+def synthetic(centers, n, rng):
+    labels = rng.integers(0, len(centers), n)
+    return centers[labels] + SPREAD * rng.standard_normal((n, DIM)).astype(np.float32)
+
+
+def run(index, queries):
+    start = time.perf_counter()
+    results = [[user_id for user_id, _ in index.top_k(q, K)] for q in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((CLUSTERS, DIM)).astype(np.float32)
+    data = synthetic(centers, n, rng)
+    # Queries are fresh profiles drawn from the same topical groups
+    queries = synthetic(centers, QUERIES, rng)
+    items = [(f"user-{i}", data[i]) for i in range(n)]
+
+    exact = EmbeddingIndex("profile")
+    exact.extend(items)
+    truth, exact_latency = run(exact, queries)
+    print(f"N={n} dim={DIM} k={K}  exact: {exact_latency * 1000:.2f}ms/query")
+
+    ivf = IVFEmbeddingIndex("profile", nlist=NLIST)
+    start = time.perf_counter()
+    ivf.extend(items)
+    print(f"IVF nlist={NLIST} trained in {time.perf_counter() - start:.2f}s")
+
+    for nprobe in NPROBES:
+        ivf.nprobe = nprobe
+        found, latency = run(ivf, queries)
+        recall = np.mean([len(set(f) & set(t)) / K for f, t in zip(found, truth)])
+        print(f"  nprobe={nprobe:>3}  recall@{K}={recall:.3f}  {latency * 1000:6.2f}ms/query "
+              f"({exact_latency / latency:4.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
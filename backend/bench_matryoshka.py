@@ -0,0 +1,83 @@
+"""Ranking agreement of prefix-truncated embeddings against full 768-d cosine.
+
+Synthetic vectors have per-dimension variance decaying with the dimension
+index, which is how Matryoshka-trained models such as gemini-embedding-001
+concentrate information in the leading dims. Reports, per prefix length:
+Spearman correlation of prefix vs full scores over the pool, recall@k of the
+prefix ranking alone, and recall@k / latency of the two-stage index.
+
+Usage: python bench_matryoshka.py [N]
+"""
+import sys
+import time
+import numpy as np
+from embedding_index import EmbeddingIndex
+from scoring import l2_normalize
+
+DIM = 768
+K = 20
+QUERIES = 50
+PREFIXES = [64, 128, 256, 384]
+SHORTLIST_FACTOR = 10
+
+
+def synthetic(n, rng, clusters=1000):
+    decay = (1.0 + np.arange(DIM) / 32.0) ** -0.75
+    centers = rng.standard_normal((clusters, DIM)).astype(np.float32) * decay
+    labels = rng.integers(0, clusters, n)
+    noise = rng.standard_normal((n, DIM)).astype(np.float32) * decay
+    return (centers[labels] + noise).astype(np.float32)
+
+
+def ranks(values):
+    order = np.argsort(values)
+    out = np.empty(len(values))
+    out[order] = np.arange(len(values))
+    return out
+
+
+def spearman(a, b):
+    return float(np.corrcoef(ranks(a), ranks(b))[0, 1])
+
+
+def top(scores, k):
+    return set(np.argpartition(-scores, k - 1)[:k])
+
+
+def timed_top_k(index, queries):
+    start = time.perf_counter()
+    results = [{int(u) for u, _ in index.top_k(q, K)} for q in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    data = synthetic(n, rng)
+    queries = synthetic(QUERIES, rng)
+    items = [(str(i), data[i]) for i in range(n)]
+    full = l2_normalize(data)
+
+    exact = EmbeddingIndex("profile")
+    exact.extend(items)
+    truth, exact_latency = timed_top_k(exact, queries)
+    print(f"N={n} k={K} full-dim exact: {exact_latency * 1000:.2f}ms/query")
+
+    for prefix_dim in PREFIXES:
+        prefix = l2_normalize(data[:, :prefix_dim])
+        rho, prefix_recall = [], []
+        for q in queries:
+            full_scores = full @ l2_normalize(q)[0]
+            prefix_scores = prefix @ l2_normalize(q[:prefix_dim])[0]
+            rho.append(spearman(full_scores, prefix_scores))
+            prefix_recall.append(len(top(full_scores, K) & top(prefix_scores, K)) / K)
+
+        two_stage = EmbeddingIndex("profile", prefix_dim=prefix_dim, shortlist_factor=SHORTLIST_FACTOR)
+        two_stage.extend(items)
+        found, latency = timed_top_k(two_stage, queries)
+        recall = np.mean([len(f & t) / K for f, t in zip(found, truth)])
+        print(f"  prefix={prefix_dim:>3}  spearman={np.mean(rho):.3f}  prefix-only recall@{K}={np.mean(prefix_recall):.3f}  "
+              f"two-stage recall@{K}={recall:.3f}  {latency * 1000:6.2f}ms/query ({exact_latency / latency:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
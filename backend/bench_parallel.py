@@ -0,0 +1,122 @@
+"""Benchmark multi-process talent scoring (parallel_scoring) from 1 to N cores.
+
+Scores one startup (a baseline and four job pools) against N synthetic
+talents held in the talent skill index and the profile embedding index,
+returning the top 20 and, separately, every talent with its matched/missing
+skills. Each run covers everything ``GET /matches/talent`` does on the event
+loop apart from its SQL: the bitsets read off the skill index, the semantic
+scores, the sharded scoring and the merge. Each worker count gets a fresh,
+warmed-up pool. "In-process" scores the one shard inline instead; the loop
+lag column is the longest the event loop went without running a 10ms
+ticker during the call.
+
+Usage: python bench_parallel.py [N] [MAX_WORKERS]  (default: one per CPU)
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+import embedding_index
+import skill_index
+from embedding_index import upsert_vector
+from matching import _rank_talents_in_parallel
+from parallel_scoring import SharedArrays, _score_shard, shutdown_executor
+from scoring import encode_bits, popcount
+from config import settings
+
+N = 200_000
+POOLS = 5
+K = 20
+DIM = 64
+VOCAB = [f"skill-{i}" for i in range(300)]
+
+
+def populate(n):
+    """Index N talents and a startup; returns the startup, its jobs and the sorted talent ids."""
+    rng = np.random.default_rng(0)
+    random.seed(0)
+    talent_ids = sorted(f"talent-{i:07d}" for i in range(n))
+    index = skill_index.get_skill_index("talent")
+    vectors = rng.normal(size=(n, DIM)).astype(np.float32)
+    has_embedding = rng.random(n) < 0.8
+    for i, talent_id in enumerate(talent_ids):
+        index.upsert(talent_id, random.sample(VOCAB, random.randint(0, 12)))
+        if has_embedding[i]:
+            upsert_vector("profile", talent_id, vectors[i])
+    upsert_vector("profile", "startup", rng.normal(size=DIM).astype(np.float32))
+    # Stand in for build_indexes / build_skill_indexes, which read the database
+    embedding_index._loaded = skill_index._loaded = True
+
+    startup = SimpleNamespace(user_id="startup", required_skills=random.sample(VOCAB, 6), tech_stack=[])
+    jobs = [SimpleNamespace(id=j, required_skills=random.sample(VOCAB, 6)) for j in range(POOLS - 1)]
+    return startup, jobs, talent_ids
+
+
+async def loop_lag(call):
+    """Run ``call()`` and return (its seconds, longest gap between 10ms ticks)."""
+    gaps = []
+    done = False
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last - 0.01)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await call()
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return elapsed, max(gaps, default=elapsed)
+
+
+async def bench(n, max_workers):
+    startup, jobs, talent_ids = populate(n)
+    weights = (0.6, 0.4)
+
+    async def inline(k):
+        # The same inputs _rank_talents_in_parallel prepares, scored as one shard on the loop
+        pools = [startup.required_skills] + [job.required_skills for job in jobs]
+        vocabulary = {skill: j for j, skill in enumerate(dict.fromkeys(s for pool in pools for s in pool))}
+        index = skill_index.get_skill_index("talent")
+        bits, sizes = index.bitsets(list(vocabulary), index.rows(talent_ids))
+        profiles = embedding_index.get_index("profile")
+        semantic = profiles.scores_for(profiles.get("startup"), talent_ids)
+        has_embedding = np.array([t in profiles for t in talent_ids])
+        queries = np.stack([encode_bits(pool, vocabulary, len(bits)) for pool in pools])
+        query_sizes = popcount(queries).astype(np.int64).sum(axis=1)
+        with SharedArrays(bits=bits, sizes=sizes, semantic=semantic, has_embedding=has_embedding) as s:
+            _score_shard(s.name, s.layout, 0, n, queries, query_sizes, queries[0], list(vocabulary), weights, k, None)
+
+    async def handler(k):
+        await _rank_talents_in_parallel(None, startup, jobs, talent_ids, 0, k, None)
+
+    print(f"N={n:,} talents x {POOLS} pools")
+    for label, k in (("top 20", K), ("all", None)):
+        elapsed, lag = await loop_lag(lambda: inline(k))
+        base = elapsed
+        print(f"  {label:6}  in-process  {elapsed * 1000:8.1f}ms  loop lag {lag * 1000:7.1f}ms")
+        workers = 1
+        while workers <= max_workers:
+            settings.MATCH_PARALLEL_WORKERS = workers
+            shutdown_executor()
+            await handler(K)  # start and warm the pool
+            elapsed, lag = await loop_lag(lambda: handler(k))
+            print(f"  {label:6}  {workers:2} workers  {elapsed * 1000:8.1f}ms  loop lag {lag * 1000:7.1f}ms  "
+                  f"({base / elapsed:4.1f}x)")
+            workers *= 2
+    shutdown_executor()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    asyncio.run(bench(n, max_workers))
@@ -0,0 +1,80 @@
+"""Benchmark top-k pruning of live talent ranking (matching.threshold_top_k).
+
+Ranks N synthetic talents, held in the talent skill index and an exact
+profile embedding index, for one startup (a baseline and four job pools),
+the way ``GET /matches/talent?limit=20`` does when there are no stored
+scores. Talent vectors share a component with the startup's so cosines
+spread out the way real profile embeddings do instead of clustering at 0.
+Each row is one way of bounding the semantic half of the hybrid score:
+"none" is the flat 1.0 bound the exact index used to get, "per-row" the
+``semantic_bounds`` scan. The pruned column is how many talents never had
+a payload built; every mode returns the same top k.
+
+Usage: python bench_pruning.py [N] [K]
+"""
+import asyncio
+import random
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+import embedding_index
+import matching
+import skill_index
+from embedding_index import upsert_vector
+from matching import _top_talents_for_startup, pruning_stats
+
+N = 100_000
+POOLS = 5
+K = 20
+DIM = 64
+VOCAB = [f"skill-{i}" for i in range(300)]
+
+
+def populate(n):
+    """Index N talents and a startup; returns the startup, its jobs and the talents."""
+    rng = np.random.default_rng(0)
+    random.seed(0)
+    topic = rng.normal(size=DIM)
+    talents = []
+    index = skill_index.get_skill_index("talent")
+    for i in range(n):
+        skills = [{"name": s} for s in random.sample(VOCAB, random.randint(0, 12))]
+        talent = SimpleNamespace(user_id=f"talent-{i:07d}", name=f"T{i}", headline="", skills=skills)
+        talents.append(talent)
+        index.upsert(talent.user_id, [s["name"] for s in skills])
+        if rng.random() < 0.8:
+            upsert_vector("profile", talent.user_id, topic * rng.uniform(0, 1.5) + rng.normal(size=DIM))
+    upsert_vector("profile", "startup", topic + rng.normal(size=DIM) * 0.5)
+    # Stand in for build_indexes / build_skill_indexes, which read the database
+    embedding_index._loaded = skill_index._loaded = True
+
+    startup = SimpleNamespace(user_id="startup", required_skills=random.sample(VOCAB, 6), tech_stack=[])
+    jobs = [SimpleNamespace(id=j, required_skills=random.sample(VOCAB, 6)) for j in range(POOLS - 1)]
+    return startup, jobs, talents
+
+
+async def bench(n, k):
+    startup, jobs, talents = populate(n)
+    semantic_bounds = matching.semantic_bounds
+    print(f"N={n:,} talents x {POOLS} pools, top {k}")
+    reference = None
+    for label, bounds in (("none", lambda *args: None), ("per-row", semantic_bounds)):
+        matching.semantic_bounds = bounds
+        await _top_talents_for_startup(None, startup, jobs, talents, 0, k, None)  # warm up
+        before = pruning_stats["pruned"]
+        start = time.perf_counter()
+        matches = await _top_talents_for_startup(None, startup, jobs, talents, 0, k, None)
+        elapsed = time.perf_counter() - start
+        pruned = pruning_stats["pruned"] - before
+        ranking = [m["talent_id"] for m in matches]
+        reference = reference or ranking
+        same = "same top k" if ranking == reference else "DIFFERENT top k"
+        print(f"  {label:8}  {elapsed * 1000:8.1f}ms  pruned {pruned:>9,} of {n:,}  ({same})")
+    matching.semantic_bounds = semantic_bounds
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else K
+    asyncio.run(bench(n, k))
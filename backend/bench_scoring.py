@@ -0,0 +1,83 @@
+"""Benchmark the vectorized scoring kernels against the old pure-Python loops.
+
+Jaccard is also timed on packed ``SkillBitsets`` (AND + popcount) and
+through the inverted ``SkillIndex``, which only visits candidates sharing a
+skill with the query.
+
+Usage: python bench_scoring.py
+"""
+import random
+import time
+import numpy as np
+from scoring import cosine_scores, jaccard_scores, SkillBitsets, SkillMatrix
+from skill_index import SkillIndex
+
+DIM = 768
+SIZES = [1_000, 10_000, 100_000]
+# Pure-Python timings above this size are extrapolated from a sample
+PY_SAMPLE = 5_000
+VOCAB = [f"skill-{i}" for i in range(300)]
+
+
+def py_cosine(v1, v2):
+    dot_product = sum(a * b for a, b in zip(v1, v2))
+    magnitude_v1 = sum(a * a for a in v1) ** 0.5
+    magnitude_v2 = sum(a * a for a in v2) ** 0.5
+    if magnitude_v1 == 0 or magnitude_v2 == 0:
+        return 0.0
+    return dot_product / (magnitude_v1 * magnitude_v2)
+
+
+def py_jaccard(set1, set2):
+    if not set1 or not set2:
+        return 0.0
+    set1_set = set(set1)
+    set2_set = set(set2)
+    return len(set1_set & set2_set) / len(set1_set | set2_set)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench(n):
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((n, DIM)).astype(np.float32)
+    query = rng.standard_normal(DIM).astype(np.float32)
+    skills = [random.sample(VOCAB, random.randint(0, 12)) for _ in range(n)]
+    job_skills = random.sample(VOCAB, 6)
+
+    sample = min(n, PY_SAMPLE)
+    rows = matrix[:sample].tolist()
+    q = query.tolist()
+    py_cos = timed(lambda: [py_cosine(q, r) for r in rows]) * n / sample
+    py_jac = timed(lambda: [py_jaccard(s, job_skills) for s in skills[:sample]]) * n / sample
+
+    np_cos = timed(lambda: cosine_scores(query, matrix))
+    skill_matrix = SkillMatrix(skills)
+    np_jac = timed(lambda: jaccard_scores(job_skills, skill_matrix))
+    skill_bitsets = SkillBitsets(skills)
+    bit_jac = timed(lambda: jaccard_scores(job_skills, skill_bitsets))
+    ids = [str(i) for i in range(n)]
+    skill_index = SkillIndex()
+    for i, s in zip(ids, skills):
+        skill_index.upsert(i, s)
+    rows = skill_index.rows(ids)
+    # The index is long-lived: its posting arrays are built on first use
+    skill_index.jaccard_scores(job_skills, rows)
+    inv_jac = timed(lambda: skill_index.jaccard_scores(job_skills, rows))
+
+    extrapolated = "*" if sample < n else " "
+    print(f"N={n:>7}  cosine: python {py_cos * 1000:9.1f}ms{extrapolated} numpy {np_cos * 1000:7.2f}ms "
+          f"({py_cos / np_cos:6.0f}x)  jaccard: python {py_jac * 1000:8.1f}ms{extrapolated} "
+          f"numpy {np_jac * 1000:6.2f}ms ({py_jac / np_jac:5.0f}x) "
+          f"bitsets {bit_jac * 1000:6.2f}ms inverted index {inv_jac * 1000:6.2f}ms")
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for n in SIZES:
+        bench(n)
+    print(f"* extrapolated from the first {PY_SAMPLE} rows")
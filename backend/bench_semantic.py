@@ -0,0 +1,86 @@
+"""End-to-end semantic search load test with the offline hashing embedder.
+
+Generates synthetic profile texts grouped by topic, embeds them with
+``HashingEmbeddingProvider`` (no network), builds the exact and IVF indexes
+and reports embedding throughput, build time, IVF recall@k against exact
+search, and how often exact neighbours share the query's topic.
+
+Usage: python bench_semantic.py [N]
+"""
+import sys
+import time
+import numpy as np
+from embedding_index import EmbeddingIndex, IVFEmbeddingIndex
+from embedding_providers import HashingEmbeddingProvider
+
+K = 10
+QUERIES = 200
+TOPICS = 200
+TOPIC_WORDS = 40
+COMMON_WORDS = 2000
+WORDS_PER_PROFILE = 24
+TOPICAL_SHARE = 0.5
+NLIST = 256
+NPROBES = [4, 16, 64]
+
+
+def vocabulary(size, rng):
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    return ["".join(rng.choice(letters, rng.integers(4, 10))) for _ in range(size)]
+
+
+def profiles(n, topic_vocab, common_vocab, rng):
+    topics = rng.integers(0, len(topic_vocab), n)
+    topical = int(WORDS_PER_PROFILE * TOPICAL_SHARE)
+    texts = []
+    for t in topics:
+        words = list(rng.choice(topic_vocab[t], topical)) + list(rng.choice(common_vocab, WORDS_PER_PROFILE - topical))
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+    return texts, topics
+
+
+def run(index, queries):
+    start = time.perf_counter()
+    results = [[user_id for user_id, _ in index.top_k(q, K)] for q in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def main(n):
+    rng = np.random.default_rng(0)
+    topic_vocab = [vocabulary(TOPIC_WORDS, rng) for _ in range(TOPICS)]
+    common_vocab = vocabulary(COMMON_WORDS, rng)
+    texts, topics = profiles(n, topic_vocab, common_vocab, rng)
+    query_texts, query_topics = profiles(QUERIES, topic_vocab, common_vocab, rng)
+
+    provider = HashingEmbeddingProvider()
+    start = time.perf_counter()
+    vectors = provider.embed_documents(texts)
+    elapsed = time.perf_counter() - start
+    print(f"N={n} dim={provider.dim}  embedded {n / elapsed:,.0f} texts/s")
+    queries = np.asarray(provider.embed_documents(query_texts), dtype=np.float32)
+    items = [(str(i), vectors[i]) for i in range(n)]
+
+    exact = EmbeddingIndex("profile")
+    start = time.perf_counter()
+    exact.extend(items)
+    print(f"exact index built in {time.perf_counter() - start:.2f}s")
+    truth, exact_latency = run(exact, queries)
+    same_topic = np.mean([
+        np.mean([topics[int(u)] == topic for u in found]) for found, topic in zip(truth, query_topics)
+    ])
+    print(f"  exact: {exact_latency * 1000:.2f}ms/query  same-topic@{K}={same_topic:.3f}")
+
+    ivf = IVFEmbeddingIndex("profile", nlist=NLIST)
+    start = time.perf_counter()
+    ivf.extend(items)
+    print(f"IVF nlist={NLIST} built in {time.perf_counter() - start:.2f}s")
+    for nprobe in NPROBES:
+        ivf.nprobe = nprobe
+        found, latency = run(ivf, queries)
+        recall = np.mean([len(set(f) & set(t)) / K for f, t in zip(found, truth)])
+        print(f"  nprobe={nprobe:>3}  recall@{K}={recall:.3f}  {latency * 1000:6.2f}ms/query")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -6,13 +6,15 @@ async def cleanup():
     async with engine.connect() as conn:
         print("\nCleaning up duplicate embeddings...")
         
-        # This query finds duplicates and keeps only the one with the highest ID (ostensibly the newest)
+        # This query finds duplicates and keeps only the one with the highest ID (ostensibly the newest).
+        # Job embeddings share their startup's user_id, so job_id is part of the key (NULL-safe)
         query = """
         DELETE e1 FROM embeddings e1
         INNER JOIN embeddings e2 
         WHERE e1.id < e2.id 
         AND e1.user_id = e2.user_id 
-        AND e1.text_source = e2.text_source;
+        AND e1.text_source = e2.text_source
+        AND e1.job_id <=> e2.job_id;
         """
         try:
             result = await conn.execute(text(query))
@@ -1,7 +1,7 @@
 """Configuration settings for NepLaunch backend."""
 from pydantic_settings import BaseSettings
 from typing import Optional, Union
-from pydantic import field_validator
+from pydantic import field_validator, model_validator
 
 
 class Settings(BaseSettings):
@@ -30,6 +30,72 @@ class Settings(BaseSettings):
     # Gemini
     GOOGLE_API_KEY: Optional[str] = None
     
+    # Embedding provider: "gemini" (needs GOOGLE_API_KEY) or "hashing", a local
+    # deterministic n-gram embedder for benchmarks and offline load tests
+    EMBEDDING_PROVIDER: str = "gemini"
+    
+    # Embedding micro-batching: wait up to BATCH_WAIT_MS or BATCH_SIZE texts per call
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_BATCH_WAIT_MS: float = 10.0
+    EMBEDDING_BATCH_CONCURRENCY: int = 4  # provider calls in flight
+    EMBEDDING_BATCH_MAX_PENDING: int = 1024  # queued texts before callers block
+    EMBEDDING_CACHE_SIZE: int = 2048  # recent text -> vector results kept in memory
+    # Provider calls: dedicated thread pool, per-call deadline and circuit breaker
+    EMBEDDING_EXECUTOR_WORKERS: int = 4
+    EMBEDDING_TIMEOUT_SECONDS: float = 10.0
+    EMBEDDING_BREAKER_FAILURES: int = 5  # consecutive failures before failing fast
+    EMBEDDING_BREAKER_RESET_SECONDS: float = 30.0  # open time before a trial call
+    
+    # Embedding worker (embedding_worker.py) draining the embedding_jobs outbox
+    EMBEDDING_WORKER_BATCH_SIZE: int = 64  # jobs claimed per poll
+    EMBEDDING_WORKER_POLL_SECONDS: float = 1.0  # sleep when the queue is empty
+    EMBEDDING_JOB_MAX_ATTEMPTS: int = 8  # then the job is marked FAILED
+    EMBEDDING_JOB_BACKOFF_SECONDS: float = 5.0  # doubled after each failed attempt
+    EMBEDDING_JOB_MAX_BACKOFF_SECONDS: float = 600.0
+    EMBEDDING_JOB_LEASE_SECONDS: float = 300.0  # RUNNING jobs older than this are reclaimed
+    # How often API processes pull embeddings written by the worker into their indexes
+    EMBEDDING_INDEX_SYNC_SECONDS: float = 2.0
+    # Shared index snapshot (embedding_snapshot.py): the embedding worker saves its
+    # indexes here every EMBEDDING_SNAPSHOT_SECONDS and API processes memory-map
+    # them at startup instead of loading the embeddings table ("" = off)
+    EMBEDDING_SNAPSHOT_DIR: str = ""
+    EMBEDDING_SNAPSHOT_SECONDS: float = 300.0
+    
+    # Embedding index: "exact" brute force or "ivf" approximate search. With ivf,
+    # live talent and job ranking only finds semantic candidates in the probed lists
+    EMBEDDING_INDEX_MODE: str = "exact"
+    IVF_NLIST: int = 256  # number of k-means lists
+    IVF_NPROBE: int = 16  # lists scanned per query; higher = better recall, slower
+    # In-memory quantization for the exact index: "none", "float16" or "int8".
+    # Not supported with EMBEDDING_INDEX_MODE=ivf (rejected at startup)
+    EMBEDDING_QUANTIZATION: str = "none"
+    QUANTIZED_RESCORE_FACTOR: int = 4  # shortlist size, as a multiple of k, re-ranked at full precision
+    # Two-stage semantic search: first pass on a truncated, renormalized prefix
+    # of this many dims (0 = off), then full cosine on shortlist_factor * k rows.
+    # Live talent and job ranking takes its candidates from that shortlist
+    EMBEDDING_PREFIX_DIM: int = 0
+    EMBEDDING_PREFIX_SHORTLIST_FACTOR: int = 10
+    # Serve /matches from the precomputed match_scores table (score_store.py),
+    # falling back to live scoring while a profile has no stored scores
+    MATCH_SCORE_STORE: bool = True
+    # Live top-k talent ranking scores semantic similarity in batches of this
+    # many candidates, best keyword bound first, and stops once no remaining
+    # candidate can reach the top k (matching.threshold_top_k)
+    MATCH_PRUNE_BATCH_SIZE: int = 256
+    # Live talent ranking shards across worker processes (parallel_scoring)
+    # once talents x keyword pools reaches this many pairs
+    MATCH_PARALLEL_MIN_PAIRS: int = 500_000
+    MATCH_PARALLEL_WORKERS: int = 0  # per API process; 0 = CPUs / WEB_CONCURRENCY, 1 = never parallel
+    # API processes per host; uvicorn reads the same variable as its --workers default
+    WEB_CONCURRENCY: int = 1
+    # Cached /matches list pages (match_cache.py): "memory" (per-process LRU) or "none"
+    MATCH_CACHE_BACKEND: str = "memory"
+    MATCH_CACHE_SIZE: int = 1024  # pages kept
+    MATCH_CACHE_TTL_SECONDS: float = 60.0  # bounds staleness from writes this process can't see
+    # On-disk dtype for Embedding.vector: "float32", "float16" or "int8". Must stay
+    # float32 with EMBEDDING_QUANTIZATION, which reads exact scores from these rows
+    EMBEDDING_STORAGE_DTYPE: str = "float32"
+    
     # CORS
     CORS_ORIGINS: Union[list[str], str] = ["http://localhost:5173", "http://localhost:5174", "http://localhost:5175", "http://localhost:3000"]
 
@@ -41,6 +107,24 @@ class Settings(BaseSettings):
         elif isinstance(v, (list, str)):
             return v
         raise ValueError(v)
+
+    @model_validator(mode="after")
+    def full_precision_storage_when_quantized(self) -> "Settings":
+        if self.EMBEDDING_QUANTIZATION != "none" and self.EMBEDDING_STORAGE_DTYPE != "float32":
+            raise ValueError(
+                "EMBEDDING_STORAGE_DTYPE must be float32 when EMBEDDING_QUANTIZATION is set: "
+                "stored vectors are the only full-precision copy matching scores are computed from"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def quantization_needs_exact_index(self) -> "Settings":
+        if self.EMBEDDING_INDEX_MODE == "ivf" and self.EMBEDDING_QUANTIZATION != "none":
+            raise ValueError(
+                "EMBEDDING_QUANTIZATION is only supported with EMBEDDING_INDEX_MODE=exact: "
+                "the IVF index keeps full-precision vectors"
+            )
+        return self
     
     # Mock mode (for development without database)
     USE_MOCK_DATA: bool = False  # Set to False when database is ready (can also be set via env var)
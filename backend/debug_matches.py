@@ -4,6 +4,7 @@ from sqlalchemy import select
 from database import get_db
 from models import StartupProfile, TalentProfile, User, JobPosting
 from matching import match_talent_to_startup
+from match_loader import MatchLoader
 
 async def debug_matches():
     async for db in get_db():
@@ -14,6 +15,10 @@ async def debug_matches():
         talent_result = await db.execute(select(TalentProfile))
         all_talent = talent_result.scalars().all()
         
+        # Talent profiles and embeddings are read once across all founders
+        loader = MatchLoader(db)
+        loader.prime_rows("talent", all_talent)
+        
         output = []
         output.append(f"Total Users: {len(users)}")
         output.append(f"Total Talent Profiles: {len(all_talent)}")
@@ -38,7 +43,7 @@ async def debug_matches():
                     output.append(f"    - {j.title}: {j.required_skills}")
                 
                 for t in all_talent:
-                    match = await match_talent_to_startup(db, t.user_id, u.id)
+                    match = await match_talent_to_startup(db, t.user_id, u.id, loader=loader)
                     output.append(f"  Match with {t.name}: {match.get('match_percentage')}%")
                     output.append(f"    - Talent Skills: {t.skills}")
 
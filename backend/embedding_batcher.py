@@ -0,0 +1,106 @@
+"""Micro-batching for embedding provider calls.
+
+Concurrent ``embed(text)`` calls are collected for up to ``max_wait_ms`` or
+``max_batch_size`` texts and sent as one batch request; each caller gets its
+own vector back. The batch function is any ``async (texts) -> vectors``
+callable, so tests and benchmarks can pass a local fake instead of Gemini.
+"""
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into batched provider calls.
+
+    At most ``max_concurrency`` batches are in flight at once. Up to
+    ``max_pending`` texts may wait in the queue; beyond that ``embed`` blocks
+    until there is room, pushing back on callers instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 10.0,
+        max_concurrency: int = 4,
+        max_pending: int = 1024
+    ):
+        self._embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: set = set()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Queue and semaphore bind to the loop that first uses them
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text, sharing a provider call with concurrent callers."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            task = loop.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            pending = [(text, future) for text, future in batch if not future.done()]
+            # Identical texts in one batch are embedded once
+            texts = list(dict.fromkeys(text for text, _ in pending))
+            if not texts:
+                return
+            vectors = dict(zip(texts, await self._embed_batch(texts)))
+            for text, future in pending:
+                if not future.done():
+                    future.set_result(vectors[text])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        """Stop the collector task and wait for in-flight batches."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
@@ -0,0 +1,103 @@
+"""Binary encoding for embedding vectors stored in ``Embedding.vector``.
+
+Layout (little-endian)::
+
+    magic   4s   b"EMBV"
+    version u8   1
+    dtype   u8   see DTYPES
+    _pad    u16
+    dim     u32
+    scale   f32  int8 only: per-vector dequantization scale
+    data    dim * itemsize bytes
+
+The 12-byte header keeps float32 data 4-byte aligned so ``decode_vector``
+can wrap the buffer with ``numpy.frombuffer`` without copying. float16 and
+int8 trade precision for a 2x / 4x smaller footprint and are widened to
+float32 on read.
+"""
+import json
+import struct
+from typing import List, Optional, Union
+import numpy as np
+
+MAGIC = b"EMBV"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHI")
+SCALE = struct.Struct("<f")
+
+# dtype code -> numpy dtype
+DTYPES = {
+    1: np.dtype("<f4"),
+    2: np.dtype("<f2"),
+    3: np.dtype("i1"),
+}
+DTYPE_CODES = {dtype: code for code, dtype in DTYPES.items()}
+INT8 = np.dtype("i1")
+
+
+def quantize_int8(vectors: np.ndarray):
+    """Per-vector symmetric int8 quantization of an (N, d) array.
+
+    Returns ``(codes, scales)`` with ``codes * scales[:, None]`` approximating
+    ``vectors``. All-zero rows get a zero scale.
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(vectors).max(axis=1, initial=0.0) / 127.0
+    codes = np.zeros(vectors.shape, dtype=np.int8)
+    nonzero = scales > 0
+    codes[nonzero] = np.rint(vectors[nonzero] / scales[nonzero, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def encode_vector(vector: Union[List[float], np.ndarray], dtype: str = "float32") -> bytes:
+    """Pack ``vector`` into the header + raw little-endian data format."""
+    dt = np.dtype(dtype).newbyteorder("<")
+    if dt not in DTYPE_CODES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    values = np.asarray(vector, dtype=np.float32).ravel()
+    header = HEADER.pack(MAGIC, VERSION, DTYPE_CODES[dt], 0, len(values))
+    if dt == INT8:
+        codes, scales = quantize_int8(values)
+        return header + SCALE.pack(scales[0]) + codes.tobytes()
+    return header + values.astype(dt).tobytes()
+
+
+def is_encoded(value) -> bool:
+    """Whether ``value`` is a binary vector written by ``encode_vector``."""
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:4]) == MAGIC
+
+
+def decode_vector(value) -> Optional[np.ndarray]:
+    """Read a stored embedding as a 1-d array, or None if it is not a vector.
+
+    Accepts the binary format as well as the legacy JSON column value (a
+    list, or its text form as returned by raw queries), so callers can read
+    either during the migration.
+    """
+    if value is None:
+        return None
+    if is_encoded(value):
+        magic, version, code, _, dim = HEADER.unpack_from(value)
+        if version != VERSION or code not in DTYPES:
+            raise ValueError(f"Unsupported embedding encoding: version={version} dtype={code}")
+        if DTYPES[code] == INT8:
+            (scale,) = SCALE.unpack_from(value, HEADER.size)
+            codes = np.frombuffer(value, dtype=INT8, count=dim, offset=HEADER.size + SCALE.size)
+            return codes.astype(np.float32) * scale
+        data = np.frombuffer(value, dtype=DTYPES[code], count=dim, offset=HEADER.size)
+        return data if data.dtype == np.float32 else data.astype(np.float32)
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if isinstance(value, list):
+        return np.asarray(value, dtype=np.float32)
+    return None
+
+
+def stored_vector(embedding) -> Optional[np.ndarray]:
+    """Vector of an ``Embedding`` row, preferring the binary column."""
+    if embedding.vector is not None:
+        return decode_vector(embedding.vector)
+    return decode_vector(embedding.embedding)
@@ -0,0 +1,129 @@
+"""Timeout, circuit breaker and latency metrics around embedding provider calls.
+
+Provider calls run on a dedicated, bounded thread pool (see
+``matching._embed_documents``) so a slow provider cannot starve the default
+executor. ``CircuitBreaker.call`` adds a per-call deadline and, after
+``failure_threshold`` consecutive failures, rejects calls immediately for
+``reset_timeout`` seconds before letting a single trial call through.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the breaker is open."""
+
+
+class CallMetrics:
+    """Counters and a window of recent latencies for one dependency."""
+
+    def __init__(self, window: int = 1024):
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self._latencies = deque(maxlen=window)
+
+    def observe(self, seconds: float, ok: bool, timed_out: bool = False) -> None:
+        self.calls += 1
+        self._latencies.append(seconds)
+        if not ok:
+            self.failures += 1
+        if timed_out:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99)},
+        }
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial -> closed."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, call_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+        self.metrics = CallMetrics()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def _admit(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def _record(self, ok: bool) -> None:
+        self._trial_in_flight = False
+        if ok:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            return
+        self._consecutive_failures += 1
+        if self._state != self.CLOSED or self._consecutive_failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` under the deadline, or fail fast while open."""
+        if not self._admit():
+            self.metrics.rejected += 1
+            raise CircuitOpenError("Embedding provider circuit is open")
+
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(fn(), self.call_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.observe(time.perf_counter() - start, ok=False, timed_out=True)
+            self._record(ok=False)
+            raise TimeoutError(f"Embedding provider call exceeded {self.call_timeout}s")
+        except asyncio.CancelledError:
+            # Caller went away; the call says nothing about provider health
+            self._trial_in_flight = False
+            raise
+        except Exception:
+            self.metrics.observe(time.perf_counter() - start, ok=False)
+            self._record(ok=False)
+            raise
+        self.metrics.observe(time.perf_counter() - start, ok=True)
+        self._record(ok=True)
+        return result
+
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            **self.metrics.snapshot(),
+        }
@@ -0,0 +1,652 @@
+"""In-process embedding indexes, one per ``text_source``.
+
+Vectors are held L2-normalized in a contiguous float32 matrix so cosine
+similarity is a single matrix-vector product. Indexes are built once at
+startup from the ``embeddings`` table and kept current by
+``matching.store_embedding`` in-process and ``sync_indexes`` for rows the
+embedding worker writes; until ``build_indexes`` has run the matching
+layer falls back to reading embeddings from the database. Indexes are
+keyed by user id, except 'role_posting', which is keyed by job posting id.
+
+With ``EMBEDDING_SNAPSHOT_DIR`` set, the embedding worker also saves its
+indexes there (``embedding_snapshot``) and API processes start from a
+memory-mapped snapshot instead of the table (``load_snapshot``).
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from scoring import l2_normalize
+from embedding_codec import decode_vector, quantize_int8
+from embedding_snapshot import (
+    DeltaLog, REMOVE, UPSERT, WATERMARK, current, delta_path, index_path, read_index, replay, write_snapshot
+)
+from config import settings
+
+
+class EmbeddingIndex:
+    """Exact cosine index over L2-normalized float32 vectors.
+
+    With ``prefix_dim`` set, the index also keeps each vector's first
+    ``prefix_dim`` dimensions, renormalized. Matryoshka-trained embeddings
+    rank well on such a prefix, so ``top_k`` scans the pool on the prefix
+    first and computes full-dimension cosine only for the best
+    ``shortlist_factor * k`` rows. Live matching takes that shortlist as its
+    semantic candidates (``matching.semantic_bounds``), so a row the prefix
+    pass drops can be missed.
+    """
+
+    def __init__(
+        self,
+        text_source: str,
+        dim: Optional[int] = None,
+        prefix_dim: int = 0,
+        shortlist_factor: int = 10
+    ):
+        self.text_source = text_source
+        self.dim = dim
+        self.prefix_dim = prefix_dim
+        self.shortlist_factor = shortlist_factor
+        self._prefix = np.zeros((0, prefix_dim), dtype=np.float32)
+        self._allocate(0)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # Users whose stored embedding is unusable (not a vector, wrong size).
+        # They still count as "has an embedding" for hybrid weighting.
+        self._degenerate: set = set()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._rows or user_id in self._degenerate
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Live rows of the index as float32, shape (len(self), dim)."""
+        return self._read(slice(0, len(self._ids)))
+
+    # Storage hooks; subclasses override these to change the row encoding
+
+    def _allocate(self, capacity: int) -> None:
+        self._matrix = np.zeros((capacity, self.dim or 0), dtype=np.float32)
+
+    def _capacity(self) -> int:
+        return len(self._matrix)
+
+    def _grow(self, capacity: int) -> None:
+        old, size = self._matrix, len(self._ids)
+        self._allocate(capacity)
+        self._matrix[:size] = old[:size]
+
+    def _write(self, row: int, vec: np.ndarray) -> None:
+        self._matrix[row] = vec
+
+    def _move(self, src: int, dst: int) -> None:
+        self._matrix[dst] = self._matrix[src]
+
+    def _read(self, rows) -> np.ndarray:
+        return self._matrix[rows]
+
+    def _dot(self, rows, query: np.ndarray) -> np.ndarray:
+        return self._matrix[rows] @ query
+
+    def _vector(self, vector) -> Optional[np.ndarray]:
+        if not isinstance(vector, (list, tuple, np.ndarray)) or len(vector) == 0:
+            return None
+        vec = np.asarray(vector, dtype=np.float32)
+        if vec.ndim != 1:
+            return None
+        if self.dim is None:
+            self.dim = len(vec)
+            self._allocate(0)
+        if len(vec) != self.dim:
+            return None
+        return l2_normalize(vec)[0]
+
+    def upsert(self, user_id: str, vector) -> None:
+        """Insert or replace the vector stored for ``user_id``."""
+        user_id = str(user_id)
+        vec = self._vector(vector)
+        if vec is None:
+            self.remove(user_id)
+            self._degenerate.add(user_id)
+            return
+        self._degenerate.discard(user_id)
+
+        row = self._rows.get(user_id)
+        if row is None:
+            row = len(self._ids)
+            if row == self._capacity():
+                # Grow geometrically so appends stay amortized O(dim)
+                self._grow(max(16, 2 * self._capacity()))
+                if self.prefix_dim:
+                    prefix = np.zeros((self._capacity(), self.prefix_dim), dtype=np.float32)
+                    prefix[:row] = self._prefix[:row]
+                    self._prefix = prefix
+            self._ids.append(user_id)
+            self._rows[user_id] = row
+        self._write(row, vec)
+        if self.prefix_dim:
+            self._prefix[row] = l2_normalize(vec[:self.prefix_dim])[0]
+
+    def extend(self, items: Iterable[Tuple[str, object]]) -> None:
+        """Bulk upsert of (user_id, vector) pairs."""
+        for user_id, vector in items:
+            self.upsert(user_id, vector)
+
+    def adopt(self, ids: List[str], matrix: np.ndarray, degenerate: Iterable[str]) -> None:
+        """Load an empty index from L2-normalized rows for ``ids`` without copying them.
+
+        ``matrix`` becomes the index's storage, so it may have spare rows
+        after ``len(ids)``; a copy-on-write memory map stays shared with
+        other processes until a row is written.
+        """
+        if matrix.shape[1]:
+            self.dim = matrix.shape[1]
+            self._matrix = matrix
+            if self.prefix_dim:
+                self._prefix = np.zeros((len(matrix), self.prefix_dim), dtype=np.float32)
+                self._prefix[:len(ids)] = l2_normalize(matrix[:len(ids), :self.prefix_dim])
+        self._ids = list(ids)
+        self._rows = {user_id: row for row, user_id in enumerate(self._ids)}
+        self._degenerate = set(degenerate)
+
+    def remove(self, user_id: str) -> None:
+        """Drop ``user_id`` from the index, moving the last row into its slot."""
+        user_id = str(user_id)
+        self._degenerate.discard(user_id)
+        row = self._rows.pop(user_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._move(last, row)
+            if self.prefix_dim:
+                self._prefix[row] = self._prefix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._ids.pop()
+
+    def get(self, user_id: str) -> Optional[np.ndarray]:
+        """Normalized vector for ``user_id``, or None if absent or unusable."""
+        row = self._rows.get(str(user_id))
+        return None if row is None else self._read(row)
+
+    def _query(self, query_vec) -> Optional[np.ndarray]:
+        if query_vec is None or self.dim is None:
+            return None
+        query = np.asarray(query_vec, dtype=np.float32)
+        if query.ndim != 1 or len(query) != self.dim:
+            return None
+        return l2_normalize(query)[0]
+
+    def scores_for(self, query_vec, user_ids: Iterable[str]) -> np.ndarray:
+        """Cosine score of ``query_vec`` against each of ``user_ids`` (0.0 if absent)."""
+        user_ids = [str(u) for u in user_ids]
+        scores = np.zeros(len(user_ids), dtype=np.float32)
+        query = self._query(query_vec)
+        if query is None:
+            return scores
+        rows = np.fromiter((self._rows.get(u, -1) for u in user_ids), dtype=np.int64, count=len(user_ids))
+        found = rows >= 0
+        if found.any():
+            scores[found] = self._dot(rows[found], query)
+        return scores
+
+    def top_k(
+        self,
+        query_vec,
+        k: int,
+        filter_ids: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """The ``k`` most similar users as (user_id, cosine) pairs, best first.
+
+        ``filter_ids`` restricts the search to those users.
+        """
+        query = self._query(query_vec)
+        if query is None or k <= 0 or not self._ids:
+            return []
+
+        if filter_ids is None:
+            ids = self._ids
+            rows = slice(0, len(ids))
+        else:
+            ids = [str(u) for u in filter_ids if str(u) in self._rows]
+            if not ids:
+                return []
+            rows = [self._rows[u] for u in ids]
+
+        ids, rows = self._prefix_shortlist(query, k, ids, rows)
+        # Stage two (or the only stage): full-dimension cosine
+        scores = self._dot(rows, query)
+        return _select_top_k(ids, scores, k)
+
+    def _prefix_shortlist(self, query: np.ndarray, k: int, ids, rows):
+        """Stage one: the ``shortlist_factor * k`` of ``rows`` closest on the truncated prefix."""
+        shortlist_size = k * self.shortlist_factor
+        if not self._prefix_search() or len(ids) <= shortlist_size:
+            return ids, rows
+        coarse = self._prefix[rows] @ l2_normalize(query[:self.prefix_dim])[0]
+        keep = np.argpartition(-coarse, shortlist_size - 1)[:shortlist_size]
+        rows = np.arange(len(ids))[keep] if isinstance(rows, slice) else np.asarray(rows)[keep]
+        return [ids[i] for i in keep], rows
+
+    def shortlist_size(self, k: int) -> int:
+        """Rows of ``top_k`` worth fetching to bound every other row's score when ranking ``k``.
+
+        0 when ``top_k`` is no cheaper than scoring the candidates directly.
+        """
+        return k if self._prefix_search() else 0
+
+    def _prefix_search(self) -> bool:
+        return bool(self.prefix_dim) and self.dim is not None and self.prefix_dim < self.dim
+
+    def score_error(self) -> float:
+        """Most that a score from this index can differ from the full-precision cosine."""
+        return 0.0
+
+
+def _select_top_k(ids, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+    """Pick the ``k`` best (id, score) pairs without sorting the whole array."""
+    if k < len(scores):
+        best = np.argpartition(-scores, k - 1)[:k]
+    else:
+        best = np.arange(len(scores))
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return [(ids[i], float(scores[i])) for i in best]
+
+
+class IVFEmbeddingIndex(EmbeddingIndex):
+    """Approximate index: inverted file over spherical k-means centroids.
+
+    Vectors are stored exactly as in ``EmbeddingIndex`` and additionally
+    assigned to their nearest of ``nlist`` centroids. ``top_k`` only scores
+    rows in the ``nprobe`` lists closest to the query, so raising ``nprobe``
+    trades latency for recall (``nprobe == nlist`` is exact). Until the index
+    holds enough vectors to train on, searches fall back to brute force.
+    Once trained, live matching takes its semantic candidates from the probed
+    lists (``matching.semantic_bounds``), so rows in other lists can be missed.
+    """
+
+    def __init__(
+        self,
+        text_source: str,
+        dim: Optional[int] = None,
+        nlist: int = 256,
+        nprobe: int = 16,
+        train_iterations: int = 10,
+        seed: int = 0,
+        prefix_dim: int = 0,
+        shortlist_factor: int = 10
+    ):
+        super().__init__(text_source, dim, prefix_dim, shortlist_factor)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self._rng = np.random.default_rng(seed)
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+        self._auto_train = True
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def train(self) -> None:
+        """(Re)build centroids with spherical k-means and reassign every row."""
+        data = self.matrix
+        nlist = min(self.nlist, len(data))
+        if nlist == 0:
+            return
+        # k-means on a bounded sample keeps training cost independent of N
+        sample_size = min(len(data), 32 * nlist)
+        sample = data[self._rng.choice(len(data), sample_size, replace=False)]
+        centroids = sample[self._rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=nlist) == 0
+            # Re-seed empty lists from random sample points
+            sums[empty] = sample[self._rng.choice(sample_size, int(empty.sum()))]
+            centroids = l2_normalize(sums)
+
+        self._centroids = centroids
+        self._assign = np.zeros(self._capacity(), dtype=np.int32)
+        self._assign[:len(data)] = self._nearest(data)
+        self._trained_size = len(data)
+
+    def _nearest(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def extend(self, items: Iterable[Tuple[str, object]]) -> None:
+        # Train once after the bulk load instead of at every doubling
+        self._auto_train = False
+        try:
+            super().extend(items)
+        finally:
+            self._auto_train = True
+        if len(self) >= 4 * self.nlist or self.trained:
+            self.train()
+
+    def adopt(self, ids: List[str], matrix: np.ndarray, degenerate: Iterable[str]) -> None:
+        super().adopt(ids, matrix, degenerate)
+        if len(self) >= 4 * self.nlist:
+            self.train()
+
+    def upsert(self, user_id: str, vector) -> None:
+        super().upsert(user_id, vector)
+        if not self._auto_train:
+            return
+        if not self.trained:
+            if len(self) >= 4 * self.nlist:
+                self.train()
+            return
+        if len(self) >= 2 * self._trained_size:
+            # Retrain as the pool doubles so lists stay balanced
+            self.train()
+            return
+        row = self._rows.get(str(user_id))
+        if row is not None:
+            if len(self._assign) < self._capacity():
+                grown = np.zeros(self._capacity(), dtype=np.int32)
+                grown[:len(self._assign)] = self._assign
+                self._assign = grown
+            self._assign[row] = self._nearest(self._read([row]))[0]
+
+    def remove(self, user_id: str) -> None:
+        row = self._rows.get(str(user_id))
+        last = len(self._ids) - 1
+        super().remove(user_id)
+        if self.trained and row is not None and row != last:
+            self._assign[row] = self._assign[last]
+
+    def shortlist_size(self, k: int) -> int:
+        if self.trained and self.nprobe < len(self._centroids):
+            return k
+        return super().shortlist_size(k)
+
+    def top_k(
+        self,
+        query_vec,
+        k: int,
+        filter_ids: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        if not self.trained or filter_ids is not None or self.nprobe >= len(self._centroids):
+            # Filtered searches are usually small enough to score exactly
+            return super().top_k(query_vec, k, filter_ids)
+        query = self._query(query_vec)
+        if query is None or k <= 0 or not self._ids:
+            return []
+
+        nprobe = max(1, self.nprobe)
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.flatnonzero(np.isin(self._assign[:len(self._ids)], probes))
+        if not len(rows):
+            return []
+        # The prefix pass, if any, narrows the probed lists
+        _, rows = self._prefix_shortlist(query, k, list(range(len(rows))), rows)
+        scores = self._dot(rows, query)
+        return [(self._ids[rows[i]], score) for i, score in _select_top_k(range(len(rows)), scores, k)]
+
+
+class QuantizedEmbeddingIndex(EmbeddingIndex):
+    """Exact-scan index holding float16 or per-vector scaled int8 codes.
+
+    A 768-d row takes 1536 (float16) or 772 (int8 + scale) bytes instead of
+    3072, so a whole talent pool fits in each worker. Scans widen one block
+    of codes at a time, keeping the float32 working set bounded. Scores are
+    off by up to ``score_error``, so matching only uses them to shortlist
+    ``rescore_factor * k`` rows and bound the rest, and reads full-precision
+    vectors from the database for the scores it reports.
+    """
+
+    SCAN_BLOCK = 4096
+
+    def __init__(
+        self,
+        text_source: str,
+        dim: Optional[int] = None,
+        dtype: str = "int8",
+        rescore_factor: int = 4,
+        prefix_dim: int = 0,
+        shortlist_factor: int = 10
+    ):
+        if dtype not in ("int8", "float16"):
+            raise ValueError(f"Unsupported quantization: {dtype}")
+        self.dtype = dtype
+        self.rescore_factor = rescore_factor
+        super().__init__(text_source, dim, prefix_dim, shortlist_factor)
+
+    def _allocate(self, capacity: int) -> None:
+        self._codes = np.zeros((capacity, self.dim or 0), dtype=np.dtype(self.dtype))
+        self._scales = np.ones(capacity, dtype=np.float32)
+
+    def _capacity(self) -> int:
+        return len(self._codes)
+
+    def _grow(self, capacity: int) -> None:
+        codes, scales, size = self._codes, self._scales, len(self._ids)
+        self._allocate(capacity)
+        self._codes[:size] = codes[:size]
+        self._scales[:size] = scales[:size]
+
+    def _write(self, row: int, vec: np.ndarray) -> None:
+        if self.dtype == "int8":
+            codes, scales = quantize_int8(vec)
+            self._codes[row], self._scales[row] = codes[0], scales[0]
+        else:
+            self._codes[row] = vec
+
+    def _move(self, src: int, dst: int) -> None:
+        self._codes[dst] = self._codes[src]
+        self._scales[dst] = self._scales[src]
+
+    def adopt(self, ids: List[str], matrix: np.ndarray, degenerate: Iterable[str]) -> None:
+        # Codes are private to the process; quantize the mapped rows
+        self.extend(zip(ids, matrix[:len(ids)]))
+        self._degenerate.update(degenerate)
+
+    def _read(self, rows) -> np.ndarray:
+        scales = self._scales[rows]
+        return self._codes[rows].astype(np.float32) * np.expand_dims(scales, -1)
+
+    def _dot(self, rows, query: np.ndarray) -> np.ndarray:
+        if isinstance(rows, slice):
+            start, stop, _ = rows.indices(len(self._ids))
+            scores = np.empty(stop - start, dtype=np.float32)
+            for offset in range(start, stop, self.SCAN_BLOCK):
+                end = min(offset + self.SCAN_BLOCK, stop)
+                block = self._codes[offset:end].astype(np.float32) @ query
+                scores[offset - start:end - start] = block * self._scales[offset:end]
+            return scores
+        return (self._codes[rows].astype(np.float32) @ query) * self._scales[rows]
+
+    def shortlist_size(self, k: int) -> int:
+        return k * self.rescore_factor
+
+    def score_error(self) -> float:
+        # |cos(q, v') - cos(q, v)| <= ||v' - v|| for a unit query
+        if self.dtype == "float16":
+            return 2.0 ** -11 + 1e-6
+        if not self._ids:
+            return 0.0
+        # Rounding moves each int8 component by at most half its row's scale
+        return float(np.sqrt(self.dim) * self._scales[:len(self._ids)].max() / 2) + 1e-6
+
+
+_indexes: Dict[str, EmbeddingIndex] = {}
+_loaded = False
+# Newest Embedding.created_at loaded so far
+_synced_through: Optional[str] = None
+# Rows stamped before this much earlier may commit after a sync has read
+# past them, so each sync re-reads the window; upserts are idempotent
+SYNC_OVERLAP = timedelta(seconds=30)
+# Delta log of the snapshot this process last saved, if it saves snapshots
+_delta_log: Optional[DeltaLog] = None
+
+
+def create_index(text_source: str) -> EmbeddingIndex:
+    """Empty index of the kind selected by ``EMBEDDING_INDEX_MODE``/``EMBEDDING_QUANTIZATION``."""
+    prefix = {
+        "prefix_dim": settings.EMBEDDING_PREFIX_DIM,
+        "shortlist_factor": settings.EMBEDDING_PREFIX_SHORTLIST_FACTOR,
+    }
+    if settings.EMBEDDING_INDEX_MODE == "ivf":
+        return IVFEmbeddingIndex(text_source, nlist=settings.IVF_NLIST, nprobe=settings.IVF_NPROBE, **prefix)
+    if settings.EMBEDDING_QUANTIZATION != "none":
+        return QuantizedEmbeddingIndex(
+            text_source,
+            dtype=settings.EMBEDDING_QUANTIZATION,
+            rescore_factor=settings.QUANTIZED_RESCORE_FACTOR,
+            **prefix
+        )
+    return EmbeddingIndex(text_source, **prefix)
+
+
+def get_index(text_source: str) -> EmbeddingIndex:
+    """Index for ``text_source``, created empty on first use."""
+    index = _indexes.get(text_source)
+    if index is None:
+        index = _indexes[text_source] = create_index(text_source)
+    return index
+
+
+def indexes_loaded() -> bool:
+    """Whether ``build_indexes`` or ``load_snapshot`` has populated the indexes in this process."""
+    return _loaded
+
+
+def synced_through() -> Optional[str]:
+    """Newest ``Embedding.created_at`` loaded; advances as the worker's embeddings are synced."""
+    return _synced_through
+
+
+def upsert_vector(text_source: str, key: str, vector) -> None:
+    """Upsert into the index for ``text_source``, recording it in the snapshot delta log if saving one."""
+    key = str(key)
+    get_index(text_source).upsert(key, vector)
+    if _delta_log is not None:
+        _delta_log.upsert(text_source, key, vector)
+
+
+def remove_vector(text_source: str, key: str) -> None:
+    """Remove from the index for ``text_source``, recording it in the snapshot delta log if saving one."""
+    key = str(key)
+    get_index(text_source).remove(key)
+    if _delta_log is not None:
+        _delta_log.remove(text_source, key)
+
+
+async def _load_rows(db: AsyncSession, since: Optional[str] = None) -> Dict[str, List[Tuple[str, object]]]:
+    """Decoded embeddings per text_source, optionally only those stamped at or after ``since``."""
+    global _synced_through
+    from models import Embedding
+
+    query = select(
+        Embedding.user_id, Embedding.job_id, Embedding.text_source,
+        Embedding.vector, Embedding.embedding, Embedding.created_at
+    )
+    if since is not None:
+        query = query.where(Embedding.created_at >= since)
+    result = await db.execute(query)
+
+    rows: Dict[str, List[Tuple[str, object]]] = {}
+    for user_id, job_id, text_source, vector, legacy, created_at in result.all():
+        if text_source:
+            value = decode_vector(vector if vector is not None else legacy)
+            # 'role_posting' vectors are keyed by their job posting
+            rows.setdefault(text_source, []).append((str(job_id or user_id), value))
+        if created_at and (_synced_through is None or created_at > _synced_through):
+            _synced_through = created_at
+    return rows
+
+
+async def build_indexes(db: AsyncSession) -> None:
+    """Load every row of the ``embeddings`` table into the per-source indexes."""
+    global _loaded, _synced_through
+    _synced_through = None
+    rows = await _load_rows(db)
+
+    _indexes.clear()
+    for text_source, items in rows.items():
+        get_index(text_source).extend(items)
+    _loaded = True
+    print(f"Embedding indexes built: {', '.join(f'{k}={len(v)}' for k, v in _indexes.items()) or 'empty'}")
+
+
+async def sync_indexes(db: AsyncSession) -> int:
+    """Upsert embeddings written since the last build or sync, e.g. by the worker.
+
+    Returns the number of rows applied.
+    """
+    if not _loaded:
+        return 0
+    since = None
+    if _synced_through:
+        since = (datetime.fromisoformat(_synced_through) - SYNC_OVERLAP).isoformat()
+    rows = await _load_rows(db, since)
+    for text_source, items in rows.items():
+        for user_id, value in items:
+            upsert_vector(text_source, user_id, value)
+    if _delta_log is not None and rows:
+        _delta_log.watermark(_synced_through)
+    return sum(len(items) for items in rows.values())
+
+
+def save_snapshot(directory: str) -> str:
+    """Write this process's indexes as a new snapshot generation and log later changes to it.
+
+    Saves float32 rows as the indexes return them, so the writer should
+    keep unquantized indexes. Returns the generation.
+    """
+    global _delta_log
+    snapshot = {
+        text_source: (list(index._ids), index.matrix, sorted(index._degenerate))
+        for text_source, index in _indexes.items()
+    }
+    generation, log = write_snapshot(directory, snapshot, _synced_through)
+    if _delta_log is not None:
+        _delta_log.close()
+    _delta_log = log
+    return generation
+
+
+def load_snapshot(directory: str) -> bool:
+    """Populate the indexes from the current snapshot in ``directory`` and its delta log.
+
+    Returns False if no snapshot has been saved there. ``sync_indexes``
+    then continues from the writer's last recorded sync.
+    """
+    global _loaded, _synced_through
+    manifest = current(directory)
+    if manifest is None:
+        return False
+    generation = manifest["generation"]
+    indexes: Dict[str, EmbeddingIndex] = {}
+    for text_source in manifest["sources"]:
+        index = indexes[text_source] = create_index(text_source)
+        index.adopt(*read_index(index_path(directory, generation, text_source)))
+
+    synced_through = manifest["synced_through"]
+    for kind, text_source, key, vector in replay(delta_path(directory, generation)):
+        if kind == UPSERT:
+            if text_source not in indexes:
+                indexes[text_source] = create_index(text_source)
+            indexes[text_source].upsert(key, vector)
+        elif kind == REMOVE and text_source in indexes:
+            indexes[text_source].remove(key)
+        elif kind == WATERMARK and (synced_through is None or key > synced_through):
+            synced_through = key
+
+    _indexes.clear()
+    _indexes.update(indexes)
+    _synced_through = synced_through
+    _loaded = True
+    print(f"Embedding indexes mapped from snapshot {generation}: "
+          f"{', '.join(f'{k}={len(v)}' for k, v in _indexes.items()) or 'empty'}")
+    return True
@@ -0,0 +1,95 @@
+"""Embedding providers selectable through ``settings.EMBEDDING_PROVIDER``.
+
+``gemini`` calls Google's gemini-embedding-001 and needs ``GOOGLE_API_KEY``.
+``hashing`` is a local, deterministic stand-in for benchmarks, load tests
+and offline development: texts that share words and character n-grams get
+similar vectors, so semantic scoring, index builds and ANN recall behave
+realistically without network access. Its vectors are not comparable with
+Gemini's, so switching providers means re-embedding (the model name is part
+of each embedding's content hash).
+"""
+import functools
+import hashlib
+import re
+from typing import List, Optional, Tuple
+import numpy as np
+
+GEMINI_MODEL = "models/gemini-embedding-001"
+# gemini-embedding-001 output dimension is 768
+EMBEDDING_DIM = 768
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _word_features(word: str, ngram_sizes: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Hashes of a word and its character n-grams (with boundary markers)."""
+    padded = f"<{word}>"
+    features = [f"w:{word}"]
+    for n in ngram_sizes:
+        features.extend(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+    return tuple(_feature_hash(f) for f in features)
+
+
+class EmbeddingProvider:
+    """Synchronous batch embedder; ``model`` names the vector space."""
+
+    model: str
+    dim: int = EMBEDDING_DIM
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+
+class GeminiEmbeddingProvider(EmbeddingProvider):
+    """gemini-embedding-001 through LangChain."""
+
+    model = GEMINI_MODEL
+
+    def __init__(self, api_key: str):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        self._client = GoogleGenerativeAIEmbeddings(model=self.model, google_api_key=api_key)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # RETRIEVAL_QUERY keeps vectors identical to the embed_query calls used before batching
+        return self._client.embed_documents(texts, task_type="RETRIEVAL_QUERY")
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """Feature-hashed word and character n-gram vectors, L2-normalized.
+
+    Each feature is hashed (blake2b, so results are stable across processes
+    and machines) to a dimension and a sign, which amounts to a sparse random
+    projection of the n-gram counts down to ``dim``.
+    """
+
+    model = "local/hashing-ngrams-v1"
+
+    def __init__(self, dim: int = EMBEDDING_DIM, ngram_sizes: Tuple[int, ...] = (3, 4)):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    def embed_one(self, text: str) -> np.ndarray:
+        digests = [h for word in re.findall(r"\w+", text.lower()) for h in _word_features(word, self.ngram_sizes)]
+        if not digests:
+            return np.zeros(self.dim, dtype=np.float32)
+        digests = np.array(digests, dtype=np.uint64)
+        dims = (digests % np.uint64(self.dim)).astype(np.intp)
+        signs = np.where((digests >> np.uint64(63)) == 1, -1.0, 1.0)
+        vector = np.bincount(dims, weights=signs, minlength=self.dim).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_one(text).tolist() for text in texts]
+
+
+def create_provider(name: str, api_key: Optional[str] = None) -> Optional[EmbeddingProvider]:
+    """Provider for ``name``, or None when Gemini is selected without an API key."""
+    if name == "hashing":
+        return HashingEmbeddingProvider()
+    if name == "gemini":
+        return GeminiEmbeddingProvider(api_key) if api_key else None
+    raise ValueError(f"Unknown EMBEDDING_PROVIDER: {name}")
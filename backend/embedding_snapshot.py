@@ -0,0 +1,189 @@
+"""On-disk embedding index snapshots that every API worker can mmap.
+
+With ``uvicorn --workers N`` each process would otherwise decode the whole
+``embeddings`` table into its own indexes at startup. Instead one embedding
+worker (``EMBEDDING_SNAPSHOT_DIR`` set) periodically writes its indexes to
+``EMBEDDING_SNAPSHOT_DIR`` and API processes map them read-only:
+
+``<generation>.<text_source>.emb``, one per index::
+
+    header   magic, version, dim, count, capacity, degenerate count, id bytes
+    ids      newline-separated utf-8: the row ids in order, then the degenerate ids
+    matrix   capacity x dim float32, L2-normalized, 64-byte aligned
+
+The matrix is mapped copy-on-write, so the page cache holds a single copy
+for all processes and a process only gets private pages for rows it
+changes. ``capacity`` leaves room (a sparse hole on disk) for rows added
+after the snapshot, so appends don't copy the matrix either.
+
+``<generation>.delta`` is an append-only log of what the writer's indexes
+applied after the snapshot (upserts, removals and its sync watermark);
+readers replay it over the snapshot and then continue with the usual
+``sync_indexes`` from the replayed watermark. ``CURRENT`` names the live
+generation and is replaced atomically once a new snapshot is complete.
+"""
+import json
+import os
+import struct
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+MAGIC = b"NLEMBSNP"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQQ")
+_ALIGN = 64
+
+# Delta record: kind, text_source length, key length, dim; then those bytes and dim float32
+_RECORD = struct.Struct("<BHHi")
+UPSERT, REMOVE, WATERMARK = 1, 2, 3
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_index(path: str, ids: List[str], matrix: np.ndarray, degenerate: List[str]) -> None:
+    """Write one index file; ``matrix`` holds the normalized vectors of ``ids`` in order."""
+    count = len(ids)
+    dim = matrix.shape[1] if matrix.ndim == 2 else 0
+    capacity = count + max(1024, count // 4)
+    # Ids are uuids or similar and never contain a newline
+    names = "\n".join(ids + degenerate).encode("utf-8")
+    header = _HEADER.pack(MAGIC, VERSION, dim, count, capacity, len(degenerate), len(names))
+    matrix_offset = _aligned(_HEADER.size + len(names))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(names)
+        f.seek(matrix_offset)
+        f.write(np.ascontiguousarray(matrix[:count], dtype=np.float32).tobytes())
+        # The spare rows stay a hole until some process writes to them
+        f.truncate(matrix_offset + capacity * dim * 4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_index(path: str) -> Tuple[List[str], np.ndarray, List[str]]:
+    """(ids, copy-on-write mapped matrix of shape (capacity, dim), degenerate ids)."""
+    with open(path, "rb") as f:
+        magic, version, dim, count, capacity, degenerate, names_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} embedding snapshot")
+        names = f.read(names_size).decode("utf-8").split("\n") if count + degenerate else []
+    matrix_offset = _aligned(_HEADER.size + names_size)
+    if dim and capacity:
+        matrix = np.memmap(path, dtype=np.float32, mode="c", offset=matrix_offset, shape=(capacity, dim))
+    else:
+        matrix = np.zeros((0, dim), dtype=np.float32)
+    return names[:count], matrix, names[count:]
+
+
+class DeltaLog:
+    """Append-only record of index changes made after a snapshot.
+
+    Each record is written with one ``write`` on an ``O_APPEND`` file, so a
+    reader sees whole records plus, at worst, a torn last one it ignores.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "ab", buffering=0)
+
+    def _append(self, kind: int, text_source: str, key: str, vector: Optional[np.ndarray] = None) -> None:
+        source, key_bytes = text_source.encode("utf-8"), key.encode("utf-8")
+        body = b"" if vector is None else np.asarray(vector, dtype=np.float32).tobytes()
+        dim = -1 if vector is None else len(body) // 4
+        self._file.write(_RECORD.pack(kind, len(source), len(key_bytes), dim) + source + key_bytes + body)
+
+    def upsert(self, text_source: str, key: str, vector) -> None:
+        """Record an upsert; unusable vectors are logged as they came, to be judged on replay."""
+        if not isinstance(vector, (list, tuple, np.ndarray)):
+            vector = []
+        vector = np.asarray(vector, dtype=np.float32)
+        self._append(UPSERT, text_source, key, vector.ravel() if vector.ndim == 1 else np.zeros(0))
+
+    def remove(self, text_source: str, key: str) -> None:
+        self._append(REMOVE, text_source, key)
+
+    def watermark(self, synced_through: str) -> None:
+        self._append(WATERMARK, "", synced_through)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def replay(path: str) -> Iterator[Tuple[int, str, str, Optional[np.ndarray]]]:
+    """(kind, text_source, key, vector) of every complete record in a delta log."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + _RECORD.size <= len(data):
+        kind, source_len, key_len, dim = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        end = start + source_len + key_len + max(dim, 0) * 4
+        if end > len(data):
+            break
+        source = data[start:start + source_len].decode("utf-8")
+        key = data[start + source_len:start + source_len + key_len].decode("utf-8")
+        vector = None
+        if dim >= 0:
+            vector = np.frombuffer(data, dtype=np.float32, count=dim, offset=start + source_len + key_len)
+        yield kind, source, key, vector
+        offset = end
+
+
+def _current_path(directory: str) -> str:
+    return os.path.join(directory, "CURRENT")
+
+
+def current(directory: str) -> Optional[Dict]:
+    """The live generation's manifest, or None if no snapshot was written yet."""
+    try:
+        with open(_current_path(directory)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def index_path(directory: str, generation: str, text_source: str) -> str:
+    return os.path.join(directory, f"{generation}.{text_source}.emb")
+
+
+def delta_path(directory: str, generation: str) -> str:
+    return os.path.join(directory, f"{generation}.delta")
+
+
+def write_snapshot(
+    directory: str,
+    indexes: Dict[str, Tuple[List[str], np.ndarray, List[str]]],
+    synced_through: Optional[str]
+) -> Tuple[str, DeltaLog]:
+    """Write a new generation from (ids, matrix, degenerate ids) per text_source and make it current.
+
+    Returns the generation and its (empty) delta log. Files older than the
+    previous generation are deleted; the previous one is kept for readers
+    that have just read the old ``CURRENT``.
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous = current(directory)
+    generation = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    for text_source, (ids, matrix, degenerate) in indexes.items():
+        write_index(index_path(directory, generation, text_source), ids, matrix, degenerate)
+    log = DeltaLog(delta_path(directory, generation))
+
+    manifest = {"generation": generation, "sources": sorted(indexes), "synced_through": synced_through}
+    tmp = f"{_current_path(directory)}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, _current_path(directory))
+
+    keep = {generation, previous["generation"] if previous else generation}
+    for name in os.listdir(directory):
+        if name != "CURRENT" and not name.endswith(".tmp") and name.split(".", 1)[0] not in keep:
+            os.remove(os.path.join(directory, name))
+    return generation, log
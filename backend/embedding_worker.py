@@ -0,0 +1,250 @@
+"""Embedding worker: drains the ``embedding_jobs`` outbox.
+
+Profile updates enqueue a job in the same transaction as the profile change
+(``matching.enqueue_embedding``). This process claims due jobs in batches,
+keeps only the newest job per user, text source and job posting, embeds the
+texts that actually changed (concurrent calls share one provider request
+through the micro-batcher) and stores the vectors, then refreshes the
+affected users' stored match scores (``score_store.rescore_user``).
+``rescore`` jobs, queued when a job posting changes, only do the latter;
+'role_posting' jobs embed a job posting and rescore no one. API processes
+pick the new embeddings up through ``embedding_index.sync_indexes``. Failed
+embeddings are retried with exponential backoff and leave the stored
+embedding untouched; so are jobs whose batch fails anywhere else (say in
+``rescore_user``), after a re-run on their own singles out the failing job.
+With ``EMBEDDING_SNAPSHOT_DIR`` set, the worker also saves its indexes there
+for API processes to map at startup, every
+``EMBEDDING_SNAPSHOT_SECONDS``, logging what it applies in between.
+
+Usage: python embedding_worker.py
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy import select, update, func, tuple_
+from database import AsyncSessionLocal, engine, init_db
+from embedding_index import build_indexes, save_snapshot, sync_indexes
+from skill_index import build_skill_indexes, sync_skill_indexes
+from models import Embedding, EmbeddingJob, EmbeddingJobStatus, JobPosting
+from embedding_cache import content_hash
+from embedding_providers import EMBEDDING_DIM
+from matching import EMBEDDING_MODEL, embed_text, embedding_batcher, store_embedding
+from score_store import rescore_user
+from config import settings
+
+
+def _timestamp(offset_seconds: float = 0.0) -> str:
+    return (datetime.utcnow() + timedelta(seconds=offset_seconds)).isoformat()
+
+
+async def claim_jobs(limit: int) -> List[EmbeddingJob]:
+    """Lease up to ``limit`` due jobs to this worker.
+
+    Due means PENDING with its retry time passed, or RUNNING with an expired
+    lease (the worker holding it died). SKIP LOCKED lets several workers
+    claim at once without handing out the same job twice.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(EmbeddingJob)
+            .where(
+                EmbeddingJob.status.in_([EmbeddingJobStatus.PENDING, EmbeddingJobStatus.RUNNING]),
+                EmbeddingJob.next_attempt_at <= _timestamp()
+            )
+            .order_by(EmbeddingJob.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = result.scalars().all()
+        lease = _timestamp(settings.EMBEDDING_JOB_LEASE_SECONDS)
+        for job in jobs:
+            job.status = EmbeddingJobStatus.RUNNING
+            job.next_attempt_at = lease
+        await db.commit()
+    return jobs
+
+
+async def _set_status(db, job_ids: List[str], **values) -> None:
+    if job_ids:
+        await db.execute(update(EmbeddingJob).where(EmbeddingJob.id.in_(job_ids)).values(**values))
+
+
+async def _current_jobs(db, jobs: List[EmbeddingJob]) -> Tuple[List[EmbeddingJob], List[EmbeddingJob]]:
+    """Split jobs into the newest per (user, text_source, job posting, task) and superseded ones.
+
+    A job is superseded by any newer job for the same key, including one
+    not in this batch, so an old text never overwrites a newer embedding.
+    """
+    job_key = func.coalesce(EmbeddingJob.job_id, "")
+    columns = (EmbeddingJob.user_id, EmbeddingJob.text_source, job_key, EmbeddingJob.task)
+    keys = {(job.user_id, job.text_source, job.job_id or "", job.task) for job in jobs}
+    result = await db.execute(
+        select(*columns, func.max(EmbeddingJob.created_at))
+        .where(tuple_(*columns).in_(list(keys)))
+        .group_by(*columns)
+    )
+    newest = {
+        (user_id, source, job_id, task): created_at for user_id, source, job_id, task, created_at in result.all()
+    }
+
+    current, superseded, seen = [], [], set()
+    for job in sorted(jobs, key=lambda j: j.created_at or "", reverse=True):
+        key = (job.user_id, job.text_source, job.job_id or "", job.task)
+        if key in seen or (job.created_at or "") < (newest.get(key) or ""):
+            superseded.append(job)
+        else:
+            seen.add(key)
+            current.append(job)
+    return current, superseded
+
+
+async def process_batch(jobs: List[EmbeddingJob]) -> None:
+    """Embed and store the claimed jobs, rescore their users, then record each job's outcome."""
+    async with AsyncSessionLocal() as db:
+        current, superseded = await _current_jobs(db, jobs)
+        done = [job.id for job in superseded]
+        # Stored scores don't depend on job posting embeddings
+        rescore_ids = list(dict.fromkeys(job.user_id for job in current if not job.job_id))
+        done.extend(job.id for job in current if job.task == "rescore")
+        current = [job for job in current if job.task != "rescore"]
+
+        # Postings deleted since their job was queued are not embedded
+        posting_ids = [job.job_id for job in current if job.job_id]
+        if posting_ids:
+            result = await db.execute(select(JobPosting.id).where(JobPosting.id.in_(posting_ids)))
+            live_postings = {str(job_id) for job_id in result.scalars().all()}
+            done.extend(job.id for job in current if job.job_id and job.job_id not in live_postings)
+            current = [job for job in current if not job.job_id or job.job_id in live_postings]
+
+        # Texts whose stored embedding already matches need no provider call
+        hashes = {job.id: content_hash(job.source_text or "", EMBEDDING_MODEL) for job in current}
+        result = await db.execute(
+            select(Embedding.user_id, Embedding.text_source, Embedding.job_id, Embedding.content_hash).where(
+                Embedding.user_id.in_([job.user_id for job in current])
+            )
+        )
+        stored: Dict[Tuple[str, str, str], str] = {
+            (str(user_id), source, job_id or ""): stored_hash for user_id, source, job_id, stored_hash in result.all()
+        }
+        pending = []
+        for job in current:
+            if stored.get((job.user_id, job.text_source, job.job_id or "")) == hashes[job.id]:
+                done.append(job.id)
+            else:
+                pending.append(job)
+
+        vectors = await asyncio.gather(
+            *(embed_text(job.source_text or "", hashes[job.id]) for job in pending),
+            return_exceptions=True
+        )
+        for job, vector in zip(pending, vectors):
+            if isinstance(vector, Exception):
+                await _retry(db, job, vector)
+            elif vector is None:
+                # Nothing to embed or no provider: zero placeholder, left unhashed
+                await store_embedding(db, job.user_id, [0.0] * EMBEDDING_DIM, job.text_source, job_id=job.job_id)
+                done.append(job.id)
+            else:
+                await store_embedding(
+                    db, job.user_id, vector, job.text_source, content_hash=hashes[job.id], job_id=job.job_id
+                )
+                done.append(job.id)
+
+        if settings.MATCH_SCORE_STORE:
+            # Keyword scores change with the profile even if its embedding failed;
+            # the API committed the skills before queueing the job, so a sync sees them
+            await sync_indexes(db)
+            await sync_skill_indexes(db)
+            for user_id in rescore_ids:
+                await rescore_user(db, user_id)
+
+        await _set_status(db, done, status=EmbeddingJobStatus.DONE, last_error=None)
+        await db.commit()
+
+    failed = len(pending) - sum(not isinstance(v, Exception) for v in vectors)
+    print(f"Embedding jobs: {len(jobs)} claimed, {len(done)} done, {failed} retrying or failed")
+
+
+async def process_claimed(jobs: List[EmbeddingJob]) -> None:
+    """``process_batch``, counting an error outside the provider path as an attempt.
+
+    A failed batch is rolled back and each of its jobs re-run alone, so only
+    the jobs that fail by themselves are retried or given up on.
+    """
+    try:
+        await process_batch(jobs)
+        return
+    except Exception as e:
+        if len(jobs) == 1:
+            await _fail(jobs[0], e)
+            return
+        print(f"Embedding batch of {len(jobs)} failed ({e}), processing its jobs one at a time")
+    for job in jobs:
+        try:
+            await process_batch([job])
+        except Exception as e:
+            await _fail(job, e)
+
+
+async def _fail(job: EmbeddingJob, error: Exception) -> None:
+    async with AsyncSessionLocal() as db:
+        await _retry(db, job, error)
+        await db.commit()
+
+
+async def _retry(db, job: EmbeddingJob, error: Exception) -> None:
+    """Schedule another attempt with exponential backoff, or give up."""
+    attempts = (job.attempts or 0) + 1
+    if attempts >= settings.EMBEDDING_JOB_MAX_ATTEMPTS:
+        status, next_attempt_at = EmbeddingJobStatus.FAILED, None
+    else:
+        delay = min(
+            settings.EMBEDDING_JOB_BACKOFF_SECONDS * 2 ** (attempts - 1),
+            settings.EMBEDDING_JOB_MAX_BACKOFF_SECONDS
+        )
+        status, next_attempt_at = EmbeddingJobStatus.PENDING, _timestamp(delay)
+    print(f"Embedding job {job.id} attempt {attempts} failed: {error}")
+    await _set_status(
+        db, [job.id],
+        status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error)[:1000]
+    )
+
+
+async def save_index_snapshot() -> None:
+    """Catch the indexes up with the table and save them as a new snapshot."""
+    async with AsyncSessionLocal() as db:
+        await sync_indexes(db)
+    start = time.perf_counter()
+    generation = save_snapshot(settings.EMBEDDING_SNAPSHOT_DIR)
+    print(f"Embedding snapshot {generation} saved in {time.perf_counter() - start:.2f}s")
+
+
+async def run_worker() -> None:
+    await init_db()
+    async with AsyncSessionLocal() as db:
+        await build_indexes(db)
+        await build_skill_indexes(db)
+    print("Embedding worker started.")
+    snapshot_due = 0.0
+    try:
+        while True:
+            try:
+                if settings.EMBEDDING_SNAPSHOT_DIR and time.monotonic() >= snapshot_due:
+                    await save_index_snapshot()
+                    snapshot_due = time.monotonic() + settings.EMBEDDING_SNAPSHOT_SECONDS
+                jobs = await claim_jobs(settings.EMBEDDING_WORKER_BATCH_SIZE)
+                if jobs:
+                    await process_claimed(jobs)
+                    continue
+            except Exception as e:
+                # Claimed jobs are picked up again once their lease expires
+                print(f"Embedding worker error: {e}")
+            await asyncio.sleep(settings.EMBEDDING_WORKER_POLL_SECONDS)
+    finally:
+        await embedding_batcher.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -3,6 +3,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from database import init_db
 from config import settings
+import asyncio
 import uvicorn
 
 app = FastAPI(title="NepLaunch API", version="1.0.0")
@@ -14,6 +15,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # pagination cursor on /matches lists
 )
 
 
@@ -28,18 +30,67 @@ app.include_router(matches.router, prefix="/matches", tags=["matches"])
 app.include_router(ai.router, prefix="/ai", tags=["ai"])
 
 
+async def sync_embedding_indexes():
+    """Pull embeddings written by the embedding worker, and skills written by
+    other API processes, into this process's indexes, and note the worker's
+    latest stored match scores for the /matches cache."""
+    from database import AsyncSessionLocal
+    from embedding_index import sync_indexes
+    from skill_index import sync_skill_indexes
+    from match_cache import sync_scores_watermark
+    while True:
+        await asyncio.sleep(settings.EMBEDDING_INDEX_SYNC_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                await sync_indexes(db)
+                await sync_skill_indexes(db)
+                await sync_scores_watermark(db)
+        except Exception as e:
+            print(f"Note: Embedding index sync failed: {e}")
+
+
+def load_embedding_snapshot() -> bool:
+    """Map the embedding worker's index snapshot, if one is configured and saved."""
+    from embedding_index import load_snapshot
+    if not settings.EMBEDDING_SNAPSHOT_DIR:
+        return False
+    try:
+        return load_snapshot(settings.EMBEDDING_SNAPSHOT_DIR)
+    except Exception as e:
+        print(f"Note: Embedding snapshot load failed, building indexes from the DB: {e}")
+        return False
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database and in-memory embedding and skill indexes on startup."""
     from config import settings
     if not settings.USE_MOCK_DATA:
         await init_db()
+        from database import AsyncSessionLocal
+        from embedding_index import build_indexes
+        from skill_index import build_skill_indexes
+        try:
+            async with AsyncSessionLocal() as db:
+                if not load_embedding_snapshot():
+                    await build_indexes(db)
+                await build_skill_indexes(db)
+            app.state.index_sync = asyncio.create_task(sync_embedding_indexes())
+        except Exception as e:
+            print(f"Note: Embedding index build failed, matching will read embeddings from the DB: {e}")
     else:
         print("Running in MOCK DATA mode - no database required!")
         print("Login with: founder@neplaunch.com / talent@neplaunch.com / investor@neplaunch.com")
         print("Password: password123")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the scoring worker processes, if any were started."""
+    from parallel_scoring import shutdown_executor
+    shutdown_executor()
+
+
 @app.get("/")
 async def root():
     return {"message": "NepLaunch API", "version": "1.0.0"}
@@ -50,5 +101,17 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Embedding provider breaker state, call latency, top-k pruning and match cache counts for this process."""
+    from matching import embedding_breaker, pruning_stats
+    import match_cache
+    return {
+        "embedding_provider": embedding_breaker.snapshot(),
+        "match_pruning": dict(pruning_stats),
+        "match_cache": match_cache.stats(),
+    }
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,191 @@
+"""Response cache for the ``/matches`` list endpoints.
+
+Users reload their match lists far more often than profiles change, so a
+computed page, ``(matches, next_cursor)``, is cached under (endpoint, user,
+query params, data version). The data version combines
+
+- a counter that the profile, thesis and job write handlers of this process
+  bump after they commit (``bump_data_version``),
+- the embedding and skill index sync watermarks, which advance when this
+  process syncs embeddings stored by the worker or profiles and jobs
+  written by other API processes, and
+- the newest ``match_scores.updated_at`` (``sync_scores_watermark``), which
+  advances when the embedding worker rewrites stored scores, including
+  rescores that change no embedding.
+
+The watermarks are read by the periodic index sync, so pages can lag those
+writes by ``EMBEDDING_INDEX_SYNC_SECONDS``. A write doesn't need to delete
+anything: later requests look up a new key, and entries under old versions
+fall out by LRU or TTL. Changes that move no watermark can be stale for up
+to ``MATCH_CACHE_TTL_SECONDS``: fields that reach neither index (e.g. a
+startup's industry edited through another API process) and stored scores
+that were only deleted.
+
+``MATCH_CACHE_BACKEND`` selects the store: ``memory`` (per-process LRU
+with TTL) or ``none``. Other stores implement ``CacheBackend`` and are
+installed with ``set_backend``.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from embedding_index import synced_through
+from skill_index import skills_synced_through
+from config import settings
+
+_local_version = 0
+# Newest match_scores.updated_at read by sync_scores_watermark
+_scores_through: Optional[str] = None
+
+
+def bump_data_version() -> None:
+    """Invalidate cached match lists after a write that can change any of them."""
+    global _local_version
+    _local_version += 1
+
+
+async def sync_scores_watermark(db: AsyncSession) -> None:
+    """Read the newest ``match_scores.updated_at``, an index lookup on ``ix_match_scores_updated_at``."""
+    global _scores_through
+    from models import MatchScore
+
+    result = await db.execute(select(func.max(MatchScore.updated_at)))
+    _scores_through = result.scalar()
+
+
+def data_version() -> Tuple:
+    return (_local_version, synced_through(), skills_synced_through(), _scores_through)
+
+
+class CacheBackend:
+    """Key-value store for cached responses, counting its hits and misses."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raise NotImplementedError
+
+    def put(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class NullCacheBackend(CacheBackend):
+    """Caches nothing; every lookup is a miss."""
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU whose entries also expire ``ttl_seconds`` after they were stored."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def create_backend(name: str) -> CacheBackend:
+    if name == "memory":
+        return MemoryCacheBackend(settings.MATCH_CACHE_SIZE, settings.MATCH_CACHE_TTL_SECONDS)
+    if name == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown MATCH_CACHE_BACKEND: {name}")
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_backend(settings.MATCH_CACHE_BACKEND)
+    return _backend
+
+
+def set_backend(backend: CacheBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+async def cached_page(
+    endpoint: str,
+    user_id,
+    params: Dict[str, Any],
+    compute: Callable[[], Awaitable[Tuple[Any, Optional[str]]]]
+) -> Tuple[Any, Optional[str]]:
+    """(matches, next_cursor) for this endpoint, user and params, computing and storing it on a miss.
+
+    The version is read before ``compute`` runs, so a write landing while
+    the page is computed leaves the result under the older version.
+    """
+    backend = get_backend()
+    key = (endpoint, str(user_id), tuple(sorted(params.items())), data_version())
+    page = backend.get(key)
+    if page is None:
+        page = await compute()
+        backend.put(key, page)
+    return page
+
+
+def stats() -> Dict[str, Any]:
+    return get_backend().stats()
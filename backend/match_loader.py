@@ -0,0 +1,135 @@
+"""Request-scoped loader for the rows the pairwise matchers read.
+
+``match_talent_to_startup`` and ``match_startup_to_investor`` score one
+pair per call, and list endpoints call them once per candidate, so the
+same startup, investor or embedding row used to be selected again on every
+call. A ``MatchLoader`` lives for one request (or script run) and is passed
+to those functions. It collects concurrent ``load`` calls into one
+``WHERE ... IN (...)`` query per kind (the DataLoader pattern) and
+memoizes every result, missing rows included, until it is dropped.
+Callers that already hold rows ``prime`` them, and ``load_many`` fetches a
+whole list of candidates in one query ahead of a sequential loop.
+"""
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import TalentProfile, StartupProfile, InvestorProfile, JobPosting, Embedding
+
+# Profile kinds and the column their keys refer to; embeddings are
+# "embedding:<text_source>", keyed by user id ('role_posting': by job id)
+_PROFILE_KINDS = {
+    "talent": (TalentProfile, TalentProfile.user_id),
+    "startup": (StartupProfile, StartupProfile.user_id),
+    "investor": (InvestorProfile, InvestorProfile.user_id),
+    "job": (JobPosting, JobPosting.id),
+}
+
+
+def embedding_kind(text_source: str) -> str:
+    return f"embedding:{text_source}"
+
+
+class MatchLoader:
+    """Batched, memoized lookups of profiles, job postings and embeddings by id.
+
+    Not shared across requests: rows are cached for the loader's lifetime
+    and never refreshed, like the session they were read with.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._futures: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._queue: Dict[str, Dict[str, None]] = {}
+        self._dispatching = False
+        self.queries = 0
+
+    def prime(self, kind: str, key, value) -> None:
+        """Record a row the caller already has (None for a known miss)."""
+        self._values[(kind, str(key))] = value
+
+    def prime_rows(self, kind: str, rows: Iterable) -> None:
+        """``prime`` profile or job rows loaded elsewhere, keyed by their id column."""
+        key = _PROFILE_KINDS[kind][1].key
+        for row in rows:
+            self.prime(kind, getattr(row, key), row)
+
+    async def load(self, kind: str, key) -> Optional[Any]:
+        """Row of ``kind`` for ``key``, or None if there is none."""
+        key = str(key)
+        if (kind, key) in self._values:
+            return self._values[(kind, key)]
+        future = self._futures.get((kind, key))
+        if future is None:
+            future = self._futures[(kind, key)] = asyncio.get_running_loop().create_future()
+            self._queue.setdefault(kind, {})[key] = None
+        if not self._dispatching:
+            self._dispatching = True
+            try:
+                # Let concurrent loads queue their keys before the query goes out
+                await asyncio.sleep(0)
+                await self._dispatch()
+            finally:
+                self._dispatching = False
+        return await future
+
+    async def load_many(self, kind: str, keys: Iterable) -> List[Optional[Any]]:
+        """Rows for ``keys`` in order, fetching the uncached ones in one query."""
+        keys = [str(key) for key in keys]
+        missing = [key for key in dict.fromkeys(keys) if (kind, key) not in self._values]
+        for key in missing:
+            if (kind, key) not in self._futures:
+                self._futures[(kind, key)] = asyncio.get_running_loop().create_future()
+                self._queue.setdefault(kind, {})[key] = None
+        if missing:
+            await asyncio.gather(*(self.load(kind, key) for key in missing))
+        return [self._values[(kind, key)] for key in keys]
+
+    async def talent(self, user_id) -> Optional[TalentProfile]:
+        return await self.load("talent", user_id)
+
+    async def startup(self, user_id) -> Optional[StartupProfile]:
+        return await self.load("startup", user_id)
+
+    async def investor(self, user_id) -> Optional[InvestorProfile]:
+        return await self.load("investor", user_id)
+
+    async def job(self, job_id) -> Optional[JobPosting]:
+        return await self.load("job", job_id)
+
+    async def embedding(self, owner_id, text_source: str) -> Optional[Embedding]:
+        """Stored embedding of a user (or a job posting, for 'role_posting')."""
+        return await self.load(embedding_kind(text_source), owner_id)
+
+    async def _dispatch(self) -> None:
+        """Run one query per queued kind until nothing is queued."""
+        while self._queue:
+            kind, keys = self._queue.popitem()
+            keys = list(keys)
+            try:
+                rows = await self._fetch(kind, keys)
+            except Exception as e:
+                for key in keys:
+                    self._futures.pop((kind, key)).set_exception(e)
+                continue
+            for key in keys:
+                self._values[(kind, key)] = rows.get(key)
+                self._futures.pop((kind, key)).set_result(rows.get(key))
+
+    async def _fetch(self, kind: str, keys: List[str]) -> Dict[str, Any]:
+        self.queries += 1
+        if kind in _PROFILE_KINDS:
+            model, column = _PROFILE_KINDS[kind]
+            result = await self.db.execute(select(model).where(column.in_(keys)))
+            return {str(getattr(row, column.key)): row for row in result.scalars().all()}
+
+        text_source = kind.split(":", 1)[1]
+        column = Embedding.job_id if text_source == "role_posting" else Embedding.user_id
+        result = await self.db.execute(
+            select(Embedding).where(column.in_(keys), Embedding.text_source == text_source)
+        )
+        rows: Dict[str, Any] = {}
+        for e in result.scalars().all():
+            rows.setdefault(str(getattr(e, column.key)), e)
+        return rows
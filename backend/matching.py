@@ -1,231 +1,905 @@
 """Hybrid matching engine - keyword + semantic matching."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
-from sqlalchemy.orm import selectinload
-from models import User, TalentProfile, StartupProfile, InvestorProfile, Embedding, UserRole
-from typing import List, Dict, Optional
+from sqlalchemy import select, or_, and_
+from sqlalchemy.orm import joinedload
+from models import (
+    TalentProfile, StartupProfile, InvestorProfile, Embedding, EmbeddingJob, EmbeddingJobStatus
+)
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 from config import settings
 from datetime import datetime
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 import asyncio
+import bisect
+import functools
+import heapq
+import itertools
+import numpy as np
+from scoring import (
+    best_pools, cosine_scores, encode_bits, jaccard_matrix, jaccard_scores, SkillBitsets
+)
+from skill_index import get_skill_index, normalize_skills, skill_indexes_loaded
+from embedding_index import get_index, indexes_loaded, upsert_vector, QuantizedEmbeddingIndex
+from embedding_codec import encode_vector, stored_vector
+from embedding_batcher import EmbeddingBatcher
+from embedding_cache import LRUCache
+from embedding_guard import CircuitBreaker
+from embedding_providers import GEMINI_MODEL, create_provider
+from match_loader import MatchLoader, embedding_kind
+from parallel_scoring import parallel_enabled, rank_candidates, worker_count
+from concurrent.futures import ThreadPoolExecutor
 
-embedder = GoogleGenerativeAIEmbeddings(
-    model="models/gemini-embedding-001",
-    google_api_key=settings.GOOGLE_API_KEY
-) if settings.GOOGLE_API_KEY else None
+# Selected by EMBEDDING_PROVIDER; None (zero vectors) for Gemini without an API key
+embedder = create_provider(settings.EMBEDDING_PROVIDER, settings.GOOGLE_API_KEY)
+EMBEDDING_MODEL = embedder.model if embedder else GEMINI_MODEL
+
+# Recent text -> vector results, keyed by content hash, shared across users
+embedding_cache: LRUCache = LRUCache(settings.EMBEDDING_CACHE_SIZE)
 
 
 def cosine_similarity(v1: List[float], v2: List[float]) -> float:
     """Calculate cosine similarity between two vectors."""
     if not v1 or not v2 or len(v1) != len(v2):
         return 0.0
-    
-    dot_product = sum(a * b for a, b in zip(v1, v2))
-    magnitude_v1 = sum(a * a for a in v1) ** 0.5
-    magnitude_v2 = sum(a * a for a in v2) ** 0.5
-    
-    if magnitude_v1 == 0 or magnitude_v2 == 0:
-        return 0.0
-        
-    return dot_product / (magnitude_v1 * magnitude_v2)
-
-
-async def generate_embedding(text: str) -> List[float]:
-    """Generate embedding using Google Gemini gemini-embedding-001."""
-    # gemini-embedding-001 output dimension is 768
-    EMBEDDING_DIM = 768
-
-    if not text or not embedder:
-        return [0.0] * EMBEDDING_DIM
-
-    try:
-        # LangChain's embedder is sync — run in thread to keep async safe
-        # use embed_query for single string to avoid batching overhead if possible, 
-        # though embed_documents works too.
-        vector = await asyncio.get_event_loop().run_in_executor(
-            None,
-            embedder.embed_query,
-            text
-        )
-        return vector
-    except Exception as e:
-        print(f"Error generating embedding: {e}")
-        return [0.0] * EMBEDDING_DIM
 
+    scores = cosine_scores(np.asarray(v1, dtype=np.float64), np.asarray([v2], dtype=np.float64))
+    return float(scores[0])
+
+
+# Provider calls get their own bounded pool so a slow provider cannot tie up
+# the default executor, plus a deadline and a circuit breaker
+embedding_executor = ThreadPoolExecutor(
+    max_workers=settings.EMBEDDING_EXECUTOR_WORKERS,
+    thread_name_prefix="embedding"
+)
+embedding_breaker = CircuitBreaker(
+    failure_threshold=settings.EMBEDDING_BREAKER_FAILURES,
+    reset_timeout=settings.EMBEDDING_BREAKER_RESET_SECONDS,
+    call_timeout=settings.EMBEDDING_TIMEOUT_SECONDS
+)
+
+
+async def _embed_documents(texts: List[str]) -> List[List[float]]:
+    """One provider round trip for a batch of texts."""
+    # Providers are sync — run in thread to keep async safe.
+    loop = asyncio.get_running_loop()
+    return await embedding_breaker.call(lambda: loop.run_in_executor(
+        embedding_executor,
+        functools.partial(embedder.embed_documents, texts)
+    ))
 
-async def store_embedding(db: AsyncSession, user_id: str, embedding: List[float], text_source: str):
-    """Store or update embedding for a user."""
+
+embedding_batcher = EmbeddingBatcher(
+    _embed_documents,
+    max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+    max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS,
+    max_concurrency=settings.EMBEDDING_BATCH_CONCURRENCY,
+    max_pending=settings.EMBEDDING_BATCH_MAX_PENDING
+)
+
+
+async def store_embedding(
+    db: AsyncSession,
+    user_id: str,
+    embedding: List[float],
+    text_source: str,
+    content_hash: Optional[str] = None,
+    job_id: Optional[str] = None
+):
+    """Store or update embedding for a user, or for ``job_id`` ('role_posting') owned by the user."""
     from models import Embedding
-    from uuid import UUID
     
     # Check if embedding exists
     result = await db.execute(
         select(Embedding).where(
             Embedding.user_id == user_id,
-            Embedding.text_source == text_source
+            Embedding.text_source == text_source,
+            Embedding.job_id == job_id if job_id else Embedding.job_id.is_(None)
         )
     )
     existing = result.scalars().first()
     
+    vector = encode_vector(embedding, settings.EMBEDDING_STORAGE_DTYPE)
     if existing:
-        existing.embedding = embedding
+        existing.vector = vector
+        existing.embedding = None
+        existing.content_hash = content_hash
         existing.created_at = datetime.utcnow().isoformat()
     else:
         new_embedding = Embedding(
             user_id=user_id,
-            embedding=embedding,
+            vector=vector,
             text_source=text_source,
+            job_id=job_id,
+            content_hash=content_hash,
             created_at=datetime.utcnow().isoformat()
         )
         db.add(new_embedding)
     
     await db.commit()
+    upsert_vector(text_source, job_id or user_id, embedding)
+
+
+async def embed_text(text: str, text_hash: str) -> Optional[List[float]]:
+    """Vector for ``text`` from the LRU cache, else from the provider.
+
+    Returns None when there is no text or no provider configured. Provider
+    errors propagate so the caller can choose between a retry and a zero
+    placeholder.
+    """
+    vector = embedding_cache.get(text_hash)
+    if vector is None and text and embedder:
+        vector = await embedding_batcher.embed(text)
+        embedding_cache.put(text_hash, vector)
+    return vector
+
+
+def enqueue_embedding(
+    db: AsyncSession,
+    user_id: str,
+    text: str,
+    text_source: str,
+    job_id: Optional[str] = None
+) -> None:
+    """Queue a re-embed of ``text`` as part of the caller's transaction.
+
+    The job commits together with the profile change it describes and is
+    drained by ``embedding_worker.py``, so the request never waits on the
+    provider. The worker also refreshes the user's stored match scores.
+    Job postings are embedded as 'role_posting' under their ``job_id``,
+    with ``user_id`` the founder who owns them.
+    """
+    _enqueue_job(db, user_id, text_source, text, "embed", job_id)
+
+
+# Job posting fields that make up its 'role_posting' embedding text
+JOB_TEXT_FIELDS = ("title", "description", "requirements", "required_skills")
+
+
+def job_posting_text(job) -> str:
+    """Text embedded as a job posting's 'role_posting' embedding."""
+    return f"{job.title or ''} {job.description or ''} {job.requirements or ''} {' '.join(job.required_skills or [])}"
+
+
+def enqueue_rescore(db: AsyncSession, user_id: str) -> None:
+    """Queue a refresh of a user's stored match scores, e.g. after a job posting changed."""
+    _enqueue_job(db, user_id, "profile", None, "rescore")
+
+
+def _enqueue_job(
+    db: AsyncSession,
+    user_id: str,
+    text_source: str,
+    text: Optional[str],
+    task: str,
+    job_id: Optional[str] = None
+) -> None:
+    now = datetime.utcnow().isoformat()
+    db.add(EmbeddingJob(
+        user_id=user_id,
+        text_source=text_source,
+        job_id=job_id,
+        source_text=text,
+        task=task,
+        status=EmbeddingJobStatus.PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now
+    ))
+
+
+# Hybrid talent score: TALENT_KEYWORD_WEIGHT * Jaccard + TALENT_SEMANTIC_WEIGHT * cosine
+TALENT_KEYWORD_WEIGHT = 0.6
+TALENT_SEMANTIC_WEIGHT = 0.4
 
 
 def calculate_jaccard_similarity(set1: List[str], set2: List[str]) -> float:
     """Calculate Jaccard similarity between two sets."""
     if not set1 or not set2:
         return 0.0
-    
-    set1_set = set(set1)
-    set2_set = set(set2)
-    
-    intersection = len(set1_set & set2_set)
-    union = len(set1_set | set2_set)
-    
-    if union == 0:
-        return 0.0
-    
-    return intersection / union
+    set1, set2 = set(set1), set(set2)
+    return len(set1 & set2) / len(set1 | set2)
+
+
+def _talent_skill_names(talent: TalentProfile) -> List[str]:
+    """Lowercased skill names from a talent's skills JSON."""
+    return normalize_skills(talent.skills)
+
+
+def _startup_keywords(startup: StartupProfile) -> List[str]:
+    """Startup keyword pool: required skills plus tech stack, lowercased."""
+    startup_keywords = [s.lower() for s in (startup.required_skills or [])]
+    if startup.tech_stack:
+        startup_keywords.extend([s.lower() for s in startup.tech_stack])
+    return startup_keywords
+
+
+def _talent_match_result(
+    keyword_score: float,
+    semantic_score: float,
+    hybrid: bool,
+    talent_skills: List[str],
+    required_skills: List[str],
+) -> Dict:
+    """Combine component scores into the talent/startup match payload."""
+    # Determine matched and missing skills
+    talent_skill_set = set(talent_skills)
+    required_skill_set = set(required_skills)
+    matched_skills = list(talent_skill_set & required_skill_set)
+    missing_skills = list(required_skill_set - talent_skill_set)
+    return _talent_payload(keyword_score, semantic_score, hybrid, matched_skills, missing_skills)
+
+
+def _talent_payload(
+    keyword_score: float,
+    semantic_score: float,
+    hybrid: bool,
+    matched_skills: List[str],
+    missing_skills: List[str],
+) -> Dict:
+    """``_talent_match_result`` with the skill lists already worked out."""
+    if hybrid:
+        final_score = (keyword_score * TALENT_KEYWORD_WEIGHT) + (semantic_score * TALENT_SEMANTIC_WEIGHT)
+    else:
+        final_score = keyword_score
+
+    return {
+        "match_percentage": round(final_score * 100, 2),
+        "score_breakdown": {
+            "skills": round(keyword_score, 2),
+            "semantic": round(semantic_score, 2)
+        },
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills
+    }
+
+
+async def _semantic_similarity(
+    db: AsyncSession,
+    id_a: str,
+    source_a: str,
+    id_b: str,
+    source_b: str,
+    loader: MatchLoader
+) -> Tuple[bool, float]:
+    """Whether both users have an embedding, and the cosine between them.
+
+    Served from the in-memory indexes once they are built, unless they are
+    quantized; otherwise the embeddings are read through ``loader``.
+    """
+    if _exact_indexes(source_a, source_b):
+        index_a, index_b = get_index(source_a), get_index(source_b)
+        if str(id_a) not in index_a or str(id_b) not in index_b:
+            return False, 0.0
+        v1, v2 = index_a.get(str(id_a)), index_b.get(str(id_b))
+        if v1 is None or v2 is None or len(v1) != len(v2):
+            return True, 0.0
+        return True, float(v1 @ v2)
+
+    embedding_a = await loader.embedding(id_a, source_a)
+    embedding_b = await loader.embedding(id_b, source_b)
+    
+    if not embedding_a or not embedding_b:
+        return False, 0.0
+    v1 = stored_vector(embedding_a)
+    v2 = stored_vector(embedding_b)
+    if v1 is None or v2 is None or not len(v1) or len(v1) != len(v2):
+        return True, 0.0
+    return True, float(cosine_scores(v1, v2[None, :])[0])
+
+
+def _exact_indexes(*text_sources: str) -> bool:
+    """Whether the indexes are built and hold full-precision vectors for all ``text_sources``.
+
+    Quantized scores never reach a match percentage; those come from the
+    stored vectors instead.
+    """
+    return indexes_loaded() and not any(isinstance(get_index(s), QuantizedEmbeddingIndex) for s in text_sources)
+
+
+async def preload_embeddings(loader: MatchLoader, ids: List[str], text_source: str) -> None:
+    """Read the embeddings of ``ids`` into ``loader`` in one query, unless the indexes serve them."""
+    if not _exact_indexes(text_source):
+        await loader.load_many(embedding_kind(text_source), ids)
+
+
+def semantic_bounds(
+    query_id: str,
+    query_source: str,
+    other_ids: List[str],
+    other_source: str,
+    k: int
+) -> Optional[np.ndarray]:
+    """Upper bound on the cosine of each of ``other_ids`` to ``query_id``, for ranking the top ``k``.
+
+    When the index has a cheaper shortlist than scoring every row, its
+    ``top_k`` of ``shortlist_size(k)`` rows is taken first; every row
+    outside it scores at most the last shortlisted score plus the indexes'
+    ``score_error``. Shortlisted rows keep the trivial bound, since their
+    exact score is computed when they are ranked. Otherwise (the default
+    exact index) one vectorized ``scores_for`` pass bounds each row by its
+    own score, so only the rows that can reach the top ``k`` get a payload
+    built. None without the indexes or a query embedding.
+
+    The bounds are exact for exact and quantized indexes. With a prefix
+    pass or IVF they are only as good as its recall: a row it drops may
+    score above the bound and be left out of the top ``k``.
+    """
+    if not indexes_loaded():
+        return None
+    query_index, other_index = get_index(query_source), get_index(other_source)
+    query = query_index.get(query_id)
+    if query is None:
+        return None
+    # A quantized query moves every score too; renormalizing it can double that
+    error = other_index.score_error() + 2 * query_index.score_error() + 1e-6
+    size = other_index.shortlist_size(k)
+    if not size or size >= len(other_index):
+        return np.minimum(other_index.scores_for(query, other_ids) + error, SEMANTIC_SCORE_BOUND)
+    shortlist = other_index.top_k(query, size)
+    if not shortlist:
+        return None
+
+    rest = shortlist[-1][1] + error
+    bounds = np.full(len(other_ids), min(rest, SEMANTIC_SCORE_BOUND))
+    shortlisted = {other_id for other_id, _ in shortlist}
+    bounds[[i for i, other_id in enumerate(other_ids) if other_id in shortlisted]] = SEMANTIC_SCORE_BOUND
+    return bounds
 
 
 async def match_talent_to_startup(
     db: AsyncSession,
     talent_id: str,
     startup_id: str,
-    job_id: Optional[str] = None
+    job_id: Optional[str] = None,
+    loader: Optional[MatchLoader] = None
 ) -> Dict:
-    """Match talent to a startup role using hybrid scoring."""
-    from uuid import UUID
-    from models import JobPosting
-    
-    # Get talent profile
-    talent_result = await db.execute(
-        select(TalentProfile).where(TalentProfile.user_id == talent_id)
-    )
-    talent = talent_result.scalars().first()
-    
-    # Get startup profile
-    startup_result = await db.execute(
-        select(StartupProfile).where(StartupProfile.user_id == startup_id)
-    )
-    startup = startup_result.scalars().first()
+    """Match talent to a startup role using hybrid scoring.
+
+    Pass the request's ``loader`` when scoring many pairs, so profiles and
+    embeddings shared between calls are read once.
+    """
+    loader = loader or MatchLoader(db)
+    talent = await loader.talent(talent_id)
+    startup = await loader.startup(startup_id)
     
     if not talent or not startup:
         return {"error": "Profile not found"}
     
-    # Score A: Keyword Match (60%)
-    talent_skills = []
-    for s in (talent.skills or []):
-        if isinstance(s, dict):
-            talent_skills.append(s.get("name", "").lower())
-        elif isinstance(s, str):
-            talent_skills.append(s.lower())
-    
-    # Use job-specific skills if job_id is provided, else use startup general skills
+    talent_skills = _talent_skill_names(talent)
     required_skills = [s.lower() for s in (startup.required_skills or [])]
     
-    # Also include tech stack in the keyword pool for general startup matching
-    startup_keywords = list(required_skills)
-    if startup.tech_stack:
-        startup_keywords.extend([s.lower() for s in startup.tech_stack])
-    
+    # Use job-specific skills if job_id is provided, else use startup general skills
+    startup_keywords = _startup_keywords(startup)
     if job_id:
-        job_result = await db.execute(
-            select(JobPosting).where(JobPosting.id == job_id)
-        )
-        job = job_result.scalars().first()
+        job = await loader.job(job_id)
         if job:
             startup_keywords = [s.lower() for s in (job.required_skills or [])]
 
+    # Score A: Keyword Match (60%)
     keyword_score = calculate_jaccard_similarity(talent_skills, startup_keywords)
-    print(f"DEBUG: Matching {talent.name} to {startup.name}")
-    print(f"DEBUG: Talent Skills: {talent_skills}")
-    print(f"DEBUG: Startup Keywords: {startup_keywords}")
-    print(f"DEBUG: Keyword Score: {keyword_score}")
-    
-    # Score B: Semantic Match (40%)
-    # Get embeddings
-    talent_embedding_result = await db.execute(
-        select(Embedding).where(
-            Embedding.user_id == talent_id,
-            Embedding.text_source == "profile"
-        )
-    )
-    talent_embedding = talent_embedding_result.scalars().first()
     
-    startup_embedding_result = await db.execute(
-        select(Embedding).where(
-            Embedding.user_id == startup_id,
-            Embedding.text_source == "profile"
-        )
+    # Score B: Semantic Match (40%), only weighted in if both embeddings exist
+    hybrid, semantic_score = await _semantic_similarity(
+        db, talent_id, "profile", startup_id, "profile", loader
     )
-    startup_embedding = startup_embedding_result.scalars().first()
-    
-    final_score = 0.0
-    semantic_score = 0.0
-    # Final Score calculation
-    # If we have both embeddings, use hybrid scoring
-    if talent_embedding and startup_embedding:
-        v1 = talent_embedding.embedding
-        v2 = startup_embedding.embedding
-        if isinstance(v1, list) and isinstance(v2, list):
-            semantic_score = cosine_similarity(v1, v2)
-        final_score = (keyword_score * 0.6) + (semantic_score * 0.4)
-    else:
-        final_score = keyword_score
-    
-    # Determine matched and missing skills
-    talent_skill_set = set(talent_skills)
-    required_skill_set = set(required_skills)
-    matched_skills = list(talent_skill_set & required_skill_set)
-    missing_skills = list(required_skill_set - talent_skill_set)
     
     return {
         "user_id": str(startup.user_id),
-        "match_percentage": round(final_score * 100, 2),
-        "score_breakdown": {
-            "skills": round(keyword_score, 2),
-            "semantic": round(semantic_score, 2)
-        },
-        "matched_skills": matched_skills,
-        "missing_skills": missing_skills
+        **_talent_match_result(
+            keyword_score, semantic_score, hybrid, talent_skills, required_skills
+        )
     }
 
 
-async def match_startup_to_investor(
+async def _load_semantic_scores(
+    db: AsyncSession,
+    query_id: str,
+    query_source: str,
+    other_ids: List[str],
+    other_source: str
+) -> Tuple[List[bool], np.ndarray]:
+    """Embedding presence and cosine to ``query_id`` for each other user (or job), read from the DB."""
+    # 'role_posting' embeddings are looked up by job, every other source by user
+    by_job = other_source == "role_posting"
+    other_key = Embedding.job_id if by_job else Embedding.user_id
+    embedding_result = await db.execute(
+        select(Embedding).where(or_(
+            and_(Embedding.user_id == query_id, Embedding.text_source == query_source),
+            and_(other_key.in_(other_ids), Embedding.text_source == other_source)
+        ))
+    )
+    embeddings = {}
+    for e in embedding_result.scalars().all():
+        key = e.job_id if by_job and e.text_source == other_source else e.user_id
+        embeddings.setdefault((str(key), e.text_source), e)
+    query_embedding = embeddings.get((query_id, query_source))
+    other_embeddings = [embeddings.get((u, other_source)) for u in other_ids]
+    has_embedding = [bool(e and query_embedding) for e in other_embeddings]
+
+    semantic_scores = np.zeros(len(other_ids))
+    v2 = stored_vector(query_embedding) if query_embedding else None
+    if v2 is not None and len(v2):
+        vectors = [stored_vector(e) if e else None for e in other_embeddings]
+        rows = [i for i, v in enumerate(vectors) if v is not None and len(v) == len(v2)]
+        if rows:
+            matrix = np.asarray([vectors[i] for i in rows], dtype=np.float32)
+            semantic_scores[rows] = cosine_scores(v2.astype(np.float32), matrix)
+    return has_embedding, semantic_scores
+
+
+async def semantic_scores_for(
+    db: AsyncSession,
+    query_id: str,
+    query_source: str,
+    other_ids: List[str],
+    other_source: str
+) -> Tuple[List[bool], np.ndarray]:
+    """Whether each pair has both embeddings, and the cosine of each pair.
+
+    One pass over the in-memory index once it is built, one query before
+    or when either index is quantized.
+    """
+    if not _exact_indexes(query_source, other_source):
+        return await _load_semantic_scores(db, query_id, query_source, other_ids, other_source)
+    query_index, other_index = get_index(query_source), get_index(other_source)
+    query_has_embedding = query_id in query_index
+    has_embedding = [query_has_embedding and u in other_index for u in other_ids]
+    return has_embedding, other_index.scores_for(query_index.get(query_id), other_ids)
+
+
+def _best_match(candidates: List[Dict]) -> Dict:
+    """Highest match_percentage; on ties the earliest candidate wins."""
+    best_match = None
+    for candidate in candidates:
+        if best_match is None or candidate["match_percentage"] > best_match["match_percentage"]:
+            best_match = candidate
+    return best_match
+
+
+def _talent_keyword_scores(
+    startup: StartupProfile,
+    jobs: List,
+    talent_ids: List[str],
+    talent_skills: Optional[List[List[str]]] = None
+) -> np.ndarray:
+    """Jaccard of every talent against the startup baseline, then each job.
+
+    Shape (1 + len(jobs), len(talent_ids)): the pools x skills bitsets (or
+    posting lists, once the skill index is built) are scored against all
+    talents in one pass. The skill index only visits talents sharing a
+    skill with a pool; without it ``talent_skills`` (aligned with
+    ``talent_ids``) is required.
+    """
+    keyword_pools = [_startup_keywords(startup)]
+    keyword_pools.extend([s.lower() for s in (job.required_skills or [])] for job in jobs)
+    if skill_indexes_loaded():
+        skill_index = get_skill_index("talent")
+        return skill_index.jaccard_matrix(keyword_pools, skill_index.rows(talent_ids))
+    return jaccard_matrix(keyword_pools, SkillBitsets(talent_skills))
+
+
+def _best_pools(keyword_scores: np.ndarray, semantic_scores: np.ndarray, has_embedding: List[bool]) -> np.ndarray:
+    """Row of ``keyword_scores`` each talent's ``_best_match`` comes from (see ``scoring.best_pools``)."""
+    best, _ = best_pools(keyword_scores, semantic_scores, has_embedding, TALENT_KEYWORD_WEIGHT, TALENT_SEMANTIC_WEIGHT)
+    return best
+
+
+async def score_talents_for_startup(
+    db: AsyncSession,
+    startup: StartupProfile,
+    jobs: List,
+    talents: List[TalentProfile]
+) -> List[List[Dict]]:
+    """Match payloads of every talent against the startup baseline and each job.
+
+    Returns one list per keyword pool, aligned with ``talents``: the startup
+    baseline first, then ``jobs`` in order.
+    """
+    required_skills = [s.lower() for s in (startup.required_skills or [])]
+    talent_ids = [str(t.user_id) for t in talents]
+    talent_skills = [_talent_skill_names(t) for t in talents]
+    keyword_scores = _talent_keyword_scores(startup, jobs, talent_ids, talent_skills)
+
+    # Semantic scores in one pass over the talents that have usable vectors
+    has_embedding, semantic_scores = await semantic_scores_for(
+        db, str(startup.user_id), "profile", talent_ids, "profile"
+    )
+
+    return [
+        [
+            _talent_match_result(
+                float(scores[i]), float(semantic_scores[i]), has_embedding[i],
+                talent_skills[i], required_skills
+            )
+            for i in range(len(talents))
+        ]
+        for scores in keyword_scores
+    ]
+
+
+# Largest cosine similarity, padded for float32 error in normalized dot products
+SEMANTIC_SCORE_BOUND = 1.0 + 1e-6
+# round(x, 2) can raise a match_percentage by up to half a hundredth
+_ROUNDING_SLACK = 0.005 + 1e-9
+
+# Candidates seen and skipped by threshold_top_k in this process, for /metrics
+pruning_stats = {"queries": 0, "candidates": 0, "pruned": 0}
+
+
+async def threshold_top_k(
+    ids: List[str],
+    bounds: np.ndarray,
+    score_batch: Callable[[List[int]], Awaitable[List[Dict]]],
+    k: int,
+    after: Optional[Tuple[float, str]] = None
+) -> Tuple[List[Dict], int]:
+    """Best ``k`` results by (match_percentage desc, id), with upper-bound pruning.
+
+    ``bounds`` holds an upper bound on each candidate's match_percentage,
+    computed from its cheap component alone. Candidates are scored in
+    descending bound order, ``MATCH_PRUNE_BATCH_SIZE`` at a time, through
+    ``score_batch(positions)``; once the k-th best exact score beats every
+    remaining bound the rest are skipped (the threshold algorithm). With
+    ``after`` (a pagination cursor) only results ranked below it count.
+    Returns the results in ranking order and how many were pruned.
+    """
+    order = np.lexsort((np.arange(len(ids)), -bounds))
+    sorted_bounds = bounds[order]
+    best: List[Tuple[Tuple[float, str], Dict]] = []
+    scored = 0
+    while scored < len(order):
+        end = min(scored + max(k, settings.MATCH_PRUNE_BATCH_SIZE), len(order))
+        if len(best) == k:
+            # Candidates whose bound is below the k-th best score can't enter the top k
+            kth_score = -best[-1][0][0]
+            end = min(end, int(np.searchsorted(-sorted_bounds, -kth_score, side="right")))
+            if end <= scored:
+                break
+        positions = order[scored:end].tolist()
+        results = await score_batch(positions)
+        scored = end
+
+        ranked = [((-r["match_percentage"], ids[p]), r) for p, r in zip(positions, results)]
+        if after is not None:
+            ranked = [item for item in ranked if item[0] > (-after[0], after[1])]
+        best = heapq.nsmallest(k, best + ranked, key=lambda item: item[0])
+
+    pruned = len(order) - scored
+    pruning_stats["queries"] += 1
+    pruning_stats["candidates"] += len(order)
+    pruning_stats["pruned"] += pruned
+    return [result for _, result in best], pruned
+
+
+async def match_talents_to_startup_batch(
     db: AsyncSession,
     startup_id: str,
-    investor_id: str
-) -> Dict:
-    """Match startup to investor using hybrid scoring."""
-    from uuid import UUID
-    
-    # Get profiles
+    job_id: Optional[str] = None,
+    talent_ids: Optional[List[str]] = None,
+    top_k: Optional[int] = None,
+    after: Optional[Tuple[float, str]] = None
+) -> List[Dict]:
+    """Score every talent against a startup in a constant number of queries.
+
+    Loads the startup, its jobs (or the requested job) and all talent
+    profiles up front, takes embeddings from the in-memory index (or one
+    query before it is built), then scores each (talent, job) pair in
+    memory. Results match calling ``match_talent_to_startup`` per talent as
+    ``GET /matches/talent`` used to: without ``job_id`` each talent keeps the
+    best of the startup baseline and every job posting, and ``best_job_id``
+    says which job that was. ``talent_ids`` restricts scoring to those
+    talents.
+
+    With ``top_k`` only the best ``top_k`` talents (ranked after the cursor
+    ``after``) are returned, in ranking order: keyword scores are computed
+    for everyone, but semantic scores and payloads only for talents whose
+    keyword score leaves them a chance to make it (see ``threshold_top_k``).
+    Past ``MATCH_PARALLEL_MIN_PAIRS`` (talent, pool) pairs, once the skill
+    indexes are built, every talent is scored across worker processes
+    instead (see ``parallel_scoring``), and results always come back in
+    ranking order.
+    """
+    from models import JobPosting
+
     startup_result = await db.execute(
         select(StartupProfile).where(StartupProfile.user_id == startup_id)
     )
     startup = startup_result.scalars().first()
-    
-    investor_result = await db.execute(
-        select(InvestorProfile).where(InvestorProfile.user_id == investor_id)
+    if not startup:
+        return []
+
+    # Keyword pools to try per talent; the baseline comes first
+    jobs = []
+    include_baseline = True
+    if not job_id:
+        jobs_result = await db.execute(
+            select(JobPosting).where(JobPosting.startup_id == startup.id).order_by(JobPosting.id)
+        )
+        jobs = jobs_result.scalars().all()
+    elif job_id != "[object Object]":
+        job_result = await db.execute(
+            select(JobPosting).where(JobPosting.id == job_id)
+        )
+        job = job_result.scalars().first()
+        if job:
+            jobs, include_baseline = [job], False
+
+    # Pools are the baseline then each job; a requested job is scored alone
+    first_pool = 0 if include_baseline else 1
+    pools = len(jobs) + 1 - first_pool
+    if skill_indexes_loaded() and worker_count() > 1:
+        # Sharded scoring needs only ids; full rows are loaded if it turns out too few
+        id_query = select(TalentProfile.user_id)
+        if talent_ids is not None:
+            id_query = id_query.where(TalentProfile.user_id.in_(talent_ids))
+        ids = sorted(str(user_id) for user_id in (await db.execute(id_query)).scalars().all())
+        if parallel_enabled(len(ids) * pools):
+            return await _parallel_talents_for_startup(db, startup, jobs, ids, first_pool, top_k, after)
+
+    talent_query = select(TalentProfile)
+    if talent_ids is not None:
+        talent_query = talent_query.where(TalentProfile.user_id.in_(talent_ids))
+    talent_result = await db.execute(talent_query)
+    all_talent = talent_result.scalars().all()
+
+    if top_k:
+        return await _top_talents_for_startup(db, startup, jobs, all_talent, first_pool, top_k, after)
+
+    talent_ids = [str(t.user_id) for t in all_talent]
+    talent_skills = [_talent_skill_names(t) for t in all_talent]
+    keyword_scores = _talent_keyword_scores(startup, jobs, talent_ids, talent_skills)
+    return await _talent_entries(
+        db, startup, jobs, all_talent, keyword_scores, first_pool, list(range(len(all_talent))), talent_skills
     )
-    investor = investor_result.scalars().first()
-    
-    if not startup or not investor:
-        return {"error": "Profile not found"}
-    
-    # Score A: Keyword Match (60%)
+
+
+async def _talent_entries(
+    db: AsyncSession,
+    startup: StartupProfile,
+    jobs: List,
+    talents: List[TalentProfile],
+    keyword_scores: np.ndarray,
+    first_pool: int,
+    positions: List[int],
+    talent_skills: Optional[List[List[str]]] = None
+) -> List[Dict]:
+    """``GET /matches/talent`` entries for ``talents[positions]``.
+
+    Each talent's best pool from ``first_pool`` on is picked with one
+    argmax over the pools x talents score matrix, and only that pool's
+    payload is built. ``best_job_id`` names the winning job, None when the
+    startup baseline wins.
+    """
+    startup_id = str(startup.user_id)
+    required_skills = [s.lower() for s in (startup.required_skills or [])]
+    has_embedding, semantic_scores = await semantic_scores_for(
+        db, startup_id, "profile", [str(talents[i].user_id) for i in positions], "profile"
+    )
+    best = _best_pools(keyword_scores[first_pool:, positions], semantic_scores, has_embedding) + first_pool
+
+    entries = []
+    for j, i in enumerate(positions):
+        talent, pool = talents[i], int(best[j])
+        skills = talent_skills[i] if talent_skills is not None else _talent_skill_names(talent)
+        entries.append({
+            "talent_id": str(talent.user_id),
+            "name": talent.name,
+            "headline": talent.headline,
+            "user_id": startup_id,
+            **_talent_match_result(
+                float(keyword_scores[pool, i]), float(semantic_scores[j]), has_embedding[j], skills, required_skills
+            ),
+            "best_job_id": str(jobs[pool - 1].id) if pool else None
+        })
+    return entries
+
+
+async def _top_talents_for_startup(
+    db: AsyncSession,
+    startup: StartupProfile,
+    jobs: List,
+    talents: List[TalentProfile],
+    first_pool: int,
+    k: int,
+    after: Optional[Tuple[float, str]]
+) -> List[Dict]:
+    """``match_talents_to_startup_batch`` entries of the top ``k`` talents, pruned on keyword scores."""
+    talent_ids = [str(t.user_id) for t in talents]
+    talent_skills = None if skill_indexes_loaded() else [_talent_skill_names(t) for t in talents]
+    keyword_scores = _talent_keyword_scores(startup, jobs, talent_ids, talent_skills)
+
+    # A talent's best pool scores at most its best keyword score with its
+    # best possible semantic score, or the keyword score alone without embeddings
+    best_keyword = np.max(keyword_scores[first_pool:], axis=0)
+    semantic_bound = semantic_bounds(str(startup.user_id), "profile", talent_ids, "profile", k)
+    if semantic_bound is None:
+        semantic_bound = SEMANTIC_SCORE_BOUND
+    bounds = np.maximum(
+        best_keyword, best_keyword * TALENT_KEYWORD_WEIGHT + semantic_bound * TALENT_SEMANTIC_WEIGHT
+    ) * 100 + _ROUNDING_SLACK
+
+    async def score_batch(positions: List[int]) -> List[Dict]:
+        return await _talent_entries(db, startup, jobs, talents, keyword_scores, first_pool, positions, talent_skills)
+
+    matches, pruned = await threshold_top_k(talent_ids, bounds, score_batch, k, after)
+    return matches
+
+
+async def match_jobs_for_talent(
+    db: AsyncSession,
+    talent_id: str,
+    job_ids: Optional[List[str]] = None,
+    top_k: Optional[int] = None,
+    after: Optional[Tuple[float, str]] = None
+) -> List[Dict]:
+    """Job postings ranked for a talent, best first (``GET /matches/jobs``).
+
+    Scored like talent matches: Jaccard of the talent's skills and the
+    job's required skills, blended with the cosine between the talent's
+    profile and the job's 'role_posting' embedding when both exist. Keyword
+    scores for every job come from the job skill index (bitsets before it
+    is built); semantic scores only for jobs that can still make the top
+    ``top_k`` ranked after the cursor ``after`` (see ``threshold_top_k``),
+    and only the returned jobs are loaded with their startup. Without
+    ``top_k`` every job is returned. ``job_ids`` restricts ranking to
+    those jobs.
+    """
+    from models import JobPosting
+
+    talent_result = await db.execute(
+        select(TalentProfile).where(TalentProfile.user_id == talent_id)
+    )
+    talent = talent_result.scalars().first()
+    talent_skills = _talent_skill_names(talent) if talent else []
+
+    job_filter = () if job_ids is None else (JobPosting.id.in_(job_ids),)
+    if skill_indexes_loaded():
+        job_result = await db.execute(select(JobPosting.id).where(*job_filter))
+        job_ids = [str(job_id) for job_id in job_result.scalars().all()]
+        skill_index = get_skill_index("job")
+        keyword_scores = skill_index.jaccard_scores(talent_skills, skill_index.rows(job_ids))
+    else:
+        job_result = await db.execute(select(JobPosting.id, JobPosting.required_skills).where(*job_filter))
+        rows = job_result.all()
+        job_ids = [str(job_id) for job_id, _ in rows]
+        keyword_scores = jaccard_scores(talent_skills, SkillBitsets([normalize_skills(skills) for _, skills in rows]))
+    if not job_ids:
+        return []
+
+    # A job scores at most its keyword score with its best possible
+    # semantic score, or the keyword score alone without embeddings
+    semantic_bound = None
+    if top_k:
+        semantic_bound = semantic_bounds(talent_id, "profile", job_ids, "role_posting", top_k)
+    if semantic_bound is None:
+        semantic_bound = SEMANTIC_SCORE_BOUND
+    bounds = np.maximum(
+        keyword_scores, keyword_scores * TALENT_KEYWORD_WEIGHT + semantic_bound * TALENT_SEMANTIC_WEIGHT
+    ) * 100 + _ROUNDING_SLACK
+
+    # (keyword, semantic, hybrid) per scored job, to build the payloads of the winners
+    components: Dict[str, Tuple[float, float, bool]] = {}
+
+    async def score_batch(positions: List[int]) -> List[Dict]:
+        batch_ids = [job_ids[p] for p in positions]
+        has_embedding, semantic_scores = await semantic_scores_for(
+            db, talent_id, "profile", batch_ids, "role_posting"
+        )
+        results = []
+        for j, p in enumerate(positions):
+            components[job_ids[p]] = (float(keyword_scores[p]), float(semantic_scores[j]), has_embedding[j])
+            results.append({"job_id": job_ids[p], **_talent_match_result(*components[job_ids[p]], [], [])})
+        return results
+
+    ranked, pruned = await threshold_top_k(job_ids, bounds, score_batch, top_k or len(job_ids), after)
+
+    jobs_result = await db.execute(
+        select(JobPosting).options(joinedload(JobPosting.startup))
+        .where(JobPosting.id.in_([r["job_id"] for r in ranked]))
+    )
+    jobs = {str(job.id): job for job in jobs_result.scalars().all()}
+    matches = []
+    for r in ranked:
+        job = jobs.get(r["job_id"])
+        if job is None:
+            # Deleted since its id was read
+            continue
+        matches.append({
+            "job_id": str(job.id),
+            "startup_id": str(job.startup.id),
+            "founder_user_id": str(job.startup.user_id),
+            "title": job.title,
+            "description": job.description,
+            "location": job.location,
+            "job_type": job.job_type,
+            "compensation": job.compensation,
+            "required_skills": job.required_skills or [],
+            "startup_name": job.startup.name,
+            "industry": job.startup.industry,
+            **_talent_match_result(*components[r["job_id"]], talent_skills, normalize_skills(job.required_skills))
+        })
+    return matches
+
+
+async def _parallel_talents_for_startup(
+    db: AsyncSession,
+    startup: StartupProfile,
+    jobs: List,
+    talent_ids: List[str],
+    first_pool: int,
+    k: Optional[int],
+    after: Optional[Tuple[float, str]]
+) -> List[Dict]:
+    """``match_talents_to_startup_batch`` entries, scored by ``parallel_scoring.rank_candidates``.
+
+    Only the winners' names and headlines are read from the database.
+    """
+    startup_id = str(startup.user_id)
+    ranked = await _rank_talents_in_parallel(db, startup, jobs, talent_ids, first_pool, k, after)
+
+    profiles = select(TalentProfile.user_id, TalentProfile.name, TalentProfile.headline)
+    if k is not None:
+        profiles = profiles.where(TalentProfile.user_id.in_([talent_ids[position] for _, position, *_ in ranked]))
+    names = {str(user_id): (name, headline) for user_id, name, headline in (await db.execute(profiles)).all()}
+
+    entries = []
+    for _, position, pool, keyword, semantic, hybrid, matched, missing in ranked:
+        talent_id, pool = talent_ids[position], pool + first_pool
+        name, headline = names.get(talent_id, (None, None))
+        entries.append({
+            "talent_id": talent_id,
+            "name": name,
+            "headline": headline,
+            "user_id": startup_id,
+            **_talent_payload(keyword, semantic, hybrid, matched, missing),
+            "best_job_id": str(jobs[pool - 1].id) if pool else None
+        })
+    return entries
+
+
+async def _rank_talents_in_parallel(
+    db: AsyncSession,
+    startup: StartupProfile,
+    jobs: List,
+    talent_ids: List[str],
+    first_pool: int,
+    k: Optional[int],
+    after: Optional[Tuple[float, str]]
+) -> List:
+    """``rank_candidates`` over ``talent_ids``, which must be sorted, with skills from the talent skill index.
+
+    The bitsets only span the startup's and jobs' skills and are read off
+    those skills' posting lists, so the work left on the event loop does
+    not grow with the talents' own skills.
+    """
+    required_skills = [s.lower() for s in (startup.required_skills or [])]
+    pools = [_startup_keywords(startup)]
+    pools.extend([s.lower() for s in (job.required_skills or [])] for job in jobs)
+    pools = pools[first_pool:]
+
+    vocabulary = {skill: j for j, skill in enumerate(dict.fromkeys(itertools.chain(required_skills, *pools)))}
+    index = get_skill_index("talent")
+    bits, sizes = index.bitsets(list(vocabulary), index.rows(talent_ids))
+    has_embedding, semantic_scores = await semantic_scores_for(
+        db, str(startup.user_id), "profile", talent_ids, "profile"
+    )
+    return await rank_candidates(
+        bits, sizes, np.asarray(semantic_scores), np.asarray(has_embedding, dtype=bool),
+        np.stack([encode_bits(pool, vocabulary, len(bits)) for pool in pools]),
+        encode_bits(required_skills, vocabulary, len(bits)), list(vocabulary),
+        (TALENT_KEYWORD_WEIGHT, TALENT_SEMANTIC_WEIGHT), k,
+        (after[0], bisect.bisect_right(talent_ids, after[1])) if after is not None else None
+    )
+
+
+def _investor_match_result(
+    startup: StartupProfile,
+    investor: InvestorProfile,
+    hybrid: bool,
+    semantic_score: float
+) -> Dict:
+    """Combine industry/stage overlap and thesis similarity into the match payload."""
+    # Score A: Keyword Match
     # Match industry to preferred sectors, stage to investment stage
     startup_industry = [startup.industry.lower()] if startup.industry else []
     preferred_sectors = [s.lower() for s in (investor.preferred_sectors or [])]
@@ -239,38 +913,40 @@ async def match_startup_to_investor(
     
     keyword_score = (industry_match + stage_match) / 2
     
-    # Score B: Semantic Match (40%)
-    startup_embedding_result = await db.execute(
-        select(Embedding).where(
-            Embedding.user_id == startup_id,
-            Embedding.text_source == "profile"
-        )
-    )
-    startup_embedding = startup_embedding_result.scalars().first()
-    
-    investor_embedding_result = await db.execute(
-        select(Embedding).where(
-            Embedding.user_id == investor_id,
-            Embedding.text_source == "thesis"
-        )
-    )
-    investor_embedding = investor_embedding_result.scalars().first()
-    
-    semantic_score = 0.0
-    if startup_embedding and investor_embedding:
-        v1 = startup_embedding.embedding
-        v2 = investor_embedding.embedding
-        if isinstance(v1, list) and isinstance(v2, list):
-            semantic_score = cosine_similarity(v1, v2)
+    # Score B: Semantic Match, only weighted in if both embeddings exist
+    if hybrid:
         final_score = (keyword_score * 0.5) + (semantic_score * 0.5)
     else:
         final_score = keyword_score
     
     return {
-        "user_id": str(investor.user_id),
         "match_percentage": round(final_score * 100, 2),
         "score_breakdown": {
             "industry_stage": round(keyword_score, 2),
             "semantic": round(semantic_score, 2)
         }
     }
+
+
+async def match_startup_to_investor(
+    db: AsyncSession,
+    startup_id: str,
+    investor_id: str,
+    loader: Optional[MatchLoader] = None
+) -> Dict:
+    """Match startup to investor using hybrid scoring; ``loader`` as for ``match_talent_to_startup``."""
+    loader = loader or MatchLoader(db)
+    startup = await loader.startup(startup_id)
+    investor = await loader.investor(investor_id)
+    
+    if not startup or not investor:
+        return {"error": "Profile not found"}
+    
+    hybrid, semantic_score = await _semantic_similarity(
+        db, startup_id, "profile", investor_id, "thesis", loader
+    )
+    
+    return {
+        "user_id": str(investor.user_id),
+        **_investor_match_result(startup, investor, hybrid, semantic_score)
+    }
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from sqlalchemy import text, select
+from database import AsyncSessionLocal, engine
+from embedding_codec import encode_vector
+from models import Embedding, EmbeddingJob, JobPosting, StartupProfile
+from matching import enqueue_embedding, job_posting_text
+from config import settings
+
+CHUNK_SIZE = 500
+
+
+async def migrate():
+    async with engine.begin() as conn:
+        # Check and add the binary vector and content hash columns to embeddings
+        result = await conn.execute(text("DESCRIBE embeddings"))
+        existing = [r[0] for r in result.fetchall()]
+
+        if "vector" not in existing:
+            print("Adding vector to embeddings...")
+            await conn.execute(text("ALTER TABLE embeddings ADD COLUMN vector BLOB"))
+        else:
+            print("  vector already exists in embeddings.")
+
+        if "content_hash" not in existing:
+            print("Adding content_hash to embeddings...")
+            await conn.execute(text("ALTER TABLE embeddings ADD COLUMN content_hash VARCHAR(64)"))
+        else:
+            print("  content_hash already exists in embeddings.")
+
+        if "job_id" not in existing:
+            print("Adding job_id to embeddings...")
+            await conn.execute(text("ALTER TABLE embeddings ADD COLUMN job_id VARCHAR(36) NULL"))
+            await conn.execute(text("CREATE INDEX ix_embeddings_job_id ON embeddings (job_id)"))
+            await conn.execute(text(
+                "ALTER TABLE embeddings ADD CONSTRAINT fk_embeddings_job_id "
+                "FOREIGN KEY (job_id) REFERENCES job_postings (id)"
+            ))
+        else:
+            print("  job_id already exists in embeddings.")
+        await conn.execute(text("ALTER TABLE embeddings MODIFY COLUMN embedding JSON NULL"))
+
+        # embedding_jobs is created by init_db; older copies lack the task column
+        try:
+            result = await conn.execute(text("DESCRIBE embedding_jobs"))
+            existing_jobs = [r[0] for r in result.fetchall()]
+            if "task" not in existing_jobs:
+                print("Adding task to embedding_jobs...")
+                await conn.execute(text("ALTER TABLE embedding_jobs ADD COLUMN task VARCHAR(20) DEFAULT 'embed'"))
+            else:
+                print("  task already exists in embedding_jobs.")
+            if "job_id" not in existing_jobs:
+                print("Adding job_id to embedding_jobs...")
+                await conn.execute(text("ALTER TABLE embedding_jobs ADD COLUMN job_id VARCHAR(36) NULL"))
+            else:
+                print("  job_id already exists in embedding_jobs.")
+        except Exception as e:
+            print(f"  Skipping embedding_jobs: {e}")
+
+    # Convert legacy JSON rows in chunks, one transaction per chunk, so the
+    # table is never locked for the whole run and progress survives a restart
+    converted = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT id, embedding FROM embeddings "
+                    "WHERE vector IS NULL AND embedding IS NOT NULL LIMIT :limit"
+                ),
+                {"limit": CHUNK_SIZE}
+            )
+            rows = result.fetchall()
+            if not rows:
+                break
+
+            updates = []
+            for row_id, embedding in rows:
+                values = json.loads(embedding) if isinstance(embedding, str) else embedding
+                if not isinstance(values, list):
+                    values = []
+                updates.append({"id": row_id, "vector": encode_vector(values, settings.EMBEDDING_STORAGE_DTYPE)})
+            await conn.execute(
+                text("UPDATE embeddings SET vector = :vector, embedding = NULL WHERE id = :id"),
+                updates
+            )
+        converted += len(rows)
+        print(f"  Converted {converted} embeddings...")
+
+    # Queue 'role_posting' embeddings for job postings that have none yet
+    queued, last_id = 0, ""
+    while True:
+        async with AsyncSessionLocal() as db:
+            embedded = select(Embedding.job_id).where(Embedding.job_id.isnot(None))
+            queued_jobs = select(EmbeddingJob.job_id).where(EmbeddingJob.job_id.isnot(None))
+            result = await db.execute(
+                select(JobPosting, StartupProfile.user_id)
+                .join(StartupProfile, StartupProfile.id == JobPosting.startup_id)
+                .where(JobPosting.id > last_id, JobPosting.id.notin_(embedded), JobPosting.id.notin_(queued_jobs))
+                .order_by(JobPosting.id)
+                .limit(CHUNK_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            for job, founder_id in rows:
+                enqueue_embedding(db, str(founder_id), job_posting_text(job), "role_posting", job_id=job.id)
+            await db.commit()
+        last_id = rows[-1][0].id
+        queued += len(rows)
+        print(f"  Queued {queued} job posting embeddings...")
+
+    await engine.dispose()
+    print("Migration complete.")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
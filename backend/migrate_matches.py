@@ -16,6 +16,14 @@ async def migrate():
         else:
             print("  job_id already exists in matches.")
 
+        # The /matches cache polls MAX(updated_at) of match_scores
+        result = await conn.execute(text("SHOW INDEX FROM match_scores WHERE Key_name = 'ix_match_scores_updated_at'"))
+        if not result.fetchall():
+            print("Adding ix_match_scores_updated_at to match_scores...")
+            await conn.execute(text("CREATE INDEX ix_match_scores_updated_at ON match_scores (updated_at)"))
+        else:
+            print("  ix_match_scores_updated_at already exists in match_scores.")
+
     await engine.dispose()
     print("Migration complete.")
 
@@ -0,0 +1,54 @@
+"""Create the skill tables and backfill them from the skill JSON columns.
+
+Safe to re-run: every entity's rows are rewritten from its JSON, the same
+way the profile and job handlers keep them in sync.
+
+Usage: python migrate_skills.py
+"""
+import asyncio
+from sqlalchemy import select
+from database import AsyncSessionLocal, engine, init_db
+from models import TalentProfile, StartupProfile, JobPosting
+from skill_store import sync_talent_skills, sync_startup_skills, sync_job_skills
+
+CHUNK_SIZE = 500
+
+
+async def _backfill(label, model, columns, sync):
+    """Sync every row of ``model`` in id-ordered chunks, one transaction per chunk."""
+    done, last_id = 0, ""
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(model.id, *columns).where(model.id > last_id).order_by(model.id).limit(CHUNK_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            for row in rows:
+                await sync(db, *row[1:])
+            await db.commit()
+        last_id = rows[-1][0]
+        done += len(rows)
+        print(f"  Backfilled {done} {label}...")
+
+
+async def migrate():
+    # init_db creates skills, talent_skills, job_skills and startup_skills
+    await init_db()
+
+    await _backfill(
+        "talent profiles", TalentProfile, [TalentProfile.user_id, TalentProfile.skills], sync_talent_skills
+    )
+    await _backfill(
+        "startup profiles", StartupProfile,
+        [StartupProfile.user_id, StartupProfile.required_skills, StartupProfile.tech_stack], sync_startup_skills
+    )
+    await _backfill("job postings", JobPosting, [JobPosting.id, JobPosting.required_skills], sync_job_skills)
+
+    await engine.dispose()
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
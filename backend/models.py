@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Float, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Integer, Float, Double, ForeignKey, JSON, LargeBinary, Index, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from database import Base
 import uuid
@@ -21,6 +21,13 @@ class MatchStatus(str, Enum):
     REJECTED = "REJECTED"
 
 
+class EmbeddingJobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
 class FundingStage(str, Enum):
     PRE_SEED = "pre-seed"
     SEED = "seed"
@@ -144,18 +151,107 @@ class InvestorProfile(Base):
     user = relationship("User", back_populates="investor_profile")
 
 
+class Skill(Base):
+    """Canonical skill name (lowercased); the *_skills tables reference it."""
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), unique=True, nullable=False)
+
+
+class TalentSkill(Base):
+    """One skill of a talent, mirrored from ``TalentProfile.skills``, see skill_store."""
+    __tablename__ = "talent_skills"
+    __table_args__ = (
+        Index("ix_talent_skills_skill", "skill_id", "talent_id"),
+    )
+    
+    talent_id = Column(String(36), ForeignKey("users.id"), primary_key=True)  # talent user id
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    proficiency = Column(String(50))
+
+
+class JobSkill(Base):
+    """One required skill of a job posting, mirrored from ``JobPosting.required_skills``."""
+    __tablename__ = "job_skills"
+    __table_args__ = (
+        Index("ix_job_skills_skill", "skill_id", "job_id"),
+    )
+    
+    job_id = Column(String(36), ForeignKey("job_postings.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+
+
+class StartupSkill(Base):
+    """One skill of a startup, mirrored from ``required_skills`` or ``tech_stack`` (``source``)."""
+    __tablename__ = "startup_skills"
+    __table_args__ = (
+        Index("ix_startup_skills_skill", "skill_id", "startup_id"),
+    )
+    
+    startup_id = Column(String(36), ForeignKey("users.id"), primary_key=True)  # startup user id
+    source = Column(String(20), primary_key=True)  # 'required' or 'tech_stack'
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+
+
 class Embedding(Base):
     __tablename__ = "embeddings"
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    embedding = Column(JSON)  # Store as JSON list for MySQL
+    embedding = Column(JSON, nullable=True)  # Legacy JSON list, superseded by vector
+    vector = Column(LargeBinary)  # Packed float32, see embedding_codec
+    content_hash = Column(String(64))  # sha256 of model + source text
     text_source = Column(String(100))  # 'profile', 'thesis', 'role_posting'
+    job_id = Column(String(36), ForeignKey("job_postings.id"), nullable=True, index=True)  # 'role_posting' only
     created_at = Column(String(50))
     
     user = relationship("User", back_populates="embeddings")
 
 
+class EmbeddingJob(Base):
+    """Outbox row asking the embedding worker to (re-)embed a user's text."""
+    __tablename__ = "embedding_jobs"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    text_source = Column(String(100), nullable=False)
+    job_id = Column(String(36))  # job posting of a 'role_posting' job; user_id is its founder
+    source_text = Column(Text)
+    task = Column(String(20), default="embed")  # 'embed', or 'rescore' to only refresh match scores
+    status = Column(SQLEnum(EmbeddingJobStatus), default=EmbeddingJobStatus.PENDING, index=True)
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(String(50), index=True)  # ISO timestamp; lease expiry while RUNNING
+    last_error = Column(Text)
+    created_at = Column(String(50))
+
+
+class MatchScore(Base):
+    """Precomputed match payload for one (source, target) pair, see score_store.
+
+    kind / source_id / target_id:
+      talent_startup       talent user / startup user  (startup baseline skills)
+      talent_job           talent user / job posting
+      talent_startup_best  talent user / startup user  (best of baseline and jobs)
+      startup_investor     startup user / investor user
+    """
+    __tablename__ = "match_scores"
+    __table_args__ = (
+        UniqueConstraint("kind", "source_id", "target_id", name="uq_match_scores_pair"),
+        Index("ix_match_scores_target", "kind", "target_id", "score"),
+        Index("ix_match_scores_source", "kind", "source_id", "score"),
+        Index("ix_match_scores_updated_at", "updated_at"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(30), nullable=False)
+    source_id = Column(String(36), nullable=False)
+    target_id = Column(String(36), nullable=False)
+    score = Column(Double, nullable=False)  # match_percentage; exact, cursors compare against it
+    payload = Column(JSON)  # score_breakdown and skill lists
+    updated_at = Column(String(50))
+
+
 class Match(Base):
     __tablename__ = "matches"
     
@@ -0,0 +1,66 @@
+"""Keyset pagination for ranked match lists.
+
+Lists are ordered by score descending, then by the matched entity's id, and
+a cursor is the (score, id) of the last item returned. The next page starts
+strictly after that position rather than at an offset, so items inserted,
+removed or rescored elsewhere in the ranking never shift page two by one.
+"""
+import base64
+import heapq
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+
+Cursor = Tuple[float, str]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Largest ``limit`` the list endpoints accept
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(score: float, item_id: str) -> str:
+    raw = json.dumps([score, item_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """(score, id) from a cursor string; a malformed cursor is a 400."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, item_id = json.loads(raw)
+        return float(score), str(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    items: List[Dict],
+    id_of: Callable[[Dict], str],
+    limit: Optional[int] = None,
+    cursor: Optional[Cursor] = None,
+    score_key: str = "match_percentage"
+) -> Tuple[List[Dict], Optional[str]]:
+    """One page of ``items`` in ranking order, and the cursor for the next page.
+
+    Uses a bounded heap, O(n log limit), instead of sorting the whole pool.
+    Without ``limit`` the remaining items are returned sorted and there is
+    no next cursor; a ``limit`` below 1 is a 400.
+    """
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    def rank(item):
+        return (-item[score_key], id_of(item))
+
+    if cursor is not None:
+        after = (-cursor[0], cursor[1])
+        items = [item for item in items if rank(item) > after]
+    if limit is None:
+        return sorted(items, key=rank), None
+
+    page = heapq.nsmallest(limit + 1, items, key=rank)
+    if len(page) <= limit:
+        return page, None
+    last = page[limit - 1]
+    return page[:limit], encode_cursor(last[score_key], id_of(last))
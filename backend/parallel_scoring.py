@@ -0,0 +1,194 @@
+"""Multi-core talent scoring for large candidate sets.
+
+Scoring a startup against every talent (Jaccard per keyword pool, the
+hybrid blend, the best pool and the matched/missing skill lists) is pure
+NumPy and Python once the skill bitsets and semantic scores are known, and
+for hundreds of thousands of talents it holds the GIL long enough to stall
+the event loop. Above ``MATCH_PARALLEL_MIN_PAIRS`` (talent, pool) pairs,
+``rank_candidates`` copies the candidate arrays into one shared memory
+block, has ``MATCH_PARALLEL_WORKERS`` processes score a contiguous shard
+each and return their own top k, and merges those partial rankings. Only
+the query bitsets, the skill names and the winners cross process
+boundaries; the candidate matrix is never pickled.
+
+Workers are spawned, not forked, so they never inherit the API process's
+threads or sockets, and they import only this module and ``scoring``.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from scoring import best_pools, bitset_intersections, decode_bits, jaccard_from_counts, popcount
+from config import settings
+
+# (match_percentage, position, pool, keyword, semantic, hybrid, matched_skills, missing_skills)
+Ranked = Tuple[float, int, int, float, float, bool, List[str], List[str]]
+# Name -> (dtype, shape, byte offset) of each array in a shared block
+Layout = Dict[str, Tuple[str, Tuple[int, ...], int]]
+
+# round(x, 2) moves a percentage by at most half a hundredth; padded
+_ROUNDING_MARGIN = 0.006
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def worker_count() -> int:
+    """Scoring processes per API process; by default the CPUs are split between ``WEB_CONCURRENCY`` of them."""
+    return settings.MATCH_PARALLEL_WORKERS or max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+
+
+def parallel_enabled(pairs: int) -> bool:
+    """Whether scoring ``pairs`` (candidate, pool) pairs is worth sharding across processes."""
+    return worker_count() > 1 and pairs >= settings.MATCH_PARALLEL_MIN_PAIRS
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=worker_count(), mp_context=get_context("spawn"))
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+class SharedArrays:
+    """NumPy arrays copied into one shared memory block, unlinked on exit."""
+
+    def __init__(self, **arrays: np.ndarray):
+        self.layout: Layout = {}
+        size = 0
+        for key, array in arrays.items():
+            self.layout[key] = (array.dtype.str, array.shape, size)
+            # Keep every array 64-byte aligned
+            size += -(-array.nbytes // 64) * 64
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for key, array in arrays.items():
+            _view(self._shm, self.layout[key])[...] = array
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+def _view(shm: shared_memory.SharedMemory, spec: Tuple[str, Tuple[int, ...], int]) -> np.ndarray:
+    dtype, shape, offset = spec
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+
+
+def _select(finals: np.ndarray, k: Optional[int], after: Optional[Tuple[float, int]], lo: int) -> List[Tuple[float, int]]:
+    """(-match_percentage, position) of the shard's best ``k`` ranked after ``after``, best first.
+
+    Percentages are rounded exactly as the payload rounds them, but only
+    for candidates near the cursor or the k-th score; the rest are settled
+    on the unrounded score.
+    """
+    approx = finals * 100
+    keep = np.ones(len(finals), dtype=bool)
+    if after is not None:
+        score, after_position = after
+        keep = approx <= score + _ROUNDING_MARGIN
+        for i in np.flatnonzero(keep & (approx >= score - _ROUNDING_MARGIN)).tolist():
+            keep[i] = (-round(float(finals[i]) * 100, 2), lo + i) >= (-score, after_position)
+    candidates = np.flatnonzero(keep)
+    if k is not None and len(candidates) > k:
+        kth = np.partition(approx[candidates], len(candidates) - k)[len(candidates) - k]
+        candidates = candidates[approx[candidates] >= kth - 2 * _ROUNDING_MARGIN]
+    ranked = sorted(
+        (-round(final * 100, 2), lo + i) for i, final in zip(candidates.tolist(), finals[candidates].tolist())
+    )
+    return ranked[:k] if k is not None else ranked
+
+
+def _score_shard(
+    block: str,
+    layout: Layout,
+    lo: int,
+    hi: int,
+    queries: np.ndarray,
+    query_sizes: np.ndarray,
+    required: np.ndarray,
+    names: List[str],
+    weights: Tuple[float, float],
+    k: Optional[int],
+    after: Optional[Tuple[float, int]]
+) -> List[Ranked]:
+    """Score candidates ``lo:hi`` of the shared block; runs in a worker process."""
+    # Workers share the API process's resource tracker, which unlinks the
+    # block once, when SharedArrays exits
+    shm = shared_memory.SharedMemory(name=block)
+    try:
+        # Copies of the shard, so no view outlives the mapping
+        bits = _view(shm, layout["bits"])[:, lo:hi].copy()
+        sizes = _view(shm, layout["sizes"])[lo:hi].copy()
+        semantic = _view(shm, layout["semantic"])[lo:hi].astype(np.float64)
+        has_embedding = _view(shm, layout["has_embedding"])[lo:hi].copy()
+
+        keyword = jaccard_from_counts(bitset_intersections(queries, bits), sizes, query_sizes)
+        best, finals = best_pools(keyword, semantic, has_embedding, *weights)
+        results = []
+        for neg_percentage, position in _select(finals, k, after, lo):
+            i = position - lo
+            talent_bits = bits[:, i]
+            results.append((
+                -neg_percentage, position, int(best[i]), float(keyword[best[i], i]), float(semantic[i]),
+                bool(has_embedding[i]),
+                decode_bits(talent_bits & required, names), decode_bits(required & ~talent_bits, names)
+            ))
+        return results
+    finally:
+        shm.close()
+
+
+async def rank_candidates(
+    bits: np.ndarray,
+    sizes: np.ndarray,
+    semantic: np.ndarray,
+    has_embedding: np.ndarray,
+    queries: np.ndarray,
+    required: np.ndarray,
+    names: List[str],
+    weights: Tuple[float, float],
+    k: Optional[int] = None,
+    after: Optional[Tuple[float, int]] = None
+) -> List[Ranked]:
+    """Best ``k`` candidates (all without ``k``) by (match_percentage desc, position).
+
+    ``bits`` (words, N) and ``sizes`` are the candidates' ``SkillBitsets``
+    (the bits need only cover the query skills, the sizes count them all),
+    ``queries`` (pools, words) the keyword pools encoded against the same
+    vocabulary and ``required`` the skills the matched/missing lists are
+    computed against; ``names[j]`` is skill id ``j``. Positions stand in
+    for ids in tie-breaks, so order candidates by id; ``after`` is a cursor
+    as (match_percentage, first position past its id).
+    """
+    n = bits.shape[1]
+    shard = -(-n // worker_count()) if n else 1
+    query_sizes = popcount(queries).astype(np.int64).sum(axis=1)
+
+    loop = asyncio.get_running_loop()
+    with SharedArrays(bits=bits, sizes=sizes, semantic=semantic, has_embedding=has_embedding) as shared:
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(
+                get_executor(), _score_shard, shared.name, shared.layout, lo, min(lo + shard, n),
+                queries, query_sizes, required, names, weights, k, after
+            )
+            for lo in range(0, n, shard)
+        ))
+    merged = heapq.merge(*parts, key=lambda r: (-r[0], r[1]))
+    return list(itertools.islice(merged, k) if k is not None else merged)
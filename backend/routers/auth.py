@@ -5,6 +5,8 @@ from pydantic import BaseModel, EmailStr
 from database import get_db
 from models import User, UserRole
 from auth import get_password_hash, verify_password, create_access_token, get_user_by_email
+from match_cache import bump_data_version
+from matching import enqueue_rescore
 from datetime import datetime, timedelta
 from config import settings
 from mock_data import MOCK_USERS
@@ -89,8 +91,12 @@ async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
             updated_at=datetime.utcnow().isoformat()
         )
         db.add(new_profile)
+    # Stored scores for the new profile, in both directions, are computed by the worker
+    enqueue_rescore(db, str(new_user.id))
     
     await db.commit()
+    # The new profile appears in other users' match lists
+    bump_data_version()
     
     # Create token
     access_token = create_access_token(data={"sub": str(new_user.id), "role": user_data.role.value})
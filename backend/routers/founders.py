@@ -4,9 +4,14 @@ from sqlalchemy import select, delete
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from database import get_db
-from models import User, StartupProfile, UserRole, JobPosting
+from models import User, StartupProfile, UserRole, JobPosting, Embedding
 from dependencies import get_current_user
-from matching import generate_embedding, store_embedding
+from matching import JOB_TEXT_FIELDS, enqueue_embedding, enqueue_rescore, job_posting_text
+from match_cache import bump_data_version
+from score_store import delete_job_scores
+from embedding_index import get_index
+from skill_index import get_skill_index, normalize_skills
+from skill_store import delete_job_skills, sync_job_skills, sync_startup_skills
 from datetime import datetime
 from uuid import UUID
 from config import settings
@@ -130,13 +135,16 @@ async def update_startup_profile(
     filled = sum(1 for field in fields if getattr(profile, field))
     profile.completeness_score = (filled / len(fields)) * 100
     
-    await db.commit()
-    await db.refresh(profile)
+    if "required_skills" in update_data or "tech_stack" in update_data:
+        await sync_startup_skills(db, str(current_user.id), profile.required_skills, profile.tech_stack)
     
-    # Generate and store embedding
+    # Re-embedded by the worker, committed with the profile change
     profile_text = f"{profile.name or ''} {profile.tagline or ''} {profile.problem_statement or ''} {' '.join(profile.tech_stack or [])}"
-    embedding = await generate_embedding(profile_text)
-    await store_embedding(db, str(current_user.id), embedding, "profile")
+    enqueue_embedding(db, str(current_user.id), profile_text, "profile")
+    
+    await db.commit()
+    bump_data_version()
+    await db.refresh(profile)
     
     return {"message": "Profile updated", "completeness_score": profile.completeness_score}
 
@@ -171,8 +179,15 @@ async def create_job(
         updated_at=datetime.utcnow().isoformat()
     )
     db.add(job)
+    await db.flush()
+    await sync_job_skills(db, job.id, job.required_skills)
+    # Stored talent scores for the new job are computed by the worker
+    enqueue_rescore(db, str(current_user.id))
+    enqueue_embedding(db, str(current_user.id), job_posting_text(job), "role_posting", job_id=job.id)
     await db.commit()
+    bump_data_version()
     await db.refresh(job)
+    get_skill_index("job").upsert(str(job.id), normalize_skills(job.required_skills))
     return {
         "id": str(job.id),
         "startup_id": str(job.startup_id),
@@ -252,9 +267,16 @@ async def update_job(
     for key, value in update_data.items():
         setattr(job, key, value)
     job.updated_at = datetime.utcnow().isoformat()
+    if "required_skills" in update_data:
+        await sync_job_skills(db, job.id, job.required_skills)
+    enqueue_rescore(db, str(current_user.id))
+    if any(field in update_data for field in JOB_TEXT_FIELDS):
+        enqueue_embedding(db, str(current_user.id), job_posting_text(job), "role_posting", job_id=job.id)
     
     await db.commit()
+    bump_data_version()
     await db.refresh(job)
+    get_skill_index("job").upsert(str(job.id), normalize_skills(job.required_skills))
     return {
         "id": str(job.id),
         "startup_id": str(job.startup_id),
@@ -293,6 +315,13 @@ async def delete_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found or unauthorized")
     
+    await delete_job_skills(db, job_id)
+    await db.execute(delete(Embedding).where(Embedding.job_id == job_id))
     await db.delete(job)
+    await delete_job_scores(db, job_id)
+    enqueue_rescore(db, str(current_user.id))
     await db.commit()
+    bump_data_version()
+    get_skill_index("job").remove(job_id)
+    get_index("role_posting").remove(job_id)
     return {"message": "Job deleted"}
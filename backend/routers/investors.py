@@ -7,7 +7,8 @@ from typing import Optional, List
 from database import get_db
 from models import User, InvestorProfile, UserRole
 from dependencies import get_current_user
-from matching import generate_embedding, store_embedding
+from matching import enqueue_embedding
+from match_cache import bump_data_version
 from datetime import datetime
 from config import settings
 from mock_data import MOCK_INVESTOR_PROFILE
@@ -111,14 +112,14 @@ async def update_investor_thesis(
     filled = sum(1 for field in fields if getattr(profile, field))
     profile.completeness_score = (filled / len(fields)) * 100
     
+    # Re-embedded by the worker, committed with the profile change
+    thesis_text = f"{profile.thesis_text or ''} {' '.join(profile.preferred_sectors or [])} {' '.join(profile.key_signals or [])}"
+    enqueue_embedding(db, str(current_user.id), thesis_text, "thesis")
+    
     await db.commit()
+    bump_data_version()
     await db.refresh(profile)
     
-    # Generate and store embedding
-    thesis_text = f"{profile.thesis_text or ''} {' '.join(profile.preferred_sectors or [])} {' '.join(profile.key_signals or [])}"
-    embedding = await generate_embedding(thesis_text)
-    await store_embedding(db, str(current_user.id), embedding, "thesis")
-    
     return {"message": "Thesis updated", "completeness_score": profile.completeness_score}
 @router.get("/all")
 async def get_all_investors(
@@ -1,22 +1,36 @@
 """Matching routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from pydantic import BaseModel
 from typing import List, Optional
 from database import get_db
-from models import User, Match, MatchStatus, TalentProfile, StartupProfile, InvestorProfile, UserRole, JobPosting
+from models import User, Match, MatchStatus, StartupProfile, InvestorProfile, UserRole, JobPosting
 from dependencies import get_current_user
-from matching import match_talent_to_startup, match_startup_to_investor
+from matching import (
+    match_jobs_for_talent, match_talent_to_startup, match_talents_to_startup_batch, match_startup_to_investor,
+    preload_embeddings
+)
+from match_loader import MatchLoader
+from match_cache import cached_page
+from skill_store import jobs_with_skills, talents_with_skills
+import score_store
+from pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, Cursor, decode_cursor, paginate
 from datetime import datetime
-from uuid import UUID
 from config import settings
 from mock_data import MOCK_TALENT_MATCHES, MOCK_INVESTOR_MATCHES, MOCK_STARTUP_MATCHES
 
 router = APIRouter()
 
 
+def _page(response: Response, matches, next_cursor):
+    """Return a page, exposing the next cursor (if any) in a header."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return matches
+
+
 class ConnectionRequest(BaseModel):
     target_id: str
     message: str
@@ -25,155 +39,221 @@ class ConnectionRequest(BaseModel):
 
 @router.get("/talent")
 async def get_talent_matches(
+    response: Response,
     job_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skills: List[str] = Query([]),
+    min_skills: int = Query(1, ge=1),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get matched talent for founder's startup or specific job."""
+    """Get matched talent for founder's startup or specific job.
+
+    Ranked by match percentage. With ``limit`` only that many are returned
+    and the ``X-Next-Cursor`` header holds the ``cursor`` for the next page.
+    With ``skills`` only talents having at least ``min_skills`` of them are
+    ranked.
+    """
     if current_user.role != UserRole.FOUNDER:
         raise HTTPException(status_code=403, detail="Access denied")
     
     if settings.USE_MOCK_DATA:
         return MOCK_TALENT_MATCHES
     
-    # Get all talent profiles
-    talent_result = await db.execute(select(TalentProfile))
-    all_talent = talent_result.scalars().all()
-    
-    # Get startup profile
-    startup_result = await db.execute(
-        select(StartupProfile).where(StartupProfile.user_id == current_user.id)
-    )
-    startup = startup_result.scalars().first()
-    
-    if not startup:
-        return []
+    after = decode_cursor(cursor)
+    return _page(response, *await cached_page(
+        "talent", current_user.id,
+        {"job_id": job_id, "limit": limit, "cursor": cursor, "skills": tuple(skills), "min_skills": min_skills},
+        lambda: _talent_page(db, str(current_user.id), job_id, limit, after, skills, min_skills)
+    ))
 
-    # If job_id provided, match specifically for that job
-    # Otherwise, we match against startup profile and ALL jobs, taking the max score
-    active_jobs = []
-    if not job_id:
-        jobs_result = await db.execute(select(JobPosting).where(JobPosting.startup_id == startup.id))
-        active_jobs = jobs_result.scalars().all()
 
-    matches = []
-    for talent in all_talent:
-        # Baseline match against startup profile
-        best_match = await match_talent_to_startup(
-            db, 
-            str(talent.user_id), 
-            str(current_user.id),
-            job_id=None
-        )
-        
-        # If no job_id specified, check if talent matches any specific job better
-        if not job_id:
-            for job in active_jobs:
-                job_match = await match_talent_to_startup(
-                    db,
-                    str(talent.user_id),
-                    str(current_user.id),
-                    job_id=str(job.id)
-                )
-                if "error" not in job_match and job_match["match_percentage"] > best_match["match_percentage"]:
-                    best_match = job_match
-        elif job_id and job_id != "[object Object]":
-            # If specific job_id was requested, refine the match
-            best_match = await match_talent_to_startup(
-                db,
-                str(talent.user_id),
-                str(current_user.id),
-                job_id=job_id
-            )
-
-        if "error" not in best_match:
-            matches.append({
-                "talent_id": str(talent.user_id),
-                "name": talent.name,
-                "headline": talent.headline,
-                **best_match
-            })
+async def _talent_page(
+    db: AsyncSession,
+    founder_id: str,
+    job_id: Optional[str],
+    limit: Optional[int],
+    after: Optional[Cursor],
+    skills: List[str],
+    min_skills: int
+):
+    """Talents ranked for a founder's startup or one of its jobs, as (page, next cursor)."""
+    talent_ids = None
+    if skills:
+        # One indexed GROUP BY over talent_skills narrows the candidates
+        talent_ids = [talent_id for talent_id, _ in await talents_with_skills(db, skills, min_skills)]
+        if not talent_ids:
+            return [], None
+
+    if settings.MATCH_SCORE_STORE:
+        stored = await score_store.talent_matches_for_startup(db, founder_id, job_id, limit, after, talent_ids)
+        if stored is not None:
+            return stored
     
-    # Sort by match percentage
-    matches.sort(key=lambda x: x["match_percentage"], reverse=True)
+    # Startup, jobs, talents and embeddings are loaded in a fixed number of
+    # queries and every (talent, job) pair is scored in memory. A page only
+    # needs the top limit + 1, so talents that can't reach it are pruned.
+    matches = await match_talents_to_startup_batch(
+        db, founder_id, job_id=job_id, talent_ids=talent_ids, top_k=limit + 1 if limit else None, after=after
+    )
     
-    return matches
+    # Top of the ranking by match percentage
+    return paginate(matches, lambda m: m["talent_id"], limit, after)
 
 
 @router.get("/investors")
 async def get_investor_matches(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get matched investors for founder's startup or matched startups for investor."""
+    """Get matched investors for founder's startup or matched startups for investor.
+
+    Paginated like ``GET /matches/talent``.
+    """
+    after = decode_cursor(cursor)
+    params = {"limit": limit, "cursor": cursor}
     if current_user.role == UserRole.FOUNDER:
         if settings.USE_MOCK_DATA:
             return MOCK_INVESTOR_MATCHES
         
-        # Get all investor profiles
-        investor_result = await db.execute(select(InvestorProfile))
-        all_investors = investor_result.scalars().all()
-        
-        matches = []
-        for investor in all_investors:
-            match_result = await match_startup_to_investor(db, str(current_user.id), str(investor.user_id))
-            if "error" not in match_result:
-                matches.append({
-                    "investor_id": str(investor.user_id),
-                    "name": investor.name,
-                    "fund": investor.fund,
-                    "type": investor.type,
-                    **match_result
-                })
-        
-        matches.sort(key=lambda x: x["match_percentage"], reverse=True)
-        return matches
+        return _page(response, *await cached_page(
+            "investors", current_user.id, params,
+            lambda: _investor_page(db, str(current_user.id), limit, after)
+        ))
 
     elif current_user.role == UserRole.INVESTOR:
         if settings.USE_MOCK_DATA:
             return MOCK_STARTUP_MATCHES
-            
-        # Get all startup profiles
-        startup_result = await db.execute(select(StartupProfile))
-        all_startups = startup_result.scalars().all()
-        
-        matches = []
-        for startup in all_startups:
-            match_result = await match_startup_to_investor(db, str(startup.user_id), str(current_user.id))
-            if "error" not in match_result:
-                matches.append({
-                    "startup_id": str(startup.user_id),
-                    "name": startup.name,
-                    "tagline": startup.tagline,
-                    "industry": startup.industry,
-                    **match_result
-                })
         
-        matches.sort(key=lambda x: x["match_percentage"], reverse=True)
-        return matches
+        return _page(response, *await cached_page(
+            "investors", current_user.id, params,
+            lambda: _investor_startup_page(db, str(current_user.id), limit, after)
+        ))
     
     else:
         raise HTTPException(status_code=403, detail="Access denied")
 
 
+async def _investor_page(
+    db: AsyncSession,
+    founder_id: str,
+    limit: Optional[int],
+    after: Optional[Cursor]
+):
+    """Investors ranked for a founder's startup, as (page, next cursor)."""
+    if settings.MATCH_SCORE_STORE:
+        stored = await score_store.investor_matches_for_startup(db, founder_id, limit, after)
+        if stored is not None:
+            return stored
+    
+    # Get all investor profiles
+    investor_result = await db.execute(select(InvestorProfile))
+    all_investors = investor_result.scalars().all()
+    
+    # The startup and every thesis embedding are read once, not per investor
+    loader = MatchLoader(db)
+    loader.prime_rows("investor", all_investors)
+    await preload_embeddings(loader, [str(i.user_id) for i in all_investors], "thesis")
+    
+    matches = []
+    for investor in all_investors:
+        match_result = await match_startup_to_investor(db, founder_id, str(investor.user_id), loader=loader)
+        if "error" not in match_result:
+            matches.append({
+                "investor_id": str(investor.user_id),
+                "name": investor.name,
+                "fund": investor.fund,
+                "type": investor.type,
+                **match_result
+            })
+    
+    return paginate(matches, lambda m: m["investor_id"], limit, after)
+
+
+async def _investor_startup_page(
+    db: AsyncSession,
+    investor_id: str,
+    limit: Optional[int],
+    after: Optional[Cursor]
+):
+    """Startups ranked for an investor, as (page, next cursor)."""
+    if settings.MATCH_SCORE_STORE:
+        stored = await score_store.startup_matches_for_investor(db, investor_id, limit, after)
+        if stored is not None:
+            return stored
+        
+    # Get all startup profiles
+    startup_result = await db.execute(select(StartupProfile))
+    all_startups = startup_result.scalars().all()
+    
+    loader = MatchLoader(db)
+    loader.prime_rows("startup", all_startups)
+    await preload_embeddings(loader, [str(s.user_id) for s in all_startups], "profile")
+    
+    matches = []
+    for startup in all_startups:
+        match_result = await match_startup_to_investor(db, str(startup.user_id), investor_id, loader=loader)
+        if "error" not in match_result:
+            matches.append({
+                "startup_id": str(startup.user_id),
+                "name": startup.name,
+                "tagline": startup.tagline,
+                "industry": startup.industry,
+                **match_result
+            })
+    
+    return paginate(matches, lambda m: m["startup_id"], limit, after)
+
+
 @router.get("/startups")
 async def get_startup_matches(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get matched startups for talent."""
+    """Get matched startups for talent, paginated like ``GET /matches/talent``."""
     if current_user.role != UserRole.TALENT:
         raise HTTPException(status_code=403, detail="Access denied")
     
     if settings.USE_MOCK_DATA:
         return MOCK_STARTUP_MATCHES
     
+    after = decode_cursor(cursor)
+    return _page(response, *await cached_page(
+        "startups", current_user.id, {"limit": limit, "cursor": cursor},
+        lambda: _startup_page(db, str(current_user.id), limit, after)
+    ))
+
+
+async def _startup_page(
+    db: AsyncSession,
+    talent_id: str,
+    limit: Optional[int],
+    after: Optional[Cursor]
+):
+    """Startups ranked for a talent, as (page, next cursor)."""
+    if settings.MATCH_SCORE_STORE:
+        stored = await score_store.startup_matches_for_talent(db, talent_id, limit, after)
+        if stored is not None:
+            return stored
+    
     startup_result = await db.execute(select(StartupProfile))
     all_startups = startup_result.scalars().all()
     
+    # The talent profile and every startup embedding are read once, not per startup
+    loader = MatchLoader(db)
+    loader.prime_rows("startup", all_startups)
+    await preload_embeddings(loader, [str(s.user_id) for s in all_startups], "profile")
+    
     matches = []
     for startup in all_startups:
-        match_result = await match_talent_to_startup(db, str(current_user.id), str(startup.user_id))
+        match_result = await match_talent_to_startup(db, talent_id, str(startup.user_id), loader=loader)
         if "error" not in match_result:
             matches.append({
                 "startup_id": str(startup.user_id),
@@ -183,9 +263,54 @@ async def get_startup_matches(
                 **match_result
             })
     
-    matches.sort(key=lambda x: x["match_percentage"], reverse=True)
+    return paginate(matches, lambda m: m["startup_id"], limit, after)
+
+
+def _mock_pair_matches(target_ids: List[str]) -> dict:
+    entries = {}
+    for match in MOCK_TALENT_MATCHES + MOCK_INVESTOR_MATCHES + MOCK_STARTUP_MATCHES:
+        target = match.get("talent_id") or match.get("investor_id") or match.get("startup_id")
+        if target in target_ids:
+            entries[target] = match
+    return entries
+
+
+@router.get("/score")
+async def get_match_score(
+    target_id: str,
+    job_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Match entry for one talent, startup or investor, as the match lists show it.
+
+    Scores only this pair (or reads it from the score store) instead of the
+    whole pool.
+    """
+    if settings.USE_MOCK_DATA:
+        entries = _mock_pair_matches([target_id])
+    else:
+        entries = await score_store.pair_matches(db, current_user, [target_id], job_id)
+    if target_id not in entries:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return entries[target_id]
+
+
+@router.get("/scores")
+async def get_match_scores(
+    target_ids: List[str] = Query(...),
+    job_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Match entries for several targets at once, keyed by target id.
+
+    Targets that are not a match for the current user are omitted.
+    """
+    if settings.USE_MOCK_DATA:
+        return _mock_pair_matches(target_ids)
     
-    return matches
+    return await score_store.pair_matches(db, current_user, target_ids, job_id)
 
 
 @router.post("/connections/request")
@@ -257,59 +382,53 @@ async def get_job_applicants(
 
 @router.get("/jobs")
 async def get_job_matches(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skills: List[str] = Query([]),
+    min_skills: int = Query(1, ge=1),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get matched jobs for talent, ranked by skill overlap."""
+    """Get matched jobs for talent, ranked by skill overlap and role similarity.
+
+    Paginated and filtered on required ``skills`` like ``GET /matches/talent``.
+    """
     if current_user.role != UserRole.TALENT:
         raise HTTPException(status_code=403, detail="Access denied")
     
     if settings.USE_MOCK_DATA:
         return MOCK_STARTUP_MATCHES
     
-    # Get talent profile to extract skills
-    talent_result = await db.execute(
-        select(TalentProfile).where(TalentProfile.user_id == current_user.id)
-    )
-    talent = talent_result.scalars().first()
-    talent_skills = set()
-    if talent and talent.skills:
-        # skills is [{name: str, proficiency: str}, ...]
-        talent_skills = {s["name"].lower() for s in talent.skills if isinstance(s, dict) and "name" in s}
-
-    result = await db.execute(
-        select(JobPosting).options(joinedload(JobPosting.startup))
+    after = decode_cursor(cursor)
+    return _page(response, *await cached_page(
+        "jobs", current_user.id,
+        {"limit": limit, "cursor": cursor, "skills": tuple(skills), "min_skills": min_skills},
+        lambda: _job_page(db, str(current_user.id), limit, after, skills, min_skills)
+    ))
+
+
+async def _job_page(
+    db: AsyncSession,
+    talent_id: str,
+    limit: Optional[int],
+    after: Optional[Cursor],
+    skills: List[str],
+    min_skills: int
+):
+    """Job postings ranked for a talent, as (page, next cursor)."""
+    job_ids = None
+    if skills:
+        job_ids = [job_id for job_id, _ in await jobs_with_skills(db, skills, min_skills)]
+        if not job_ids:
+            return [], None
+
+    # Keyword scores for every job come from the job skill index; embeddings
+    # and job rows are only read for jobs that can make the page
+    matches = await match_jobs_for_talent(
+        db, talent_id, job_ids=job_ids, top_k=limit + 1 if limit else None, after=after
     )
-    all_jobs = result.scalars().all()
-    
-    matches = []
-    for job in all_jobs:
-        # Calculate skill overlap
-        job_skills = set(s.lower() for s in (job.required_skills or []))
-        if job_skills and talent_skills:
-            overlap = len(talent_skills & job_skills)
-            skill_score = min(100, int((overlap / len(job_skills)) * 100))
-        else:
-            skill_score = 50  # neutral score if no skills defined
-        
-        matches.append({
-            "job_id": str(job.id),
-            "startup_id": str(job.startup.id),
-            "founder_user_id": str(job.startup.user_id),
-            "title": job.title,
-            "description": job.description,
-            "location": job.location,
-            "job_type": job.job_type,
-            "compensation": job.compensation,
-            "required_skills": job.required_skills or [],
-            "startup_name": job.startup.name,
-            "industry": job.startup.industry,
-            "match_percentage": skill_score,
-        })
-    
-    # Sort by skill match score descending
-    matches.sort(key=lambda x: x["match_percentage"], reverse=True)
-    return matches
+    return paginate(matches, lambda m: m["job_id"], limit, after)
 
 
 @router.get("/connections")
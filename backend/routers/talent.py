@@ -6,7 +6,10 @@ from typing import Optional, List, Dict
 from database import get_db
 from models import User, TalentProfile, UserRole
 from dependencies import get_current_user
-from matching import generate_embedding, store_embedding
+from matching import enqueue_embedding
+from match_cache import bump_data_version
+from skill_index import get_skill_index, normalize_skills
+from skill_store import sync_talent_skills
 from datetime import datetime
 from config import settings
 from mock_data import MOCK_TALENT_PROFILE
@@ -105,14 +108,18 @@ async def update_talent_profile(
     filled = sum(1 for field in fields if getattr(profile, field))
     profile.completeness_score = (filled / len(fields)) * 100
     
-    await db.commit()
-    await db.refresh(profile)
+    if "skills" in update_data:
+        await sync_talent_skills(db, str(current_user.id), profile.skills)
     
-    # Generate and store embedding
+    # Re-embedded by the worker, committed with the profile change
     skill_names = [s.get("name", "") for s in (profile.skills or [])]
     profile_text = f"{profile.name or ''} {profile.headline or ''} {profile.bio or ''} {' '.join(skill_names)}"
-    embedding = await generate_embedding(profile_text)
-    await store_embedding(db, str(current_user.id), embedding, "profile")
+    enqueue_embedding(db, str(current_user.id), profile_text, "profile")
+    
+    await db.commit()
+    bump_data_version()
+    await db.refresh(profile)
+    get_skill_index("talent").upsert(str(current_user.id), normalize_skills(profile.skills))
     
     return {"message": "Profile updated", "completeness_score": profile.completeness_score}
 
@@ -0,0 +1,484 @@
+"""Persisted match scores (the ``match_scores`` table).
+
+Scores only change when a profile, thesis or job posting changes, so they
+are computed on those writes instead of on every read: the embedding worker
+calls ``rescore_user`` after each profile job, which rewrites just that
+entity's row (a talent against every startup and job) or column (every
+talent and investor against a startup, every startup against an investor).
+The ``/matches`` read endpoints then become ``ORDER BY score DESC`` keyset
+lookups on an index (see ``pagination``). Payloads are exactly what the live scorers in ``matching``
+return; readers fall back to live scoring while a slice has no rows yet.
+"""
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select, delete, insert, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import (
+    User, UserRole, TalentProfile, StartupProfile, InvestorProfile, JobPosting, MatchScore
+)
+from scoring import SkillBitsets, jaccard_scores
+from skill_index import get_skill_index, skill_indexes_loaded
+from pagination import Cursor, encode_cursor
+from matching import (
+    _best_match, _investor_match_result, _startup_keywords, _talent_match_result,
+    _talent_skill_names, match_startup_to_investor, match_talent_to_startup,
+    match_talents_to_startup_batch, preload_embeddings, score_talents_for_startup, semantic_scores_for
+)
+from match_loader import MatchLoader
+from config import settings
+
+TALENT_STARTUP = "talent_startup"
+TALENT_JOB = "talent_job"
+TALENT_STARTUP_BEST = "talent_startup_best"
+STARTUP_INVESTOR = "startup_investor"
+
+
+def _row(kind: str, source_id: str, target_id: str, result: Dict, now: str) -> Dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "source_id": str(source_id),
+        "target_id": str(target_id),
+        "score": result["match_percentage"],
+        "payload": result,
+        "updated_at": now,
+    }
+
+
+async def _write(db: AsyncSession, rows: List[Dict], *stale) -> None:
+    """Delete the slices described by ``stale`` conditions, then insert ``rows``."""
+    for condition in stale:
+        await db.execute(delete(MatchScore).where(*condition))
+    if rows:
+        await db.execute(insert(MatchScore), rows)
+
+
+def _best_with_job(results: List[Dict], jobs: List[JobPosting]) -> Dict:
+    """``_best_match`` of the baseline result then one per job, naming the winning job."""
+    best = _best_match(results)
+    pool = results.index(best)
+    return {**best, "best_job_id": str(jobs[pool - 1].id) if pool else None}
+
+
+async def _jobs_by_startup(db: AsyncSession) -> Dict[str, List[JobPosting]]:
+    result = await db.execute(select(JobPosting).order_by(JobPosting.id))
+    jobs: Dict[str, List[JobPosting]] = {}
+    for job in result.scalars().all():
+        jobs.setdefault(str(job.startup_id), []).append(job)
+    return jobs
+
+
+async def rescore_startup(db: AsyncSession, startup: StartupProfile) -> None:
+    """Recompute every talent and investor score against one startup."""
+    now = datetime.utcnow().isoformat()
+    startup_id = str(startup.user_id)
+    jobs_result = await db.execute(
+        select(JobPosting).where(JobPosting.startup_id == startup.id).order_by(JobPosting.id)
+    )
+    jobs = jobs_result.scalars().all()
+    talent_result = await db.execute(select(TalentProfile))
+    talents = talent_result.scalars().all()
+
+    pool_results = await score_talents_for_startup(db, startup, jobs, talents)
+    rows = []
+    for i, talent in enumerate(talents):
+        talent_id = str(talent.user_id)
+        rows.append(_row(TALENT_STARTUP, talent_id, startup_id, pool_results[0][i], now))
+        for job, results in zip(jobs, pool_results[1:]):
+            rows.append(_row(TALENT_JOB, talent_id, job.id, results[i], now))
+        rows.append(_row(TALENT_STARTUP_BEST, talent_id, startup_id, _best_with_job([r[i] for r in pool_results], jobs), now))
+    await _write(
+        db, rows,
+        (MatchScore.kind.in_([TALENT_STARTUP, TALENT_STARTUP_BEST]), MatchScore.target_id == startup_id),
+        (MatchScore.kind == TALENT_JOB, MatchScore.target_id.in_([job.id for job in jobs])),
+    )
+
+    investor_result = await db.execute(select(InvestorProfile))
+    investors = investor_result.scalars().all()
+    has_embedding, semantic_scores = await semantic_scores_for(
+        db, startup_id, "profile", [str(i.user_id) for i in investors], "thesis"
+    )
+    rows = [
+        _row(
+            STARTUP_INVESTOR, startup_id, investor.user_id,
+            _investor_match_result(startup, investor, has_embedding[i], float(semantic_scores[i])), now
+        )
+        for i, investor in enumerate(investors)
+    ]
+    await _write(db, rows, (MatchScore.kind == STARTUP_INVESTOR, MatchScore.source_id == startup_id))
+
+
+async def rescore_talent(db: AsyncSession, talent: TalentProfile) -> None:
+    """Recompute one talent's scores against every startup and job."""
+    now = datetime.utcnow().isoformat()
+    talent_id = str(talent.user_id)
+    startup_result = await db.execute(select(StartupProfile))
+    startups = startup_result.scalars().all()
+    jobs = await _jobs_by_startup(db)
+    talent_skills = _talent_skill_names(talent)
+
+    # Keyword pools of every startup (baseline, then its jobs) in one matrix
+    pools, owners = [], []
+    for s, startup in enumerate(startups):
+        pools.append(_startup_keywords(startup))
+        owners.append((s, None))
+        for job in jobs.get(str(startup.id), []):
+            pools.append([skill.lower() for skill in (job.required_skills or [])])
+            owners.append((s, job))
+    if skill_indexes_loaded():
+        # Job pools come from the inverted index; only baselines need the matrix
+        baselines = [i for i, (_, job) in enumerate(owners) if job is None]
+        job_rows = [i for i, (_, job) in enumerate(owners) if job is not None]
+        keyword_scores = np.zeros(len(owners), dtype=np.float64)
+        keyword_scores[baselines] = jaccard_scores(talent_skills, SkillBitsets([pools[i] for i in baselines]))
+        job_index = get_skill_index("job")
+        keyword_scores[job_rows] = job_index.jaccard_scores(
+            talent_skills, job_index.rows([str(owners[i][1].id) for i in job_rows])
+        )
+    else:
+        keyword_scores = jaccard_scores(talent_skills, SkillBitsets(pools))
+
+    has_embedding, semantic_scores = await semantic_scores_for(
+        db, talent_id, "profile", [str(s.user_id) for s in startups], "profile"
+    )
+
+    rows, candidates = [], {}
+    for (s, job), keyword_score in zip(owners, keyword_scores):
+        startup = startups[s]
+        result = _talent_match_result(
+            float(keyword_score), float(semantic_scores[s]), has_embedding[s],
+            talent_skills, [skill.lower() for skill in (startup.required_skills or [])]
+        )
+        if job is None:
+            rows.append(_row(TALENT_STARTUP, talent_id, startup.user_id, result, now))
+        else:
+            rows.append(_row(TALENT_JOB, talent_id, job.id, result, now))
+        candidates.setdefault(s, []).append(result)
+    for s, results in candidates.items():
+        startup_jobs = jobs.get(str(startups[s].id), [])
+        rows.append(_row(TALENT_STARTUP_BEST, talent_id, startups[s].user_id, _best_with_job(results, startup_jobs), now))
+
+    await _write(
+        db, rows,
+        (MatchScore.kind.in_([TALENT_STARTUP, TALENT_JOB, TALENT_STARTUP_BEST]), MatchScore.source_id == talent_id)
+    )
+
+
+async def rescore_investor(db: AsyncSession, investor: InvestorProfile) -> None:
+    """Recompute every startup's score against one investor."""
+    now = datetime.utcnow().isoformat()
+    investor_id = str(investor.user_id)
+    startup_result = await db.execute(select(StartupProfile))
+    startups = startup_result.scalars().all()
+    has_embedding, semantic_scores = await semantic_scores_for(
+        db, investor_id, "thesis", [str(s.user_id) for s in startups], "profile"
+    )
+    rows = [
+        _row(
+            STARTUP_INVESTOR, startup.user_id, investor_id,
+            _investor_match_result(startup, investor, has_embedding[i], float(semantic_scores[i])), now
+        )
+        for i, startup in enumerate(startups)
+    ]
+    await _write(db, rows, (MatchScore.kind == STARTUP_INVESTOR, MatchScore.target_id == investor_id))
+
+
+async def rescore_user(db: AsyncSession, user_id: str) -> None:
+    """Recompute the scores that depend on one user's profile, by role. Does not commit."""
+    user = (await db.execute(select(User).where(User.id == user_id))).scalars().first()
+    if not user:
+        return
+    if user.role == UserRole.TALENT:
+        model, rescore = TalentProfile, rescore_talent
+    elif user.role == UserRole.FOUNDER:
+        model, rescore = StartupProfile, rescore_startup
+    else:
+        model, rescore = InvestorProfile, rescore_investor
+    profile = (await db.execute(select(model).where(model.user_id == user_id))).scalars().first()
+    if profile:
+        await rescore(db, profile)
+
+
+async def delete_job_scores(db: AsyncSession, job_id: str) -> None:
+    """Drop a deleted job's scores. Does not commit."""
+    await db.execute(delete(MatchScore).where(MatchScore.kind == TALENT_JOB, MatchScore.target_id == job_id))
+
+
+Page = Tuple[List, Optional[str]]
+
+
+async def _page(db: AsyncSession, query, slice_filter, entity_id, limit: Optional[int], cursor: Optional[Cursor]) -> Optional[Page]:
+    """Rows of ``query`` within one slice, ranked by score then ``entity_id``.
+
+    Returns the page and the next cursor, or None when the slice has no
+    stored rows at all (nothing computed yet).
+    """
+    ranked = query.where(*slice_filter)
+    if cursor is not None:
+        score, last_id = cursor
+        ranked = ranked.where(or_(
+            MatchScore.score < score,
+            and_(MatchScore.score == score, entity_id > last_id)
+        ))
+    ranked = ranked.order_by(MatchScore.score.desc(), entity_id)
+    if limit:
+        ranked = ranked.limit(limit + 1)
+    rows = (await db.execute(ranked)).all()
+
+    if not rows:
+        stored = await db.execute(select(MatchScore.id).where(*slice_filter).limit(1))
+        if stored.first() is None:
+            return None
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.score, getattr(last, entity_id.key))
+    return rows, next_cursor
+
+
+def _talent_item(talent: TalentProfile, startup_id: str, payload: Dict, best_job_id: Optional[str]) -> Dict:
+    """List entry; best-of payloads carry their own ``best_job_id``."""
+    return {
+        "talent_id": str(talent.user_id),
+        "name": talent.name,
+        "headline": talent.headline,
+        "user_id": startup_id,
+        **payload,
+        "best_job_id": payload.get("best_job_id", best_job_id)
+    }
+
+
+def _startup_item(startup: StartupProfile, user_id: str, payload: Dict) -> Dict:
+    return {
+        "startup_id": str(startup.user_id),
+        "name": startup.name,
+        "tagline": startup.tagline,
+        "industry": startup.industry,
+        "user_id": str(user_id),
+        **payload
+    }
+
+
+def _investor_item(investor: InvestorProfile, payload: Dict) -> Dict:
+    return {
+        "investor_id": str(investor.user_id),
+        "name": investor.name,
+        "fund": investor.fund,
+        "type": investor.type,
+        "user_id": str(investor.user_id),
+        **payload
+    }
+
+
+async def _talent_slice(db: AsyncSession, startup_id: str, job_id: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(kind, target_id) of the stored talent scores ``GET /matches/talent`` would list."""
+    if not job_id:
+        return TALENT_STARTUP_BEST, startup_id
+    if job_id == "[object Object]":
+        return TALENT_STARTUP, startup_id
+    job_result = await db.execute(
+        select(JobPosting.id, StartupProfile.user_id)
+        .join(StartupProfile, StartupProfile.id == JobPosting.startup_id)
+        .where(JobPosting.id == job_id)
+    )
+    job = job_result.first()
+    if job is None:
+        return TALENT_STARTUP, startup_id
+    if str(job[1]) != startup_id:
+        # Another startup's job is scored against this startup; not stored
+        return None
+    return TALENT_JOB, job_id
+
+
+async def talent_matches_for_startup(
+    db: AsyncSession,
+    startup_id: str,
+    job_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[Cursor] = None,
+    talent_ids: Optional[List[str]] = None
+) -> Optional[Page]:
+    """Stored ``GET /matches/talent`` page, or None to score live.
+
+    ``talent_ids`` restricts the page to those talents.
+    """
+    stored_slice = await _talent_slice(db, startup_id, job_id)
+    if stored_slice is None:
+        return None
+    kind, target_id = stored_slice
+
+    query = select(MatchScore, TalentProfile).join(TalentProfile, TalentProfile.user_id == MatchScore.source_id)
+    if talent_ids is not None:
+        query = query.where(MatchScore.source_id.in_(talent_ids))
+    page = await _page(
+        db,
+        query,
+        (MatchScore.kind == kind, MatchScore.target_id == target_id),
+        MatchScore.source_id, limit, cursor
+    )
+    if page is None:
+        return None
+    rows, next_cursor = page
+    best_job_id = target_id if kind == TALENT_JOB else None
+    return [_talent_item(talent, startup_id, score.payload, best_job_id) for score, talent in rows], next_cursor
+
+
+async def startup_matches_for_talent(
+    db: AsyncSession,
+    talent_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[Cursor] = None
+) -> Optional[Page]:
+    """Stored ``GET /matches/startups`` page, or None to score live."""
+    page = await _page(
+        db,
+        select(MatchScore, StartupProfile).join(StartupProfile, StartupProfile.user_id == MatchScore.target_id),
+        (MatchScore.kind == TALENT_STARTUP, MatchScore.source_id == talent_id),
+        MatchScore.target_id, limit, cursor
+    )
+    if page is None:
+        return None
+    rows, next_cursor = page
+    return [_startup_item(startup, startup.user_id, score.payload) for score, startup in rows], next_cursor
+
+
+async def investor_matches_for_startup(
+    db: AsyncSession,
+    startup_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[Cursor] = None
+) -> Optional[Page]:
+    """Stored founder-side ``GET /matches/investors`` page, or None to score live."""
+    page = await _page(
+        db,
+        select(MatchScore, InvestorProfile).join(InvestorProfile, InvestorProfile.user_id == MatchScore.target_id),
+        (MatchScore.kind == STARTUP_INVESTOR, MatchScore.source_id == startup_id),
+        MatchScore.target_id, limit, cursor
+    )
+    if page is None:
+        return None
+    rows, next_cursor = page
+    return [_investor_item(investor, score.payload) for score, investor in rows], next_cursor
+
+
+async def startup_matches_for_investor(
+    db: AsyncSession,
+    investor_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[Cursor] = None
+) -> Optional[Page]:
+    """Stored investor-side ``GET /matches/investors`` page, or None to score live."""
+    page = await _page(
+        db,
+        select(MatchScore, StartupProfile).join(StartupProfile, StartupProfile.user_id == MatchScore.source_id),
+        (MatchScore.kind == STARTUP_INVESTOR, MatchScore.target_id == investor_id),
+        MatchScore.source_id, limit, cursor
+    )
+    if page is None:
+        return None
+    rows, next_cursor = page
+    return [_startup_item(startup, investor_id, score.payload) for score, startup in rows], next_cursor
+
+
+async def pair_matches(
+    db: AsyncSession,
+    user: User,
+    target_ids: List[str],
+    job_id: Optional[str] = None
+) -> Dict[str, Dict]:
+    """The current user's match entry for each target, keyed by target id.
+
+    Entries are what the user's match list would show for that target
+    (``GET /matches/talent``, ``/investors`` or ``/startups``), read from
+    the store when present and otherwise scored live for just those pairs.
+    Targets that are not a valid match for the user are left out.
+    """
+    user_id = str(user.id)
+    target_ids = list(dict.fromkeys(str(t) for t in target_ids))
+    roles_result = await db.execute(select(User.id, User.role).where(User.id.in_(target_ids)))
+    roles = {str(target_id): role for target_id, role in roles_result.all()}
+    store = settings.MATCH_SCORE_STORE
+    # Live-scored pairs share the user's own profile and embedding rows
+    loader = MatchLoader(db)
+
+    def of_role(role: UserRole) -> List[str]:
+        return [t for t in target_ids if roles.get(t) == role]
+
+    entries: Dict[str, Dict] = {}
+    if user.role == UserRole.FOUNDER:
+        talent_ids, investor_ids = of_role(UserRole.TALENT), of_role(UserRole.INVESTOR)
+        stored_slice = await _talent_slice(db, user_id, job_id) if store and talent_ids else None
+        if stored_slice is not None:
+            kind, slice_target = stored_slice
+            result = await db.execute(
+                select(MatchScore, TalentProfile)
+                .join(TalentProfile, TalentProfile.user_id == MatchScore.source_id)
+                .where(MatchScore.kind == kind, MatchScore.target_id == slice_target, MatchScore.source_id.in_(talent_ids))
+            )
+            for score, talent in result.all():
+                entries[score.source_id] = _talent_item(
+                    talent, user_id, score.payload, slice_target if kind == TALENT_JOB else None
+                )
+        missing = [t for t in talent_ids if t not in entries]
+        if missing:
+            for match in await match_talents_to_startup_batch(db, user_id, job_id=job_id, talent_ids=missing):
+                entries[match["talent_id"]] = match
+
+        if store and investor_ids:
+            result = await db.execute(
+                select(MatchScore, InvestorProfile)
+                .join(InvestorProfile, InvestorProfile.user_id == MatchScore.target_id)
+                .where(
+                    MatchScore.kind == STARTUP_INVESTOR,
+                    MatchScore.source_id == user_id,
+                    MatchScore.target_id.in_(investor_ids)
+                )
+            )
+            for score, investor in result.all():
+                entries[score.target_id] = _investor_item(investor, score.payload)
+        missing = [t for t in investor_ids if t not in entries]
+        if missing:
+            investors = [i for i in await loader.load_many("investor", missing) if i is not None]
+            await preload_embeddings(loader, missing, "thesis")
+            for investor in investors:
+                match = await match_startup_to_investor(db, user_id, str(investor.user_id), loader=loader)
+                if "error" not in match:
+                    entries[str(investor.user_id)] = _investor_item(investor, match)
+
+    elif user.role in (UserRole.TALENT, UserRole.INVESTOR):
+        startup_ids = of_role(UserRole.FOUNDER)
+        talent = user.role == UserRole.TALENT
+        if store and startup_ids and not (talent and job_id):
+            if talent:
+                pair = (MatchScore.kind == TALENT_STARTUP, MatchScore.source_id == user_id,
+                        MatchScore.target_id.in_(startup_ids))
+                startup_key = MatchScore.target_id
+            else:
+                pair = (MatchScore.kind == STARTUP_INVESTOR, MatchScore.target_id == user_id,
+                        MatchScore.source_id.in_(startup_ids))
+                startup_key = MatchScore.source_id
+            result = await db.execute(
+                select(MatchScore, StartupProfile)
+                .join(StartupProfile, StartupProfile.user_id == startup_key)
+                .where(*pair)
+            )
+            for score, startup in result.all():
+                entries[str(startup.user_id)] = _startup_item(startup, startup.user_id if talent else user_id, score.payload)
+        missing = [t for t in startup_ids if t not in entries]
+        if missing:
+            startups = [s for s in await loader.load_many("startup", missing) if s is not None]
+            await preload_embeddings(loader, missing, "profile")
+            for startup in startups:
+                if talent:
+                    match = await match_talent_to_startup(
+                        db, user_id, str(startup.user_id), job_id=job_id, loader=loader
+                    )
+                else:
+                    match = await match_startup_to_investor(db, str(startup.user_id), user_id, loader=loader)
+                if "error" not in match:
+                    entries[str(startup.user_id)] = _startup_item(startup, startup.user_id if talent else user_id, match)
+
+    return entries
@@ -0,0 +1,251 @@
+"""Vectorized scoring kernels for the matching engine.
+
+Everything here scores one query against N candidates at once, so the
+per-pair helpers in matching.py are thin wrappers over these functions.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+
+
+def cosine_scores(
+    query: np.ndarray,
+    matrix: np.ndarray,
+    norms: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Cosine similarity between ``query`` (d,) and every row of ``matrix`` (N, d).
+
+    Uses a single matrix-vector product. Rows or queries with zero magnitude
+    score 0.0. Pass precomputed row ``norms`` to skip recomputing them.
+    """
+    matrix = np.asarray(matrix)
+    query = np.asarray(query, dtype=matrix.dtype)
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        return np.zeros(0, dtype=matrix.dtype)
+
+    if norms is None:
+        norms = row_norms(matrix)
+    dots = matrix @ query
+    denom = norms * np.linalg.norm(query)
+
+    scores = np.zeros_like(dots)
+    np.divide(dots, denom, out=scores, where=denom != 0)
+    return scores
+
+
+def row_norms(matrix: np.ndarray) -> np.ndarray:
+    """L2 norm of every row; einsum avoids the temporary np.linalg.norm builds."""
+    return np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Return a row-wise L2-normalized copy; zero rows stay zero."""
+    matrix = np.atleast_2d(np.asarray(matrix))
+    norms = row_norms(matrix)[:, None]
+    out = np.zeros_like(matrix)
+    np.divide(matrix, norms, out=out, where=norms != 0)
+    return out
+
+
+class SkillMatrix:
+    """Candidate skill sets in CSR form, interned against a shared vocabulary.
+
+    Row ``i`` holds the distinct skill ids of candidate ``i``. The vocabulary
+    may be shared between matrices so ids stay comparable.
+    """
+
+    def __init__(self, skill_lists: Iterable[Iterable[str]], vocabulary: Optional[Dict[str, int]] = None):
+        self.vocabulary = vocabulary if vocabulary is not None else {}
+        indices: List[int] = []
+        indptr = [0]
+        for skills in skill_lists:
+            ids = {self.vocabulary.setdefault(s, len(self.vocabulary)) for s in (skills or [])}
+            indices.extend(sorted(ids))
+            indptr.append(len(indices))
+
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.sizes = np.diff(self.indptr)
+        # Row number of every stored skill id, used to sum hits per candidate
+        self.rows = np.repeat(np.arange(len(self.sizes)), self.sizes)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def intersection_counts(self, query_skills: Iterable[str]) -> np.ndarray:
+        """Number of distinct query skills each candidate also has."""
+        query_ids = [self.vocabulary[s] for s in set(query_skills) if s in self.vocabulary]
+        if not query_ids or not len(self.indices):
+            return np.zeros(len(self), dtype=np.int64)
+        mask = np.zeros(len(self.vocabulary), dtype=bool)
+        mask[query_ids] = True
+        hits = mask[self.indices]
+        return np.bincount(self.rows[hits], minlength=len(self)).astype(np.int64)
+
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per element of a uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # NumPy < 2.0: SWAR bit counting
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return (words * _H01) >> np.uint64(56)
+
+
+class SkillBitsets:
+    """Candidate skill sets as packed uint64 bitsets over a shared vocabulary.
+
+    Bit ``j`` of candidate ``i`` is set when it has skill id ``j``. Words
+    are stored word-major, shape (words, N), so an intersection with a
+    query touches one contiguous row per nonzero query word: an AND and a
+    popcount over N uint64s. Drop-in for ``SkillMatrix`` in
+    ``jaccard_scores``; memory is N * vocabulary / 8 bytes.
+    """
+
+    def __init__(self, skill_lists: Iterable[Iterable[str]], vocabulary: Optional[Dict[str, int]] = None):
+        self.vocabulary = vocabulary if vocabulary is not None else {}
+        rows: List[int] = []
+        ids: List[int] = []
+        n = 0
+        for n, skills in enumerate(skill_lists, 1):
+            row_ids = {self.vocabulary.setdefault(s, len(self.vocabulary)) for s in (skills or [])}
+            ids.extend(row_ids)
+            rows.extend([n - 1] * len(row_ids))
+
+        words = max(1, (len(self.vocabulary) + 63) // 64)
+        self.bits = np.zeros((words, n), dtype=np.uint64)
+        ids = np.asarray(ids, dtype=np.int64)
+        np.bitwise_or.at(
+            self.bits, (ids >> 6, np.asarray(rows, dtype=np.int64)),
+            np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64))
+        )
+        self.sizes = np.zeros(n, dtype=np.int64)
+        for row in self.bits:
+            self.sizes += popcount(row).astype(np.int64)
+
+    def __len__(self) -> int:
+        return self.bits.shape[1]
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Bitset of the ``skills`` already in the vocabulary (others can't intersect)."""
+        return encode_bits(skills, self.vocabulary, len(self.bits))
+
+    def encode_pools(self, query_pools: List[Iterable[str]]) -> np.ndarray:
+        """``encode`` of each pool, shape (pools, words)."""
+        if not query_pools:
+            return np.zeros((0, len(self.bits)), dtype=np.uint64)
+        return np.stack([self.encode(pool) for pool in query_pools])
+
+    def intersection_matrix(self, query_pools: List[Iterable[str]]) -> np.ndarray:
+        """(pools, N) distinct-skill intersection counts, one broadcast AND per word."""
+        return bitset_intersections(self.encode_pools(query_pools), self.bits)
+
+    def intersection_counts(self, query_skills: Iterable[str]) -> np.ndarray:
+        """Number of distinct query skills each candidate also has."""
+        query = self.encode(query_skills)
+        counts = np.zeros(len(self), dtype=np.int64)
+        for w in np.flatnonzero(query):
+            counts += popcount(self.bits[w] & query[w]).astype(np.int64)
+        return counts
+
+
+def encode_bits(skills: Iterable[str], vocabulary: Dict[str, int], words: int) -> np.ndarray:
+    """``skills`` as a bitset of ``words`` uint64s; bit ``vocabulary[s]`` per known skill that fits."""
+    bits = np.zeros(words, dtype=np.uint64)
+    for s in set(skills):
+        j = vocabulary.get(s)
+        if j is not None and j < words * 64:
+            bits[j >> 6] |= np.uint64(1) << np.uint64(j & 63)
+    return bits
+
+
+def bitset_intersections(queries: np.ndarray, bits: np.ndarray) -> np.ndarray:
+    """Popcount of ``queries`` (pools, words) AND each column of ``bits`` (words, N): shape (pools, N)."""
+    counts = np.zeros((len(queries), bits.shape[1]), dtype=np.int64)
+    for w in np.flatnonzero(queries.any(axis=0)):
+        counts += popcount(queries[:, w, None] & bits[w][None, :]).astype(np.int64)
+    return counts
+
+
+def decode_bits(words: np.ndarray, names: List[str]) -> List[str]:
+    """Names of the bits set in one candidate's ``words``; ``names[j]`` is skill id ``j``."""
+    decoded = []
+    for w in np.flatnonzero(words).tolist():
+        word = int(words[w])
+        while word:
+            low = word & -word
+            decoded.append(names[(w << 6) + low.bit_length() - 1])
+            word ^= low
+    return decoded
+
+
+def jaccard_scores(query_skills: Iterable[str], skills: Union[SkillMatrix, SkillBitsets]) -> np.ndarray:
+    """Jaccard similarity between ``query_skills`` and every candidate set.
+
+    Empty query or candidate sets score 0.0, matching
+    ``calculate_jaccard_similarity``.
+    """
+    query_set = set(query_skills or [])
+    if not query_set:
+        return np.zeros(len(skills), dtype=np.float64)
+
+    intersection = skills.intersection_counts(query_set)
+    union = skills.sizes + len(query_set) - intersection
+
+    scores = np.zeros(len(skills), dtype=np.float64)
+    np.divide(intersection, union, out=scores, where=(skills.sizes > 0) & (union > 0))
+    return scores
+
+
+def jaccard_matrix(query_pools: List[Iterable[str]], skills: SkillBitsets) -> np.ndarray:
+    """``jaccard_scores`` of every query pool at once, shape (pools, N)."""
+    query_sizes = np.array([len(set(pool or [])) for pool in query_pools], dtype=np.int64)
+    return jaccard_from_counts(skills.intersection_matrix(query_pools), skills.sizes, query_sizes)
+
+
+def jaccard_from_counts(intersection: np.ndarray, sizes: np.ndarray, query_sizes: np.ndarray) -> np.ndarray:
+    """Jaccard from (pools, N) intersection counts, candidate set sizes and pool set sizes."""
+    query_sizes = query_sizes[:, None]
+    union = sizes[None, :] + query_sizes - intersection
+    scores = np.zeros(intersection.shape, dtype=np.float64)
+    np.divide(intersection, union, out=scores, where=(sizes[None, :] > 0) & (query_sizes > 0) & (union > 0))
+    return scores
+
+
+def best_pools(
+    keyword_scores: np.ndarray,
+    semantic_scores: np.ndarray,
+    has_embedding,
+    keyword_weight: float,
+    semantic_weight: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Row of each candidate's best hybrid score in ``keyword_scores`` (pools, N), and that score.
+
+    The score of every (pool, candidate) pair is one array expression,
+    reduced with a column-wise argmax. Ranking is on the match percentage
+    rounded to two places, earliest pool first on ties, so candidates whose
+    two best pools are within a hundredth of a percent are settled by
+    rounding exactly as the payload does.
+    """
+    semantic_scores = np.asarray(semantic_scores, dtype=np.float64)
+    finals = np.where(
+        np.asarray(has_embedding, dtype=bool),
+        keyword_scores * keyword_weight + semantic_scores * semantic_weight,
+        keyword_scores
+    )
+    if not finals.size:
+        return np.zeros(finals.shape[1], dtype=np.int64), np.zeros(finals.shape[1], dtype=np.float64)
+    columns = np.arange(finals.shape[1])
+    best = np.argmax(finals, axis=0)
+    top = finals[best, columns]
+    for i in np.flatnonzero(np.count_nonzero(finals >= top - 1.01e-4, axis=0) > 1):
+        percentages = [round(final * 100, 2) for final in finals[:, i].tolist()]
+        best[i] = percentages.index(max(percentages))
+    return best, finals[best, columns]
@@ -0,0 +1,241 @@
+"""In-process inverted skill indexes for keyword candidate generation.
+
+Each index maps a normalized (lowercased) skill to the posting list of
+entity ids that have it: ``talent`` indexes ``TalentProfile.skills`` and
+``job`` indexes ``JobPosting.required_skills``. Merging the posting lists
+of a query's skills yields every candidate with nonzero overlap together
+with its intersection count, so Jaccard is computed for those candidates
+only and everyone else scores 0.0 without being looked at.
+
+Indexes are built once at startup, updated in-process by the profile and
+job routers after they commit, and kept current across processes by
+``sync_skill_indexes``, which re-reads rows by ``updated_at`` like
+``embedding_index.sync_indexes`` does for embeddings. Until
+``build_skill_indexes`` has run, matching falls back to ``SkillBitsets``.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def normalize_skills(skills: Optional[Iterable]) -> List[str]:
+    """Lowercased skill names from a skills JSON list of names or ``{name: ...}`` dicts."""
+    names = []
+    for s in (skills or []):
+        if isinstance(s, dict):
+            names.append(s.get("name", "").lower())
+        elif isinstance(s, str):
+            names.append(s.lower())
+    return names
+
+
+class SkillIndex:
+    """Skill -> posting list of entity slots, plus each entity's distinct skill set.
+
+    Every entity id gets a stable integer slot, so posting lists are int32
+    arrays and merging the query's lists is one ``bincount`` over their
+    concatenation. Arrays are rebuilt lazily after a posting list changes.
+    """
+
+    def __init__(self):
+        self._slots: Dict[str, int] = {}
+        self._skills: List[FrozenSet[str]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._sizes: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return sum(1 for skills in self._skills if skills)
+
+    def __contains__(self, entity_id: str) -> bool:
+        slot = self._slots.get(entity_id)
+        return slot is not None and bool(self._skills[slot])
+
+    def upsert(self, entity_id: str, skills: Iterable[str]) -> None:
+        """Replace ``entity_id``'s skill set, moving it between posting lists."""
+        slot = self._slots.get(entity_id)
+        if slot is None:
+            slot = self._slots[entity_id] = len(self._skills)
+            self._skills.append(frozenset())
+        new, old = frozenset(skills), self._skills[slot]
+        for skill in old - new:
+            posting = self._postings[skill]
+            posting.discard(slot)
+            if not posting:
+                del self._postings[skill]
+            self._arrays.pop(skill, None)
+        for skill in new - old:
+            self._postings.setdefault(skill, set()).add(slot)
+            self._arrays.pop(skill, None)
+        self._skills[slot] = new
+        self._sizes = None
+
+    def remove(self, entity_id: str) -> None:
+        """Drop ``entity_id`` from every posting list; its slot stays reserved."""
+        if entity_id in self._slots:
+            self.upsert(entity_id, ())
+
+    def rows(self, entity_ids: List[str]) -> np.ndarray:
+        """Slot of each id, or -1 if it was never indexed; reuse across queries."""
+        return np.fromiter((self._slots.get(e, -1) for e in entity_ids), dtype=np.int64, count=len(entity_ids))
+
+    def _posting(self, skill: str) -> Optional[np.ndarray]:
+        array = self._arrays.get(skill)
+        if array is None and skill in self._postings:
+            array = self._arrays[skill] = np.fromiter(self._postings[skill], dtype=np.int32)
+        return array
+
+    def intersection_counts(self, query_skills: Iterable[str]) -> np.ndarray:
+        """Number of distinct query skills each slot has, by merging their posting lists."""
+        postings = [p for p in (self._posting(skill) for skill in set(query_skills)) if p is not None]
+        if not postings:
+            return np.zeros(len(self._skills), dtype=np.int64)
+        return np.bincount(np.concatenate(postings), minlength=len(self._skills))
+
+    def jaccard_matrix(self, query_pools: List[Iterable[str]], rows: np.ndarray) -> np.ndarray:
+        """``jaccard_scores`` of every query pool at once, shape (pools, len(rows)).
+
+        The posting lists of all pools are merged in a single ``bincount``,
+        each pool's slots offset into its own block.
+        """
+        self._refresh_sizes()
+        slots = len(self._skills)
+        query_sets = [set(pool or []) for pool in query_pools]
+        postings = [
+            posting + p * slots
+            for p, query_set in enumerate(query_sets)
+            for posting in (self._posting(skill) for skill in query_set) if posting is not None
+        ]
+        counts = np.zeros(len(query_sets) * slots, dtype=np.int64)
+        if postings:
+            counts = np.bincount(np.concatenate(postings).astype(np.int64), minlength=len(query_sets) * slots)
+        counts = counts.reshape(len(query_sets), slots)
+        query_sizes = np.array([len(q) for q in query_sets], dtype=np.int64)[:, None]
+
+        # One trailing zero column absorbs the -1 rows
+        by_slot = np.zeros((len(query_sets), slots + 1), dtype=np.float64)
+        hit = counts > 0
+        union = self._sizes[None, :] + query_sizes - counts
+        np.divide(counts, union, out=by_slot[:, :slots], where=hit)
+        return by_slot[:, rows]
+
+    def bitsets(self, skills: List[str], rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """``scoring.SkillBitsets`` bits and sizes of the entities at ``rows``, over ``skills`` only.
+
+        Bit ``j`` is set when an entity has ``skills[j]``, read off that
+        skill's posting list, so the cost is in the postings of ``skills``
+        rather than in the entities. Sizes count every distinct skill, so
+        Jaccard against pools drawn from ``skills`` is exact. Rows of -1
+        are empty.
+        """
+        self._refresh_sizes()
+        positions = np.full(len(self._skills), -1, dtype=np.int64)
+        indexed = rows >= 0
+        positions[rows[indexed]] = np.flatnonzero(indexed)
+        bits = np.zeros((max(1, -(-len(skills) // 64)), len(rows)), dtype=np.uint64)
+        for j, skill in enumerate(skills):
+            posting = self._posting(skill)
+            if posting is None:
+                continue
+            hits = positions[posting]
+            bits[j >> 6, hits[hits >= 0]] |= np.uint64(1) << np.uint64(j & 63)
+        # One trailing zero absorbs the -1 rows
+        return bits, np.append(self._sizes, 0)[rows]
+
+    def _refresh_sizes(self) -> None:
+        if self._sizes is None:
+            self._sizes = np.fromiter(map(len, self._skills), dtype=np.int64, count=len(self._skills))
+
+    def jaccard_scores(self, query_skills: Iterable[str], rows: np.ndarray) -> np.ndarray:
+        """Jaccard similarity between ``query_skills`` and the entities at ``rows``.
+
+        Same values as ``scoring.jaccard_scores`` over those entities' skills.
+        Only slots sharing a skill with the query are scored; the rest, and
+        rows of -1, are 0.0.
+        """
+        query_set = set(query_skills or [])
+        self._refresh_sizes()
+        counts = self.intersection_counts(query_set)
+        candidates = np.flatnonzero(counts)
+
+        # One trailing zero slot absorbs the -1 rows
+        by_slot = np.zeros(len(self._skills) + 1, dtype=np.float64)
+        intersection = counts[candidates]
+        by_slot[candidates] = intersection / (self._sizes[candidates] + len(query_set) - intersection)
+        return by_slot[rows]
+
+
+_indexes: Dict[str, SkillIndex] = {"talent": SkillIndex(), "job": SkillIndex()}
+_loaded = False
+# Newest updated_at loaded so far, per index
+_synced_through: Dict[str, Optional[str]] = {"talent": None, "job": None}
+# Same commit-ordering window as embedding_index.SYNC_OVERLAP
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def get_skill_index(kind: str) -> SkillIndex:
+    """The ``talent`` or ``job`` index."""
+    return _indexes[kind]
+
+
+def skill_indexes_loaded() -> bool:
+    """Whether ``build_skill_indexes`` has populated the indexes in this process."""
+    return _loaded
+
+
+def skills_synced_through() -> Tuple[Optional[str], ...]:
+    """Newest ``updated_at`` loaded into each index; advances as other processes' writes are synced."""
+    return tuple(_synced_through[kind] for kind in sorted(_synced_through))
+
+
+async def _load(db: AsyncSession, kind: str, since: Optional[str] = None) -> int:
+    """Upsert rows of ``kind`` updated at or after ``since`` (all rows without it)."""
+    from models import TalentProfile, JobPosting
+
+    if kind == "talent":
+        model, id_column, skills_column = TalentProfile, TalentProfile.user_id, TalentProfile.skills
+    else:
+        model, id_column, skills_column = JobPosting, JobPosting.id, JobPosting.required_skills
+    query = select(id_column, skills_column, model.updated_at)
+    if since is not None:
+        query = query.where(model.updated_at >= since)
+    result = await db.execute(query)
+
+    index = _indexes[kind]
+    rows = result.all()
+    for entity_id, skills, updated_at in rows:
+        index.upsert(str(entity_id), normalize_skills(skills))
+        if updated_at and (_synced_through[kind] is None or updated_at > _synced_through[kind]):
+            _synced_through[kind] = updated_at
+    return len(rows)
+
+
+async def build_skill_indexes(db: AsyncSession) -> None:
+    """Load every talent's skills and every job's required skills."""
+    global _loaded
+    for kind in _indexes:
+        _indexes[kind] = SkillIndex()
+        _synced_through[kind] = None
+        await _load(db, kind)
+    _loaded = True
+    print(f"Skill indexes built: {', '.join(f'{k}={len(v)}' for k, v in _indexes.items())}")
+
+
+async def sync_skill_indexes(db: AsyncSession) -> int:
+    """Upsert talents and jobs written since the last build or sync, e.g. by another process.
+
+    Returns the number of rows applied. Deleted jobs are only removed by
+    the process that deleted them; elsewhere the stale id lingers but is
+    never scored, since callers score ids they loaded from the database.
+    """
+    if not _loaded:
+        return 0
+    applied = 0
+    for kind in _indexes:
+        since = None
+        if _synced_through[kind]:
+            since = (datetime.fromisoformat(_synced_through[kind]) - SYNC_OVERLAP).isoformat()
+        applied += await _load(db, kind, since)
+    return applied
@@ -0,0 +1,141 @@
+"""Relational mirror of the skill JSON columns.
+
+``TalentProfile.skills``, ``StartupProfile.required_skills``/``tech_stack``
+and ``JobPosting.required_skills`` stay the source of truth; the handlers
+that write them also rewrite the entity's rows in ``talent_skills``,
+``startup_skills`` or ``job_skills`` in the same transaction, each pointing
+at a canonical lowercased name in ``skills``. With the composite
+(skill_id, entity) indexes, skill filters such as "talents with at least
+two of these skills" are one indexed GROUP BY instead of a full scan of
+the JSON blobs; ``GET /matches/talent`` and ``GET /matches/jobs`` narrow
+their candidates this way when given ``skills``. ``migrate_skills.py``
+backfills existing rows.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Skill, TalentSkill, JobSkill, StartupSkill
+from skill_index import normalize_skills
+
+
+def _names(skills: Optional[Iterable]) -> List[str]:
+    """Distinct non-empty normalized names, in first-seen order."""
+    return [name for name in dict.fromkeys(name.strip() for name in normalize_skills(skills)) if name]
+
+
+async def skill_ids(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """Ids of the named skills, creating the missing ones."""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    result = await db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names)))
+    ids = dict(result.all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(Skill), [{"name": name} for name in missing])
+        except IntegrityError:
+            # Another transaction created some of them first; theirs are as
+            # good, but the rest still need inserting
+            for name in missing:
+                try:
+                    async with db.begin_nested():
+                        await db.execute(insert(Skill), [{"name": name}])
+                except IntegrityError:
+                    pass
+        result = await db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(missing)))
+        ids.update(result.all())
+    return ids
+
+
+async def sync_talent_skills(db: AsyncSession, talent_id: str, skills: Optional[List]) -> None:
+    """Rewrite a talent's ``talent_skills`` rows from its skills JSON."""
+    proficiency = {}
+    for s in (skills or []):
+        if isinstance(s, dict):
+            proficiency.setdefault((s.get("name") or "").lower().strip(), s.get("proficiency"))
+    ids = await skill_ids(db, _names(skills))
+    await db.execute(delete(TalentSkill).where(TalentSkill.talent_id == talent_id))
+    if ids:
+        await db.execute(insert(TalentSkill), [
+            {"talent_id": talent_id, "skill_id": skill_id, "proficiency": proficiency.get(name)}
+            for name, skill_id in ids.items()
+        ])
+
+
+async def sync_job_skills(db: AsyncSession, job_id: str, required_skills: Optional[List]) -> None:
+    """Rewrite a job posting's ``job_skills`` rows."""
+    ids = await skill_ids(db, _names(required_skills))
+    await delete_job_skills(db, job_id)
+    if ids:
+        await db.execute(insert(JobSkill), [{"job_id": job_id, "skill_id": skill_id} for skill_id in ids.values()])
+
+
+async def delete_job_skills(db: AsyncSession, job_id: str) -> None:
+    """Remove a job's rows; call before deleting the posting itself."""
+    await db.execute(delete(JobSkill).where(JobSkill.job_id == job_id))
+
+
+async def sync_startup_skills(
+    db: AsyncSession,
+    startup_id: str,
+    required_skills: Optional[List],
+    tech_stack: Optional[List]
+) -> None:
+    """Rewrite a startup's ``startup_skills`` rows for both JSON columns."""
+    sources = {"required": _names(required_skills), "tech_stack": _names(tech_stack)}
+    ids = await skill_ids(db, [name for names in sources.values() for name in names])
+    await db.execute(delete(StartupSkill).where(StartupSkill.startup_id == startup_id))
+    rows = [
+        {"startup_id": startup_id, "source": source, "skill_id": ids[name]}
+        for source, names in sources.items() for name in names
+    ]
+    if rows:
+        await db.execute(insert(StartupSkill), rows)
+
+
+async def talents_with_skills(
+    db: AsyncSession,
+    skills: Iterable[str],
+    min_skills: int = 1
+) -> List[Tuple[str, int]]:
+    """(talent user id, matched count) for talents having at least ``min_skills`` of ``skills``.
+
+    One GROUP BY over ``ix_talent_skills_skill``; ordered by matched count.
+    """
+    names = _names(skills)
+    if not names:
+        return []
+    matched = func.count(TalentSkill.skill_id)
+    result = await db.execute(
+        select(TalentSkill.talent_id, matched)
+        .join(Skill, Skill.id == TalentSkill.skill_id)
+        .where(Skill.name.in_(names))
+        .group_by(TalentSkill.talent_id)
+        .having(matched >= min_skills)
+        .order_by(matched.desc(), TalentSkill.talent_id)
+    )
+    return [(str(talent_id), count) for talent_id, count in result.all()]
+
+
+async def jobs_with_skills(
+    db: AsyncSession,
+    skills: Iterable[str],
+    min_skills: int = 1
+) -> List[Tuple[str, int]]:
+    """(job id, matched count) for job postings requiring at least ``min_skills`` of ``skills``."""
+    names = _names(skills)
+    if not names:
+        return []
+    matched = func.count(JobSkill.skill_id)
+    result = await db.execute(
+        select(JobSkill.job_id, matched)
+        .join(Skill, Skill.id == JobSkill.skill_id)
+        .where(Skill.name.in_(names))
+        .group_by(JobSkill.job_id)
+        .having(matched >= min_skills)
+        .order_by(matched.desc(), JobSkill.job_id)
+    )
+    return [(str(job_id), count) for job_id, count in result.all()]
@@ -1,27 +1,54 @@
 import client from './client'
 
-export const getTalentMatches = async (jobId = null) => {
+// Match lists are ranked server-side; each call fetches one page and
+// the next page is requested with the returned cursor
+export const MATCH_PAGE_SIZE = 20
+
+const getMatchPage = async (url, params = {}, cursor = null) => {
+  const pageParams = { ...params, limit: MATCH_PAGE_SIZE }
+  if (cursor) pageParams.cursor = cursor
+  const response = await client.get(url, { params: pageParams })
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null }
+}
+
+export const getTalentMatches = async (jobId = null, cursor = null) => {
   const id = typeof jobId === 'object' ? null : jobId
-  const url = (id && id !== "[object Object]") ? `/matches/talent?job_id=${id}` : '/matches/talent'
-  const response = await client.get(url)
-  return response.data
+  const params = (id && id !== "[object Object]") ? { job_id: id } : {}
+  return getMatchPage('/matches/talent', params, cursor)
 }
 
-export const getInvestorMatches = async () => {
-  const response = await client.get('/matches/investors')
-  return response.data
+export const getInvestorMatches = async (cursor = null) => {
+  return getMatchPage('/matches/investors', {}, cursor)
 }
 
-export const getStartupMatches = async () => {
-  const response = await client.get('/matches/startups')
-  return response.data
+export const getStartupMatches = async (cursor = null) => {
+  return getMatchPage('/matches/startups', {}, cursor)
 }
 
-export const getJobMatches = async () => {
-  const response = await client.get('/matches/jobs')
+export const getMatchScore = async (targetId, jobId = null) => {
+  const params = { target_id: targetId }
+  if (jobId && typeof jobId !== 'object' && jobId !== "[object Object]") params.job_id = jobId
+  try {
+    const response = await client.get('/matches/score', { params })
+    return response.data
+  } catch (error) {
+    if (error.response?.status === 404) return null
+    throw error
+  }
+}
+
+export const getMatchScores = async (targetIds, jobId = null) => {
+  const params = new URLSearchParams()
+  targetIds.forEach((id) => params.append('target_ids', id))
+  if (jobId && typeof jobId !== 'object' && jobId !== "[object Object]") params.append('job_id', jobId)
+  const response = await client.get('/matches/scores', { params })
   return response.data
 }
 
+export const getJobMatches = async (cursor = null) => {
+  return getMatchPage('/matches/jobs', {}, cursor)
+}
+
 export const requestConnection = async (targetId, message, jobId = null) => {
   const response = await client.post('/matches/connections/request', {
     target_id: targetId,
@@ -0,0 +1,10 @@
+export default function LoadMoreButton({ hasMore, loading, onClick }) {
+  if (!hasMore) return null
+  return (
+    <div className="flex justify-center pt-4">
+      <button onClick={onClick} disabled={loading} className="premium-button btn-secondary px-8 py-2 text-xs">
+        {loading ? 'Loading...' : 'Load more matches'}
+      </button>
+    </div>
+  )
+}
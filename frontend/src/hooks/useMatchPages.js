@@ -0,0 +1,20 @@
+import { useInfiniteQuery } from '@tanstack/react-query'
+
+// A ranked match list, one page per request; later pages load only on loadMore
+export function useMatchPages(queryKey, getPage, options = {}) {
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
+    queryKey,
+    queryFn: ({ pageParam }) => getPage(pageParam),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    ...options,
+  })
+
+  return {
+    matches: data?.pages.flatMap(page => page.items) || [],
+    loading: isLoading,
+    hasMore: !!hasNextPage,
+    loadMore: () => fetchNextPage(),
+    loadingMore: isFetchingNextPage,
+  }
+}
@@ -1,5 +1,5 @@
 import { useQuery } from '@tanstack/react-query'
-import { getTalentMatches, getInvestorMatches, getStartupMatches } from '../api/matches'
+import { getMatchScore } from '../api/matches'
 import { useAuth } from './useAuth'
 
 export function useMatchScore(entityId, matchType) {
@@ -8,15 +8,9 @@ export function useMatchScore(entityId, matchType) {
   const { data, isLoading } = useQuery({
     queryKey: ['matchScore', entityId, matchType],
     queryFn: async () => {
-      if (role === 'FOUNDER' && matchType === 'talent') {
-        const matches = await getTalentMatches()
-        return matches.find((m) => m.talent_id === entityId)
-      } else if (role === 'FOUNDER' && matchType === 'investor') {
-        const matches = await getInvestorMatches()
-        return matches.find((m) => m.investor_id === entityId)
-      } else if (role === 'TALENT') {
-        const matches = await getStartupMatches()
-        return matches.find((m) => m.startup_id === entityId)
+      // Scores just this pair instead of fetching the whole match list
+      if ((role === 'FOUNDER' && (matchType === 'talent' || matchType === 'investor')) || role === 'TALENT') {
+        return getMatchScore(entityId)
       }
       return null
     },
@@ -13,9 +13,10 @@ export default function FounderHome() {
     queryFn: getStartupProfile,
   })
 
-  const { data: talentMatches = [] } = useQuery({
-    queryKey: ['talentMatches'],
-    queryFn: getTalentMatches,
+  // The first page is enough for the top three
+  const { data: { items: talentMatches } = { items: [] } } = useQuery({
+    queryKey: ['talentMatches', 'top'],
+    queryFn: () => getTalentMatches(),
   })
 
   // Only show high-fidelity matches (> 50%)
@@ -1,17 +1,18 @@
-import { useQuery } from '@tanstack/react-query'
 import { getInvestorMatches } from '../../api/matches'
 import PageHeader from '../../components/shared/PageHeader'
 import MatchScoreRing from '../../components/shared/MatchScoreRing'
 import EmptyState from '../../components/shared/EmptyState'
+import LoadMoreButton from '../../components/shared/LoadMoreButton'
+import { useMatchPages } from '../../hooks/useMatchPages'
 import { TrendingUp, Search, Filter, Mail, Link as LinkIcon, DollarSign } from 'lucide-react'
 import { useState } from 'react'
 
 export default function InvestorMatchList() {
   const [searchTerm, setSearchTerm] = useState('')
-  const { data: matches = [], isLoading } = useQuery({
-    queryKey: ['investorMatches'],
-    queryFn: getInvestorMatches,
-  })
+  const { matches, loading: isLoading, hasMore, loadMore, loadingMore } = useMatchPages(
+    ['investorMatches', 'list'],
+    getInvestorMatches
+  )
 
   const filteredMatches = (matches || []).filter(match =>
     match.name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -103,6 +104,7 @@ export default function InvestorMatchList() {
             ))}
           </div>
         )}
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
       </div>
     </div>
   )
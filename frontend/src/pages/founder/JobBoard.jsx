@@ -7,6 +7,8 @@ import { Briefcase, Plus, Trash2, MapPin, DollarSign, Clock, X, Pencil, Check, T
 import { useNotification } from '../../contexts/NotificationContext'
 import { getTalentMatches, getJobApplicants } from '../../api/matches'
 import MatchScoreRing from '../../components/shared/MatchScoreRing'
+import LoadMoreButton from '../../components/shared/LoadMoreButton'
+import { useMatchPages } from '../../hooks/useMatchPages'
 
 const EMPTY_FORM = {
     title: '',
@@ -159,13 +161,15 @@ function JobFormModal({ initial = EMPTY_FORM, onClose, onSubmit, isPending, titl
 
 function MatchedTalentsModal({ jobId, onClose }) {
     const normalizedJobId = typeof jobId === 'object' ? null : String(jobId)
-    const { data: matches = [], isLoading } = useQuery({
-        queryKey: ['jobMatches', normalizedJobId],
-        queryFn: () => getTalentMatches(normalizedJobId),
-        enabled: !!normalizedJobId && normalizedJobId !== "[object Object]"
-    })
+    const { matches, loading: isLoading, hasMore, loadMore, loadingMore } = useMatchPages(
+        ['talentMatches', 'job', normalizedJobId],
+        (cursor) => getTalentMatches(normalizedJobId, cursor),
+        { enabled: !!normalizedJobId && normalizedJobId !== "[object Object]" }
+    )
 
-    const filteredMatches = (matches || []).filter(m => m.match_percentage > 50)
+    const filteredMatches = matches.filter(m => m.match_percentage > 50)
+    // Pages come in ranking order, so past the first match at or below 50% none qualify
+    const moreQualify = hasMore && (matches[matches.length - 1]?.match_percentage || 0) > 50
 
     return (
         <div className="fixed inset-0 bg-black/60 backdrop-blur-md z-50 flex items-center justify-center p-4">
@@ -205,6 +209,7 @@ function MatchedTalentsModal({ jobId, onClose }) {
                         ))}
                     </div>
                 )}
+                <LoadMoreButton hasMore={moreQualify} loading={loadingMore} onClick={loadMore} />
             </div>
         </div>
     )
@@ -1,17 +1,25 @@
 import { useQuery } from '@tanstack/react-query'
 import { getTalentMatches } from '../../api/matches'
+import { getMyJobs } from '../../api/founders'
 import PageHeader from '../../components/shared/PageHeader'
 import MatchScoreRing from '../../components/shared/MatchScoreRing'
 import EmptyState from '../../components/shared/EmptyState'
+import LoadMoreButton from '../../components/shared/LoadMoreButton'
+import { useMatchPages } from '../../hooks/useMatchPages'
 import { Users, Search, Filter, Mail, Link as LinkIcon, Briefcase } from 'lucide-react'
 import { useState } from 'react'
 
 export default function TalentMatchList() {
   const [searchTerm, setSearchTerm] = useState('')
-  const { data: matches = [], isLoading } = useQuery({
-    queryKey: ['talentMatches'],
-    queryFn: getTalentMatches,
+  const { matches, loading: isLoading, hasMore, loadMore, loadingMore } = useMatchPages(
+    ['talentMatches', 'list'],
+    (cursor) => getTalentMatches(null, cursor)
+  )
+  const { data: jobs = [] } = useQuery({
+    queryKey: ['founder', 'jobs'],
+    queryFn: getMyJobs,
   })
+  const jobTitles = Object.fromEntries((jobs || []).map(job => [job.id, job.title]))
 
   const filteredMatches = (matches || [])
     .filter(match => match.match_percentage > 50)
@@ -20,6 +28,8 @@ export default function TalentMatchList() {
       match.headline?.toLowerCase().includes(searchTerm.toLowerCase()) ||
       (match.matched_skills || []).some(s => s.toLowerCase().includes(searchTerm.toLowerCase()))
     )
+  // Pages come in ranking order, so past the first match at or below 50% none qualify
+  const moreQualify = hasMore && (matches[matches.length - 1]?.match_percentage || 0) > 50
 
   return (
     <div>
@@ -91,7 +101,11 @@ export default function TalentMatchList() {
 
                   <div className="flex items-center gap-2 text-[var(--text-secondary)]">
                     <Briefcase size={12} className="text-[#16A34A]" />
-                    <span className="text-[10px] font-extrabold uppercase tracking-widest">Available for Hire</span>
+                    <span className="text-[10px] font-extrabold uppercase tracking-widest">
+                      {match.best_job_id && jobTitles[match.best_job_id]
+                        ? `Best fit: ${jobTitles[match.best_job_id]}`
+                        : 'Available for Hire'}
+                    </span>
                   </div>
                 </div>
 
@@ -112,6 +126,7 @@ export default function TalentMatchList() {
             ))}
           </div>
         )}
+        <LoadMoreButton hasMore={moreQualify} loading={loadingMore} onClick={loadMore} />
       </div>
     </div>
   )
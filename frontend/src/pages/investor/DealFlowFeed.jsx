@@ -1,16 +1,17 @@
-import { useQuery } from '@tanstack/react-query'
 import { getInvestorMatches } from '../../api/matches'
 import MatchScoreRing from '../../components/shared/MatchScoreRing'
 import ConnectionButton from '../../components/shared/ConnectionButton'
 import PageHeader from '../../components/shared/PageHeader'
 import EmptyState from '../../components/shared/EmptyState'
+import LoadMoreButton from '../../components/shared/LoadMoreButton'
+import { useMatchPages } from '../../hooks/useMatchPages'
 import { TrendingUp } from 'lucide-react'
 
 export default function DealFlowFeed() {
-  const { data: startups = [], isLoading } = useQuery({
-    queryKey: ['investorMatches'],
-    queryFn: getInvestorMatches,
-  })
+  const { matches: startups, loading: isLoading, hasMore, loadMore, loadingMore } = useMatchPages(
+    ['investorMatches', 'list'],
+    getInvestorMatches
+  )
 
   if (isLoading) {
     return <div className="p-6">Loading...</div>
@@ -54,6 +55,7 @@ export default function DealFlowFeed() {
             ))}
           </div>
         )}
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
       </div>
     </div>
   )
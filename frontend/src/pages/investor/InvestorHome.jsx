@@ -12,9 +12,10 @@ export default function InvestorHome() {
     queryFn: getInvestorThesis,
   })
 
-  const { data: matches = [] } = useQuery({
-    queryKey: ['investorMatches'],
-    queryFn: getInvestorMatches,
+  // The first page is enough for the top three
+  const { data: { items: matches, nextCursor } = { items: [] } } = useQuery({
+    queryKey: ['investorMatches', 'top'],
+    queryFn: () => getInvestorMatches(),
   })
 
   // Only show high-fidelity matches (> 50%)
@@ -44,7 +45,7 @@ export default function InvestorHome() {
               <div className="flex-1">
                 <p className="text-[10px] font-extrabold text-[var(--text-secondary)] uppercase tracking-[0.1em]">Pipeline</p>
                 <div className="flex items-end gap-2 mt-1">
-                  <p className="text-2xl font-extrabold text-[var(--text-primary)]">{matches.length}</p>
+                  <p className="text-2xl font-extrabold text-[var(--text-primary)]">{matches.length}{nextCursor ? '+' : ''}</p>
                   <p className="text-[10px] text-[#16A34A] font-extrabold mb-1">+24%</p>
                 </div>
               </div>
@@ -1,17 +1,18 @@
-import { useQuery } from '@tanstack/react-query'
 import { getStartupMatches } from '../../api/matches'
 import MatchScoreRing from '../../components/shared/MatchScoreRing'
 import MatchBadge from '../../components/shared/MatchBadge'
 import ConnectionButton from '../../components/shared/ConnectionButton'
 import PageHeader from '../../components/shared/PageHeader'
 import EmptyState from '../../components/shared/EmptyState'
+import LoadMoreButton from '../../components/shared/LoadMoreButton'
+import { useMatchPages } from '../../hooks/useMatchPages'
 import { Target } from 'lucide-react'
 
 export default function MyMatchesView() {
-  const { data: matches = [], isLoading } = useQuery({
-    queryKey: ['startupMatches'],
-    queryFn: getStartupMatches,
-  })
+  const { matches, loading: isLoading, hasMore, loadMore, loadingMore } = useMatchPages(
+    ['startupMatches', 'list'],
+    getStartupMatches
+  )
 
   if (isLoading) {
     return <div className="p-6">Loading...</div>
@@ -80,6 +81,7 @@ export default function MyMatchesView() {
             ))}
           </div>
         )}
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
       </div>
     </div>
   )
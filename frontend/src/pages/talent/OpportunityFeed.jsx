@@ -1,10 +1,12 @@
 import { useState } from 'react'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQueryClient } from '@tanstack/react-query'
 import { getJobMatches, requestConnection } from '../../api/matches'
 import { useNotification } from '../../contexts/NotificationContext'
 import MatchScoreRing from '../../components/shared/MatchScoreRing'
 import PageHeader from '../../components/shared/PageHeader'
 import EmptyState from '../../components/shared/EmptyState'
+import LoadMoreButton from '../../components/shared/LoadMoreButton'
+import { useMatchPages } from '../../hooks/useMatchPages'
 import { Briefcase, MapPin, Clock, DollarSign, Tag, X, Send, CheckCircle } from 'lucide-react'
 
 // ---------- Interest Modal ----------
@@ -69,10 +71,10 @@ export default function OpportunityFeed() {
   const [activeJob, setActiveJob] = useState(null)    // job currently open in modal
   const [sentJobs, setSentJobs] = useState(new Set()) // job_ids already sent
 
-  const { data: opportunities = [], isLoading } = useQuery({
-    queryKey: ['jobMatches'],
-    queryFn: getJobMatches,
-  })
+  const { matches: opportunities, loading: isLoading, hasMore, loadMore, loadingMore } = useMatchPages(
+    ['jobMatches', 'list'],
+    getJobMatches
+  )
 
   const interestMutation = useMutation({
     mutationFn: ({ targetId, message, jobId }) => requestConnection(targetId, message, jobId),
@@ -210,6 +212,7 @@ export default function OpportunityFeed() {
             })}
           </div>
         )}
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
       </div>
     </div>
   )
@@ -16,9 +16,10 @@ export default function TalentHome() {
   })
 
   // Fetch Job Matches (Opportunities) instead of general Startup Matches
-  const { data: jobMatches = [] } = useQuery({
-    queryKey: ['jobMatches'],
-    queryFn: getJobMatches,
+  // The first page is enough for the top three
+  const { data: { items: jobMatches, nextCursor } = { items: [] } } = useQuery({
+    queryKey: ['jobMatches', 'top'],
+    queryFn: () => getJobMatches(),
   })
 
   // Fetch Connections to calculate real application count
@@ -77,7 +78,7 @@ export default function TalentHome() {
               </div>
               <div>
                 <p className="text-[10px] font-extrabold text-[var(--text-secondary)] uppercase tracking-[0.1em]">Matching Roles</p>
-                <p className="text-2xl font-extrabold text-[var(--text-primary)]">{jobMatches.length}</p>
+                <p className="text-2xl font-extrabold text-[var(--text-primary)]">{jobMatches.length}{nextCursor ? '+' : ''}</p>
               </div>
             </div>
           </div>